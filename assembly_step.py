@@ -0,0 +1,142 @@
+"""One assembly STEP: base, mounted shell and washers, sharing one washer definition.
+
+The standalone STEPs (case3b.py --formats step) hold one part each, so a CAD
+user has to place the shell and washers by hand, and every extra washer
+would copy its geometry. This file is an XCAF assembly instead:
+  * the base at the origin
+  * the shell at Z=BASE_THICKNESS, where it sits on the base
+  * a washer on each corner screw, under the base
+Each part is written once as a shape definition. The placements are
+components of the "PID case" assembly (XCAFDoc_ShapeTool.AddComponent), so
+the four washers are four located references to one washer. Parts carry
+their FILENAMES as names and their case3b.VIEW_STYLES colours. With
+--ghosts the PID, SSR, terminal block and C14 ghosts are added in place on
+a "ghosts" layer, which CAD tools can hide in one click.
+
+    python assembly_step.py                       # pid_case_assembly.step
+    python assembly_step.py --preset hybrid --ghosts --out build
+"""
+
+import argparse
+import os
+import sys
+
+from OCP.APIHeaderSection import APIHeaderSection_MakeHeader
+from OCP.gp import gp_Trsf, gp_Vec
+from OCP.IFSelect import IFSelect_ReturnStatus
+from OCP.Message import Message, Message_Gravity
+from OCP.Quantity import Quantity_Color, Quantity_ColorRGBA, Quantity_TypeOfColor
+from OCP.STEPCAFControl import STEPCAFControl_Controller, STEPCAFControl_Writer
+from OCP.STEPControl import STEPControl_StepModelType
+from OCP.TCollection import TCollection_ExtendedString, TCollection_HAsciiString
+from OCP.TDataStd import TDataStd_Name
+from OCP.TDocStd import TDocStd_Document
+from OCP.TopLoc import TopLoc_Location
+from OCP.XCAFApp import XCAFApp_Application
+from OCP.XCAFDoc import XCAFDoc_ColorType, XCAFDoc_DocumentTool
+from OCP.XSControl import XSControl_WorkSession
+
+import case3b
+
+FILENAME = "pid_case_assembly.step"
+ASSEMBLY = "PID case"
+GHOST_LAYER = "ghosts"
+
+
+def washer_locations(p):
+    """(x, y, z) of each washer: on the corner screws, against the underside of the base."""
+    return [(sx * p.corner_off_x, sy * p.corner_off_y, -p.WASHER_THICKNESS) for sx, sy in ((1, 1), (-1, 1), (1, -1), (-1, -1))]
+
+
+def placements(parts, p, with_ghosts=False):
+    """[(component name, definition name, Part, (x, y, z))] in the assembled frame."""
+    placed = [("base", "base", parts["base"], (0.0, 0.0, 0.0)),
+              ("shell", "shell", parts["shell"], (0.0, 0.0, p.BASE_THICKNESS))]
+    placed += [(f"washer {i}", "washer", parts["washer"], xyz) for i, xyz in enumerate(washer_locations(p), 1)]
+    if with_ghosts:
+        for name, ghost in case3b.ghosts(p).items():
+            dz = p.BASE_THICKNESS if case3b.GHOST_FRAMES[name] == "shell" else 0.0
+            placed.append((name, name, ghost, (0.0, 0.0, dz)))
+    return placed
+
+
+def _label_name(label, name):
+    TDataStd_Name.Set_s(label, TCollection_ExtendedString(name))
+
+
+def build_document(parts, p, with_ghosts=False):
+    """The XCAF document of the assembly; each distinct Part becomes one shape definition."""
+    doc = TDocStd_Document(TCollection_ExtendedString("XmlOcaf"))
+    application = XCAFApp_Application.GetApplication_s()
+    application.NewDocument(TCollection_ExtendedString("MDTV-XCAF"), doc)
+    application.InitDocument(doc)
+    XCAFDoc_DocumentTool.SetLengthUnit_s(doc, 0.001)   # mm
+    shapes = XCAFDoc_DocumentTool.ShapeTool_s(doc.Main())
+    colors = XCAFDoc_DocumentTool.ColorTool_s(doc.Main())
+    layers = XCAFDoc_DocumentTool.LayerTool_s(doc.Main())
+    shapes.SetAutoNaming_s(False)
+
+    root = shapes.NewShape()
+    _label_name(root, ASSEMBLY)
+    definitions = {}
+    for component, name, part, xyz in placements(parts, p, with_ghosts):
+        ghost = name in case3b.GHOST_FRAMES
+        if name not in definitions:
+            label = shapes.AddShape(part.wrapped.Located(TopLoc_Location()), False)   # placed by the component
+            _label_name(label, case3b.VIEW_STYLES[name][0] if ghost else case3b.FILENAMES[name])
+            _, rgb, alpha = case3b.VIEW_STYLES[name]
+            color = Quantity_ColorRGBA(Quantity_Color(*rgb, Quantity_TypeOfColor.Quantity_TOC_sRGB), alpha)
+            colors.SetColor(label, color, XCAFDoc_ColorType.XCAFDoc_ColorSurf)
+            if ghost:
+                layers.SetLayer(label, TCollection_ExtendedString(GHOST_LAYER))
+            definitions[name] = label
+        trsf = gp_Trsf()
+        trsf.SetTranslation(gp_Vec(*xyz))
+        instance = shapes.AddComponent(root, definitions[name], TopLoc_Location(trsf) * part.wrapped.Location())
+        _label_name(instance, component)
+        if ghost:
+            layers.SetLayer(instance, TCollection_ExtendedString(GHOST_LAYER))
+    shapes.UpdateAssemblies()
+    return doc
+
+
+def write_assembly(parts, p, path, with_ghosts=False):
+    """Write the assembly STEP of parts ({"base", "shell", "washer": Part}) to path."""
+    doc = build_document(parts, p, with_ghosts)
+    for printer in Message.DefaultMessenger_s().Printers():   # OCCT's transfer chatter
+        printer.SetTraceLevel(Message_Gravity.Message_Fail)
+    STEPCAFControl_Controller.Init_s()
+    writer = STEPCAFControl_Writer(XSControl_WorkSession(), False)
+    writer.SetColorMode(True)
+    writer.SetLayerMode(True)
+    writer.SetNameMode(True)
+    header = APIHeaderSection_MakeHeader(writer.Writer().Model())
+    if not header.IsDone():
+        header = APIHeaderSection_MakeHeader(0)
+        header.Apply(writer.Writer().Model())
+    header.SetName(TCollection_HAsciiString(ASSEMBLY))
+    header.SetOriginatingSystem(TCollection_HAsciiString("case3b assembly_step.py"))
+    writer.Transfer(doc, STEPControl_StepModelType.STEPControl_AsIs)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if writer.Write(os.fspath(path)) != IFSelect_ReturnStatus.IFSelect_RetDone:
+        raise RuntimeError(f"failed to write {path}")
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--preset", default=None, choices=list(case3b.PRESETS), help="parameters to build (default: the defaults)")
+    parser.add_argument("--ghosts", action="store_true", help="add the PID, SSR, terminal block and C14 ghosts on a \"ghosts\" layer")
+    parser.add_argument("--out", default=".", help="output directory (default: current directory)")
+    args = parser.parse_args(argv)
+
+    p = case3b.CaseParams(**case3b.PRESETS[args.preset]) if args.preset else case3b.DEFAULT_PARAMS
+    path = write_assembly(case3b.build_parts(p), p, os.path.join(args.out, FILENAME), args.ghosts)
+    steps = [path for name in case3b.BUILDERS for path in case3b.output_paths(name, args.out, ("step",)) if os.path.exists(path)]
+    note = f" (the standalone STEPs in {args.out}: {sum(map(os.path.getsize, steps)) / 1e3:.0f} KB)" if steps else ""
+    print(f"✅ {path}: {os.path.getsize(path) / 1e3:.0f} KB, base + shell + {len(washer_locations(p))} washer instances{note}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
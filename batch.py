@@ -0,0 +1,209 @@
+"""Batch generator for the fastener-configuration variants of case3b.py.
+
+Each of the six USE_INSERTS_* switches can be on or off, giving 64 possible
+base/shell builds. This script builds any subset of them on a process pool
+(one OCC worker per core) and writes each variant's STL/STEP set into its own
+directory, followed by a per-variant wall time summary.
+
+Usage:
+    python batch.py --all                       # all 64 variants
+    python batch.py --preset all-inserts hybrid # named presets
+    python batch.py --variant 101111 000010     # switch bits, in SWITCHES order
+    python batch.py --all --interference        # also check ghosts against the case
+    python batch.py --all --overhangs           # also report bridges that need support
+    python batch.py --all --estimate            # also estimate print time and filament
+    python batch.py --all --plate               # also write a 3MF project per variant
+    python batch.py --all --preview             # also write a GLB preview per variant
+    python batch.py --all --assembly            # also write an assembly STEP per variant
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+
+import assembly_step
+import case3b
+import interference
+import overhangs
+import plate_3mf
+import preview_glb
+import print_estimate
+from part_cache import PartCache
+
+# Order matters: a variant code is one bit per switch, in this order.
+SWITCHES = case3b.SWITCHES
+
+
+def variant_code(switches):
+    """Inverse of variant_switches(): {"USE_INSERTS_SSR": True, ...} -> '1...'."""
+    return "".join("1" if switches[name] else "0" for name in SWITCHES)
+
+
+# The quick presets from case3b.py, as variant codes
+PRESETS = {name: variant_code(switches) for name, switches in case3b.PRESETS.items()}
+
+
+def variant_params(code, base=case3b.DEFAULT_PARAMS):
+    return replace(base, **variant_switches(code))
+
+
+def variant_switches(code):
+    """Map a 6-character bit string such as '101111' to switch overrides."""
+    if len(code) != len(SWITCHES) or set(code) - {"0", "1"}:
+        raise ValueError(f"Variant code must be {len(SWITCHES)} bits (0/1), got {code!r}")
+    return {name: bit == "1" for name, bit in zip(SWITCHES, code)}
+
+
+def all_variants():
+    return ["".join(bits) for bits in itertools.product("01", repeat=len(SWITCHES))]
+
+
+# Extra outputs and checks per variant, as run_batch() options and CLI flags
+OPTIONS = ("interference", "overhangs", "estimate", "plate", "preview", "assembly")
+# Options that work on the built parts rather than the exported files
+PART_OPTIONS = {"interference", "plate", "preview", "assembly"}
+
+
+def build_variant(code, out_dir, options=None):
+    """Worker: build and export one variant, capturing its console output.
+
+    `options` maps OPTIONS names to True, plus "cache" (default True) to use
+    the on-disk part cache:
+      * interference: test the component ghosts against the assembled case (interference.py)
+      * overhangs: check the exported STLs for overhangs and long bridges (overhangs.py)
+      * estimate: estimate print time and filament from the Orca profile (print_estimate.py)
+      * plate: also write one 3MF project with the profile embedded (plate_3mf.py)
+      * preview: also write a GLB preview with the ghosts (preview_glb.py)
+      * assembly: also write one assembly STEP (assembly_step.py)
+    Each part is built at most once; every option gets the same Part.
+    Returns {"code", "seconds", "error", "collisions", "support_mm2", "estimate"}.
+    """
+    options = options or {}
+    os.makedirs(out_dir, exist_ok=True)
+    log = io.StringIO()
+    start = time.perf_counter()
+    result = {"code": code, "seconds": None, "error": None, "collisions": None, "support_mm2": None, "estimate": None}
+    try:
+        with contextlib.redirect_stdout(log):
+            p = variant_params(code)
+            case3b.print_summary(p)
+            if options.get("cache", True):
+                cache = PartCache()
+                parts = case3b.update_outputs(p, out_dir, cache=cache)
+                if PART_OPTIONS & {name for name, on in options.items() if on}:
+                    # Up-to-date parts come from the cache, not a rebuild
+                    parts.update(case3b.build_parts(p, [n for n in case3b.BUILDERS if n not in parts], cache=cache))
+            else:
+                parts = case3b.build_parts(p)
+                case3b.export(parts, out_dir)
+            if options.get("plate"):
+                plate_3mf.write_plate(parts, p, os.path.join(out_dir, plate_3mf.FILENAME))
+            if options.get("preview"):
+                preview_glb.write_preview(parts, p, os.path.join(out_dir, preview_glb.FILENAME), with_ghosts=True)
+            if options.get("assembly"):
+                assembly_step.write_assembly(parts, p, os.path.join(out_dir, assembly_step.FILENAME))
+            if options.get("interference"):
+                report = interference.check(p, parts)
+                print("Interference:")
+                interference.print_report(report)
+                result["collisions"] = [f"{ghost}/{part}: {volume:.1f} mm³" for ghost, part, volume in interference.collisions(report)]
+            if options.get("overhangs"):
+                report = overhangs.analyse_stls(p, out_dir)
+                print("Overhangs (print orientation):")
+                overhangs.print_report(report)
+                result["support_mm2"] = {name: round(r["support_area"], 1) for name, r in report.items()}
+            if options.get("estimate"):
+                estimates = print_estimate.estimate_stls(p, out_dir)
+                print("Print estimate:")
+                print_estimate.print_report(estimates)
+                result["estimate"] = {name: {"minutes": round(e.seconds / 60, 1), "grams": round(e.grams, 1)} for name, e in estimates.items()}
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    with open(os.path.join(out_dir, "build.log"), "w", encoding="utf-8") as f:
+        f.write(log.getvalue())
+        if result["error"]:
+            f.write(f"\nFAILED: {result['error']}\n")
+    return result
+
+
+def run_batch(codes, out_root, jobs=None, options=None):
+    """Build every variant in `codes` with build_variant(options); return {code: result without "code"}."""
+    results = {}
+    jobs = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(build_variant, code, os.path.join(out_root, code), options) for code in codes]
+        for future in as_completed(futures):
+            result = future.result()
+            code, error, hits = result.pop("code"), result["error"], result["collisions"]
+            support, costs = result["support_mm2"], result["estimate"]
+            results[code] = result
+            status = "FAILED" if error else f"COLLISION ({'; '.join(hits)})" if hits else "ok"
+            if support and not error:
+                status += "  support " + ", ".join(f"{name} {area / 100:.1f} cm²" for name, area in support.items())
+            if costs and not error:
+                status += "  print " + ", ".join(f"{name} {c['minutes']:.0f} min/{c['grams']:.0f} g" for name, c in costs.items())
+            print(f"  {code}  {result['seconds']:7.2f}s  {status}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--all", action="store_true", help="build all 64 variants")
+    parser.add_argument("--preset", nargs="+", default=[], choices=sorted(PRESETS), help="named presets to build")
+    parser.add_argument("--variant", nargs="+", default=[], help="variant bit codes, e.g. 101111 (order: %s)" % ", ".join(SWITCHES))
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--out", default="variants", help="output root directory (default: variants)")
+    parser.add_argument("--no-cache", action="store_true", help="rebuild every part instead of using the on-disk part cache")
+    parser.add_argument("--interference", action="store_true", help="check each variant's component ghosts against the case (interference.py)")
+    parser.add_argument("--overhangs", action="store_true", help="report each variant's overhangs and long bridges in print orientation (overhangs.py)")
+    parser.add_argument("--plate", action="store_true", help=f"also write each variant as a 3MF project with the Orca profile embedded ({plate_3mf.FILENAME})")
+    parser.add_argument("--preview", action="store_true", help=f"also write each variant as a GLB preview with the component ghosts ({preview_glb.FILENAME})")
+    parser.add_argument("--assembly", action="store_true", help=f"also write each variant as one assembly STEP ({assembly_step.FILENAME})")
+    parser.add_argument("--estimate", action="store_true", help="estimate each variant's print time and filament from the Orca profile (print_estimate.py)")
+    args = parser.parse_args(argv)
+
+    codes = all_variants() if args.all else []
+    codes += [PRESETS[name] for name in args.preset]
+    codes += args.variant
+    codes = list(dict.fromkeys(codes))  # de-duplicate, keep order
+    if not codes:
+        parser.error("nothing to build: pass --all, --preset or --variant")
+    for code in codes:
+        variant_switches(code)  # validate before spinning up workers
+
+    os.makedirs(args.out, exist_ok=True)
+    print(f"Building {len(codes)} variant(s) with {args.jobs or os.cpu_count()} worker(s) -> {args.out}/")
+    start = time.perf_counter()
+    options = {name: getattr(args, name) for name in OPTIONS}
+    options["cache"] = not args.no_cache
+    results = run_batch(codes, args.out, args.jobs, options)
+    wall = time.perf_counter() - start
+
+    serial = sum(r["seconds"] for r in results.values())
+    failed = sorted(code for code, r in results.items() if r["error"] or r["collisions"])
+    summary = {
+        "switches": SWITCHES,
+        "wall_seconds": round(wall, 3),
+        "serial_seconds": round(serial, 3),
+        "variants": {code: results[code] for code in codes},
+    }
+    with open(os.path.join(args.out, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"Done: {len(codes) - len(failed)}/{len(codes)} ok in {wall:.1f}s wall "
+          f"({serial:.1f}s of builds, {serial / wall if wall else 0:.1f}x parallel)")
+    if failed:
+        print("❌ Failed or colliding: " + ", ".join(failed) + " (see build.log in each directory)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,30 @@
+"""Benchmark: feature-by-feature vs prism-compiled build_base().
+
+For each fastener preset this builds the base both ways, checks that the
+results are the same solid (volume, face/edge/solid counts and an empty
+symmetric difference) and reports the speed-up of compiling the base from
+2D cross-sections.
+
+    python bench_base_profile.py [--repeat N]
+"""
+
+import argparse
+import sys
+
+import case3b
+from bench_compare import compare
+from prism import slabs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="builds per mode and preset (median is reported)")
+    args = parser.parse_args(argv)
+    return compare(lambda p: case3b.build_base(p, compiled=False),
+                   lambda p: case3b.build_base(p, compiled=True),
+                   ("features", "compiled"), args.repeat,
+                   detail=lambda p: f"{len(slabs(case3b.base_prisms(p)))} slabs")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
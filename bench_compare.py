@@ -0,0 +1,68 @@
+"""Shared loop of the equivalence benchmarks (bench_shell_cuts.py, bench_base_profile.py).
+
+compare() builds every fastener preset with a reference and a candidate
+builder, checks that the results are the same solid (volume, face/edge/solid
+counts and an empty symmetric difference) and prints the median times and
+the speed-up of the candidate.
+"""
+
+import statistics
+import time
+
+import case3b
+
+REL_TOL = 1e-9
+
+
+def shape_stats(part):
+    return {
+        "volume": part.volume,
+        "faces": len(part.faces()),
+        "edges": len(part.edges()),
+        "solids": len(part.solids()),
+    }
+
+
+def time_build(build, p, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        part = build(p)
+        times.append(time.perf_counter() - start)
+    return part, statistics.median(times)
+
+
+def compare(reference, candidate, labels, repeat, detail=None):
+    """Time and compare reference(p) and candidate(p) over the presets; 0 if all match, else 1.
+
+    labels names the two builds in the table; detail(p), if given, adds to
+    each preset's summary.
+    """
+    candidate(case3b.DEFAULT_PARAMS)  # warm up OCC before timing
+    widths = [max(9, len(label)) for label in labels]
+    ok = True
+    total_ref = total_cand = 0.0
+    print(f"{'preset':<12} {labels[0]:>{widths[0]}} {labels[1]:>{widths[1]}} {'speed-up':>8}  faces  volume")
+    for name, switches in case3b.PRESETS.items():
+        p = case3b.CaseParams(**switches)
+        ref, t_ref = time_build(reference, p, repeat)
+        cand, t_cand = time_build(candidate, p, repeat)
+        total_ref += t_ref
+        total_cand += t_cand
+
+        a, b = shape_stats(ref), shape_stats(cand)
+        same_topology = all(a[key] == b[key] for key in ("faces", "edges", "solids"))
+        same_volume = abs(a["volume"] - b["volume"]) <= REL_TOL * a["volume"]
+        leftover = ref.cut(cand).volume + cand.cut(ref).volume
+        same = same_topology and same_volume and leftover <= REL_TOL * a["volume"]
+        ok &= same
+
+        extra = f", {detail(p)}" if detail else ""
+        print(f"{name:<12} {t_ref:{widths[0] - 1}.3f}s {t_cand:{widths[1] - 1}.3f}s {t_ref / t_cand:7.2f}x  "
+              f"{'same' if same_topology else 'DIFF'}   {'same' if same_volume else 'DIFF'}"
+              f"  ({a['faces']} faces, {a['volume']:.1f} mm³{extra})")
+        if not same:
+            print(f"  ❌ {labels[0]} {a} vs {labels[1]} {b}, symmetric difference {leftover:.3f} mm³")
+
+    print(f"{'total':<12} {total_ref:{widths[0] - 1}.3f}s {total_cand:{widths[1] - 1}.3f}s {total_ref / total_cand:7.2f}x")
+    return 0 if ok else 1
@@ -0,0 +1,27 @@
+"""Benchmark: sequential vs batched subtractive features in build_shell().
+
+For each fastener preset this builds the shell both ways, checks that the
+results are the same solid (volume, face/edge/solid counts and an empty
+symmetric difference) and reports the speed-up of the single batched cut.
+
+    python bench_shell_cuts.py [--repeat N]
+"""
+
+import argparse
+import sys
+
+import case3b
+from bench_compare import compare
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="builds per mode and preset (median is reported)")
+    args = parser.parse_args(argv)
+    return compare(lambda p: case3b.build_shell(p, batch_cuts=False),
+                   lambda p: case3b.build_shell(p, batch_cuts=True),
+                   ("sequential", "batched"), args.repeat)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Benchmark suite: build, tessellate and export every part, per preset.
+
+For each fastener preset and each part this times four stages separately -
+the build, tessellation (meshes.export_mesh, as export_stl),
+export_stl and export_step - and reports the median of --repeat runs. Each
+stage starts from a part without a triangulation or cached mesh, so the STL
+export pays for its own meshing just as the first export of a part does in
+case3b.py.
+
+Results are written as JSON and, given a baseline, compared stage by stage:
+a stage regresses when it is more than --threshold times slower than the
+baseline (and slower by more than the --min-delta noise floor).
+
+    python bench_suite.py                              # all presets -> bench_results.json
+    python bench_suite.py --baseline bench_baseline.json --threshold 2
+    python bench_suite.py --preset hybrid --save-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import build123d
+from OCP.BRepTools import BRepTools
+
+import case3b
+import meshes
+
+STAGES = ("build", "tessellate", "export_stl", "export_step")
+DEFAULT_BASELINE = "bench_baseline.json"
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_part(name, p, out_dir):
+    """One pass over the stages for one part: {stage: seconds}."""
+    part, build = _timed(case3b.BUILDERS[name], p)
+    times = {"build": build}
+    stages = {
+        "tessellate": lambda: meshes.export_mesh(part),
+        "export_stl": lambda: case3b.export_stl(part, os.path.join(out_dir, f"{name}.stl")),
+        "export_step": lambda: case3b.export_step(part, os.path.join(out_dir, f"{name}.step")),
+    }
+    for stage, fn in stages.items():
+        BRepTools.Clean_s(part.wrapped)  # drop the triangulation and mesh of the previous stage
+        meshes.clear()
+        _, times[stage] = _timed(fn)
+    return times
+
+
+def run(presets, repeat=3, parts=tuple(case3b.BUILDERS)):
+    """{preset: {part: {stage: median seconds}}}"""
+    results = {}
+    with tempfile.TemporaryDirectory() as out_dir:
+        for preset in presets:
+            p = case3b.CaseParams(**case3b.PRESETS[preset])
+            results[preset] = {}
+            for name in parts:
+                runs = [bench_part(name, p, out_dir) for _ in range(repeat)]
+                results[preset][name] = {stage: round(statistics.median(r[stage] for r in runs), 4) for stage in STAGES}
+    return results
+
+
+def compare(results, baseline, threshold=2.0, min_delta=0.05):
+    """[(preset, part, stage, base, new)] for every stage that regressed."""
+    regressions = []
+    for preset, parts in results.items():
+        for name, stages in parts.items():
+            for stage, new in stages.items():
+                base = baseline.get(preset, {}).get(name, {}).get(stage)
+                if base and new > threshold * base and new - base > min_delta:
+                    regressions.append((preset, name, stage, base, new))
+    return regressions
+
+
+def print_table(results, baseline=None):
+    print(f"{'preset':<12} {'part':<7} " + " ".join(f"{stage:>13}" for stage in STAGES))
+    for preset, parts in results.items():
+        for name, stages in parts.items():
+            cells = []
+            for stage in STAGES:
+                base = (baseline or {}).get(preset, {}).get(name, {}).get(stage)
+                ratio = f" {stages[stage] / base:4.1f}x" if base else ""
+                cells.append(f"{stages[stage]:7.3f}s{ratio}".rjust(13))
+            print(f"{preset:<12} {name:<7} " + " ".join(cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--preset", nargs="+", default=list(case3b.PRESETS), choices=list(case3b.PRESETS), help="presets to benchmark (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage (median is reported)")
+    parser.add_argument("--json", default="bench_results.json", help="where to write the results (default: %(default)s)")
+    parser.add_argument("--baseline", default=None, help=f"baseline JSON to compare against (e.g. {DEFAULT_BASELINE})")
+    parser.add_argument("--threshold", type=float, default=2.0, help="slow-down factor that counts as a regression (default: %(default)s)")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="ignore slow-downs smaller than this many seconds (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"also write the results to --baseline (default {DEFAULT_BASELINE})")
+    args = parser.parse_args(argv)
+
+    results = run(args.preset, args.repeat)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "build123d": build123d.__version__,
+            "machine": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.json, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    if args.save_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+
+    baseline = None
+    if args.baseline and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    print_table(results, baseline)
+    print(f"Results written to {args.json}")
+
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline, args.threshold, args.min_delta)
+    for preset, name, stage, base, new in regressions:
+        print(f"❌ {preset}/{name}/{stage}: {base:.3f}s -> {new:.3f}s ({new / base:.1f}x, threshold {args.threshold}x)")
+    if not regressions:
+        print(f"✅ No stage slower than {args.threshold}x the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
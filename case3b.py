@@ -1,420 +1,967 @@
+import argparse
+import os
+from dataclasses import dataclass, fields
+
 from build123d import *
-from ocp_vscode import show, show_object, set_port, set_defaults, Camera
 
-# ==============================================================================
-# 1. CONFIGURATION SWITCHES
-# ==============================================================================
-# Configure which locations use heat set inserts vs direct screw tapping
-# True = Heat set inserts (larger holes + entry chamfers for easy installation)
-# False = Direct screw tap (smaller holes for tapping threads directly)
+import layout
+import meshes
+import prism
+import profiler
+from depgraph import DependencyGraph, trace_build
+from export_pipeline import ExportPipeline
+from part_cache import PartCache, part_key
+from prism import Prism, compile_prisms
+
+# Everything below is driven by a frozen CaseParams object, so importing this
+# module is cheap and has no side effects. Run it as a script to build and
+# export all three parts, or import it and call build_base/build_shell/
+# build_washer/export yourself:
 #
-# TOTAL: 15 threaded holes in this design
-#   - 2x SSR mounting (M3)
-#   - 4x Terminal block (M3)
-#   - 4x Corner posts (M3) - structural, holds shell to base
-#   - 2x UK socket (M3.5)
-#   - 2x C14 inlet (M3)
-#   - 1x PID clamp (M3)
-
-USE_INSERTS_SSR = True          # SSR mounting (2x M3 on base)
-USE_INSERTS_TERMINAL = False     # Terminal block (4x M3 on base)
-USE_INSERTS_CORNERS = True      # Corner posts (4x M3 shell-to-base) - RECOMMENDED for inserts
-USE_INSERTS_SOCKET = True       # UK socket mounting (2x M3.5 on roof)
-USE_INSERTS_C14 = True          # C14 inlet (2x M3 on back wall)
-USE_INSERTS_PID_CLAMP = True    # PID clamp screw (1x M3 on front wall)
-
-# Quick presets (uncomment one to use)
-# ALL INSERTS: USE_INSERTS_SSR = USE_INSERTS_TERMINAL = USE_INSERTS_CORNERS = USE_INSERTS_SOCKET = USE_INSERTS_C14 = USE_INSERTS_PID_CLAMP = True
-# ALL SCREWS: USE_INSERTS_SSR = USE_INSERTS_TERMINAL = USE_INSERTS_CORNERS = USE_INSERTS_SOCKET = USE_INSERTS_C14 = USE_INSERTS_PID_CLAMP = False
-# HYBRID (Structural only): USE_INSERTS_CORNERS = True 
-
-# ==============================================================================
-# 2. PARAMETERS
-# ==============================================================================
-
-# -- Global Settings --
-WALL_THICKNESS = 3.0
-ROOF_THICKNESS = 3.0 
-BASE_THICKNESS = 5.0 
-FILLET_R = 4.0       
-FIT_TOLERANCE = 0.3  
-
-# -- Feet Settings --
-FOOT_DIA = 12.0       
-FOOT_DEPTH = 2.0      
-FOOT_OFFSET = 15.0    
-
-# -- Fasteners Logic --
-SCREW_M3_CLEARANCE = 3.4      
-M3_HEAD_DIA = 6.0             
-M3_HEAD_H = 3.0               
-
-# -- Fastener Sizes (per location) --
-# M3 Heat set insert: 4.0mm OD x 5.7mm L (standard)
-# M3.5 Heat set insert: 4.6mm OD x 6.0mm L (standard)
-THREAD_M3_INSERT = 4.2         # Hole for M3 heat set insert
-THREAD_M35_INSERT = 4.8        # Hole for M3.5 heat set insert
-THREAD_M3_TAP = 2.8            # Hole for direct M3 screw tapping
-THREAD_M35_TAP = 2.8           # Hole for direct M3.5 screw tapping
-
-# Chamfer for heat set insert entry (makes installation MUCH easier!)
-# - Guides insert in straight
-# - Prevents surface mushrooming
-# - Reduces installation force
-INSERT_CHAMFER_M3_DIA = 5.5    # Slightly larger than M3 insert OD
-INSERT_CHAMFER_M35_DIA = 5.8   # Slightly larger than M3.5 insert OD
-INSERT_CHAMFER_DEPTH = 0.8     # ~45° chamfer depth (0.8mm gives ~45° angle)      
-
-# -- Components --
-# Standard 1/16 DIN Inkbird Sizes
-PID_BODY_W, PID_BODY_H = 45.0, 45.0   
-PID_BODY_D = 100.0                    
-PID_BEZEL_W, PID_BEZEL_H = 48.0, 48.0 
-PID_FLOOR_CLEARANCE = 12.0 
-
-SSR_W, SSR_L, SSR_H = 50.0, 80.0, 73.0
-SSR_MOUNT_SPACING = 72.0
-SSR_PLATFORM_HEIGHT = 4.0 
-
-UK_SOCKET_CUTOUT_SIZE = 73.0 
-UK_SOCKET_MOUNT_PITCH = 60.3
-SOCKET_BOSS_DIA = 12.0
-SOCKET_BOSS_DEPTH = 8.0 
-
-C14_BODY_W, C14_BODY_H = 28.0, 48.0
-C14_SCREW_PITCH = 40.0
-C14_BOSS_DEPTH = 10.0
-C14_GHOST_DEPTH = 30.0 + 15.0 
-
-TERM_W, TERM_D, TERM_H = 36.0, 21.0, 13.0
-TERM_MOUNT_X, TERM_MOUNT_Y = 28.0, 8.0
-TERM_BOSS_HEIGHT = 5.0
-
-# -- Layout --
-SIDE_MARGIN = 20.0
-INTERNAL_L = 155.0 
-INTERNAL_H = 100.0 
-
-INTERNAL_W = SIDE_MARGIN + PID_BEZEL_W + 20 + SSR_W + SIDE_MARGIN
-
-BOX_W = INTERNAL_W + 2 * WALL_THICKNESS
-BOX_L = INTERNAL_L + 2 * WALL_THICKNESS
-BOX_H = INTERNAL_H + ROOF_THICKNESS
-
-# ==============================================================================
-# 3. POSITIONING
-# ==============================================================================
-pid_x = -INTERNAL_W/2 + SIDE_MARGIN + PID_BODY_W/2
-pid_y = -INTERNAL_L/2 + PID_BODY_D/2 
-# PID Position: Starts 20mm up from Z=0
-pid_z_start = 20.0 
-pid_z_end = pid_z_start + PID_BODY_H + FIT_TOLERANCE 
-pid_z_center = pid_z_start + (PID_BODY_H + FIT_TOLERANCE)/2
+#     import case3b
+#     p = case3b.CaseParams(USE_INSERTS_TERMINAL=True)
+#     shell = case3b.build_shell(p)
+
+
+@dataclass(frozen=True)
+class CaseParams:
+    # ==========================================================================
+    # 1. CONFIGURATION SWITCHES
+    # ==========================================================================
+    # Configure which locations use heat set inserts vs direct screw tapping
+    # True = Heat set inserts (larger holes + entry chamfers for easy installation)
+    # False = Direct screw tap (smaller holes for tapping threads directly)
+    #
+    # TOTAL: 15 threaded holes in this design
+    #   - 2x SSR mounting (M3)
+    #   - 4x Terminal block (M3)
+    #   - 4x Corner posts (M3) - structural, holds shell to base
+    #   - 2x UK socket (M3.5)
+    #   - 2x C14 inlet (M3)
+    #   - 1x PID clamp (M3)
+
+    USE_INSERTS_SSR: bool = True          # SSR mounting (2x M3 on base)
+    USE_INSERTS_TERMINAL: bool = False    # Terminal block (4x M3 on base)
+    USE_INSERTS_CORNERS: bool = True      # Corner posts (4x M3 shell-to-base) - RECOMMENDED for inserts
+    USE_INSERTS_SOCKET: bool = True       # UK socket mounting (2x M3.5 on roof)
+    USE_INSERTS_C14: bool = True          # C14 inlet (2x M3 on back wall)
+    USE_INSERTS_PID_CLAMP: bool = True    # PID clamp screw (1x M3 on front wall)
+
+    # Quick presets: see PRESETS below, e.g. CaseParams(**PRESETS["all-screws"])
+
+    # ==========================================================================
+    # 2. PARAMETERS
+    # ==========================================================================
+
+    # -- Global Settings --
+    WALL_THICKNESS: float = 3.0
+    ROOF_THICKNESS: float = 3.0
+    BASE_THICKNESS: float = 5.0
+    FILLET_R: float = 4.0
+    FIT_TOLERANCE: float = 0.3
+
+    # -- Feet Settings --
+    FOOT_DIA: float = 12.0
+    FOOT_DEPTH: float = 2.0
+    FOOT_OFFSET: float = 15.0
+
+    # -- Fasteners Logic --
+    SCREW_M3_CLEARANCE: float = 3.4
+    M3_HEAD_DIA: float = 6.0
+    M3_HEAD_H: float = 3.0
+
+    # -- Fastener Sizes (per location) --
+    # M3 Heat set insert: 4.0mm OD x 5.7mm L (standard)
+    # M3.5 Heat set insert: 4.6mm OD x 6.0mm L (standard)
+    THREAD_M3_INSERT: float = 4.2         # Hole for M3 heat set insert
+    THREAD_M35_INSERT: float = 4.8        # Hole for M3.5 heat set insert
+    THREAD_M3_TAP: float = 2.8            # Hole for direct M3 screw tapping
+    THREAD_M35_TAP: float = 2.8           # Hole for direct M3.5 screw tapping
+
+    # Chamfer for heat set insert entry (makes installation MUCH easier!)
+    # - Guides insert in straight
+    # - Prevents surface mushrooming
+    # - Reduces installation force
+    INSERT_CHAMFER_M3_DIA: float = 5.5    # Slightly larger than M3 insert OD
+    INSERT_CHAMFER_M35_DIA: float = 5.8   # Slightly larger than M3.5 insert OD
+    INSERT_CHAMFER_DEPTH: float = 0.8     # ~45° chamfer depth (0.8mm gives ~45° angle)
+
+    # -- Components --
+    # Standard 1/16 DIN Inkbird Sizes
+    PID_BODY_W: float = 45.0
+    PID_BODY_H: float = 45.0
+    PID_BODY_D: float = 100.0
+    PID_BEZEL_W: float = 48.0
+    PID_BEZEL_H: float = 48.0
+    PID_FLOOR_CLEARANCE: float = 12.0
+
+    SSR_W: float = 50.0
+    SSR_L: float = 80.0
+    SSR_H: float = 73.0
+    SSR_MOUNT_SPACING: float = 72.0
+    SSR_PLATFORM_HEIGHT: float = 4.0
+
+    UK_SOCKET_CUTOUT_SIZE: float = 73.0
+    UK_SOCKET_MOUNT_PITCH: float = 60.3
+    SOCKET_BOSS_DIA: float = 12.0
+    SOCKET_BOSS_DEPTH: float = 8.0
+
+    C14_BODY_W: float = 28.0
+    C14_BODY_H: float = 48.0
+    C14_SCREW_PITCH: float = 40.0
+    C14_BOSS_DEPTH: float = 10.0
+    C14_GHOST_DEPTH: float = 30.0 + 15.0
+
+    TERM_W: float = 36.0
+    TERM_D: float = 21.0
+    TERM_H: float = 13.0
+    TERM_MOUNT_X: float = 28.0
+    TERM_MOUNT_Y: float = 8.0
+    TERM_BOSS_HEIGHT: float = 5.0
+
+    # -- Washer --
+    # Small ABS washer: 9mm OD, M3 clearance hole, 1.5mm thick
+    WASHER_OD: float = 9.0
+    WASHER_ID: float = 3.4  # M3 clearance hole
+    WASHER_THICKNESS: float = 1.5
+
+    # -- Layout --
+    SIDE_MARGIN: float = 20.0
+    INTERNAL_L: float = 155.0
+    INTERNAL_H: float = 100.0
+
+    @property
+    def INTERNAL_W(self):
+        return self.SIDE_MARGIN + self.PID_BEZEL_W + 20 + self.SSR_W + self.SIDE_MARGIN
+
+    @property
+    def BOX_W(self):
+        return self.INTERNAL_W + 2 * self.WALL_THICKNESS
+
+    @property
+    def BOX_L(self):
+        return self.INTERNAL_L + 2 * self.WALL_THICKNESS
+
+    @property
+    def BOX_H(self):
+        return self.INTERNAL_H + self.ROOF_THICKNESS
+
+    # ==========================================================================
+    # 3. POSITIONING
+    # ==========================================================================
+    pid_z_start: float = 20.0       # PID Position: Starts 20mm up from Z=0
+    ssr_front_gap: float = 20.0     # SSR distance from the inner front wall
+    socket_y: float = 10.0
+    c14_z: float = 45.0
+    term_rear_gap: float = 40.0     # Terminal block distance from the inner rear wall
+
+    @property
+    def pid_x(self):
+        return -self.INTERNAL_W/2 + self.SIDE_MARGIN + self.PID_BODY_W/2
+
+    @property
+    def pid_y(self):
+        return -self.INTERNAL_L/2 + self.PID_BODY_D/2
+
+    @property
+    def pid_z_end(self):
+        return self.pid_z_start + self.PID_BODY_H + self.FIT_TOLERANCE
+
+    @property
+    def pid_z_center(self):
+        return self.pid_z_start + (self.PID_BODY_H + self.FIT_TOLERANCE)/2
+
+    @property
+    def ssr_x(self):
+        return self.INTERNAL_W/2 - self.SIDE_MARGIN - self.SSR_W/2
+
+    @property
+    def ssr_y(self):
+        return -self.INTERNAL_L/2 + self.ssr_front_gap + self.SSR_L/2
+
+    @property
+    def ssr_z(self):
+        return self.BASE_THICKNESS + self.SSR_PLATFORM_HEIGHT
+
+    @property
+    def socket_x(self):
+        return self.pid_x + 5.0
+
+    @property
+    def c14_x(self):
+        return self.ssr_x
+
+    @property
+    def c14_y(self):
+        return self.BOX_L/2
+
+    @property
+    def term_x(self):
+        return self.pid_x
+
+    @property
+    def term_y(self):
+        return self.INTERNAL_L/2 - self.term_rear_gap
+
+    # Corner screws: base clearance holes line up with the shell's corner posts
+    @property
+    def corner_off_x(self):
+        return self.BOX_W/2 - 6.0
+
+    @property
+    def corner_off_y(self):
+        return self.BOX_L/2 - 6.0
 
-ssr_x = INTERNAL_W/2 - SIDE_MARGIN - SSR_W/2
-ssr_y = -INTERNAL_L/2 + 20 + SSR_L/2
-ssr_z = BASE_THICKNESS + SSR_PLATFORM_HEIGHT
 
-socket_x = pid_x + 5.0
-socket_y = 10.0 
+SWITCHES = [f.name for f in fields(CaseParams) if f.name.startswith("USE_INSERTS_")]
+
+# Quick presets (switch overrides for CaseParams)
+PRESETS = {
+    "all-inserts": dict.fromkeys(SWITCHES, True),
+    "all-screws": dict.fromkeys(SWITCHES, False),
+    "hybrid": {**dict.fromkeys(SWITCHES, False), "USE_INSERTS_CORNERS": True},  # Structural only
+}
 
-c14_x = ssr_x 
-c14_y = BOX_L/2 
-c14_z = 45.0 
+DEFAULT_PARAMS = CaseParams()
 
-term_x = pid_x
-term_y = INTERNAL_L/2 - 40.0
 
 # ==============================================================================
 # 4. BUILD BASE PLATE
 # ==============================================================================
-with BuildPart() as base:
-    # Main Plate
-    with BuildSketch():
-        Rectangle(BOX_W, BOX_L)
-        fillet(vertices(), radius=FILLET_R)
-    extrude(amount=BASE_THICKNESS)
-    
-    # SSR Mounts
-    with Locations((ssr_x, ssr_y, BASE_THICKNESS)):
-        with Locations((0, SSR_MOUNT_SPACING/2), (0, -SSR_MOUNT_SPACING/2)):
-            Box(SSR_W, 12.0, SSR_PLATFORM_HEIGHT, align=(Align.CENTER, Align.CENTER, Align.MIN))
-
-    # SSR Base Grill
-    with BuildSketch(Plane.XY):
-        with Locations((ssr_x, ssr_y)):
-            with GridLocations(6, 0, 6, 1):
-                SlotOverall(30, 3, rotation=90)
-    extrude(amount=BASE_THICKNESS, mode=Mode.SUBTRACT)
-
-    # SSR Holes
-    ssr_boss_top = BASE_THICKNESS + SSR_PLATFORM_HEIGHT
-    ssr_hole_dia = THREAD_M3_INSERT if USE_INSERTS_SSR else THREAD_M3_TAP
-    with Locations((ssr_x, ssr_y, 0)):
-        with Locations((0, SSR_MOUNT_SPACING/2), (0, -SSR_MOUNT_SPACING/2)):
-            Cylinder(radius=ssr_hole_dia/2, height=ssr_boss_top + 1.0, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=Mode.SUBTRACT)
-
-    # Chamfer for heat set insert entry (from top of boss)
-    if USE_INSERTS_SSR:
-        with Locations((ssr_x, ssr_y, ssr_boss_top)):
-            with Locations((0, SSR_MOUNT_SPACING/2), (0, -SSR_MOUNT_SPACING/2)):
-                Cylinder(radius=INSERT_CHAMFER_M3_DIA/2, height=INSERT_CHAMFER_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MAX), mode=Mode.SUBTRACT)
-
-    # Terminal Block Platform
-    with Locations((term_x, term_y, BASE_THICKNESS)):
-        Box(TERM_W + 4, TERM_D + 4, TERM_BOSS_HEIGHT, align=(Align.CENTER, Align.CENTER, Align.MIN))
-        
-    # Terminal Block Holes
-    term_boss_top = BASE_THICKNESS + TERM_BOSS_HEIGHT
-    term_hole_dia = THREAD_M3_INSERT if USE_INSERTS_TERMINAL else THREAD_M3_TAP
-    with Locations((term_x, term_y, 0)):
-        with GridLocations(TERM_MOUNT_X, TERM_MOUNT_Y, 2, 2):
-            Cylinder(radius=term_hole_dia/2, height=term_boss_top + 1.0, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=Mode.SUBTRACT)
-
-    # Chamfer for heat set insert entry (from top of boss)
-    if USE_INSERTS_TERMINAL:
-        with Locations((term_x, term_y, term_boss_top)):
-            with GridLocations(TERM_MOUNT_X, TERM_MOUNT_Y, 2, 2):
-                Cylinder(radius=INSERT_CHAMFER_M3_DIA/2, height=INSERT_CHAMFER_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MAX), mode=Mode.SUBTRACT)
-
-    # Labyrinth Strain Relief
-    lab_y = INTERNAL_L/2 - 8.0 
-    with Locations((term_x, lab_y, BASE_THICKNESS)):
-        Cylinder(radius=2.5, height=12, align=(Align.CENTER, Align.CENTER, Align.MIN))
-        with Locations((-7, -5), (7, -5)):
+# Every base feature is a vertical prism, so by default the base is compiled
+# from a few 2D cross-sections (see prism.py) instead of one 3D boolean per
+# hole. build_base(p, compiled=False) is the feature-by-feature reference.
+COMPILE_BASE = True
+
+
+def base_prisms(p=DEFAULT_PARAMS):
+    """The base plate as an ordered list of vertical prisms (see build_base)."""
+    def faces(*sketches):
+        return tuple(face for sketch in sketches for face in sketch.faces())
+
+    def circles(points, dia):
+        return faces(*(Pos(x, y) * Circle(dia/2) for x, y in points))
+
+    ssr_mounts = [(p.ssr_x, p.ssr_y + p.SSR_MOUNT_SPACING/2), (p.ssr_x, p.ssr_y - p.SSR_MOUNT_SPACING/2)]
+    term_mounts = [(p.term_x + dx, p.term_y + dy) for dx in (-p.TERM_MOUNT_X/2, p.TERM_MOUNT_X/2) for dy in (-p.TERM_MOUNT_Y/2, p.TERM_MOUNT_Y/2)]
+    lab_y = p.INTERNAL_L/2 - 8.0
+    labyrinth = [(p.term_x, lab_y), (p.term_x - 7, lab_y - 5), (p.term_x + 7, lab_y - 5)]
+    feet = [(sx * (p.BOX_W/2 - p.FOOT_OFFSET), sy * (p.BOX_L/2 - p.FOOT_OFFSET)) for sx, sy in ((1, 1), (-1, 1), (1, -1), (-1, -1))]
+    corners = [(sx * p.corner_off_x, sy * p.corner_off_y) for sx, sy in ((1, 1), (-1, 1), (1, -1), (-1, -1))]
+    ssr_boss_top = p.BASE_THICKNESS + p.SSR_PLATFORM_HEIGHT
+    term_boss_top = p.BASE_THICKNESS + p.TERM_BOSS_HEIGHT
+    ssr_hole_dia = p.THREAD_M3_INSERT if p.USE_INSERTS_SSR else p.THREAD_M3_TAP
+    term_hole_dia = p.THREAD_M3_INSERT if p.USE_INSERTS_TERMINAL else p.THREAD_M3_TAP
+
+    prisms = [
+        Prism(faces(fillet(Rectangle(p.BOX_W, p.BOX_L).vertices(), radius=p.FILLET_R)), 0, p.BASE_THICKNESS, name="plate"),
+        Prism(faces(*(Pos(x, y) * Rectangle(p.SSR_W, 12.0) for x, y in ssr_mounts)), p.BASE_THICKNESS, ssr_boss_top, name="ssr mounts"),
+        Prism(faces(*(Pos(p.ssr_x + dx, p.ssr_y) * SlotOverall(30, 3, rotation=90) for dx in range(-15, 16, 6))), 0, p.BASE_THICKNESS, True, "ssr grill"),
+        Prism(circles(ssr_mounts, ssr_hole_dia), 0, ssr_boss_top + 1.0, True, "ssr holes"),
+    ]
+    if p.USE_INSERTS_SSR:
+        prisms.append(Prism(circles(ssr_mounts, p.INSERT_CHAMFER_M3_DIA), ssr_boss_top - p.INSERT_CHAMFER_DEPTH, ssr_boss_top, True, "ssr chamfers"))
+    prisms += [
+        Prism(faces(Pos(p.term_x, p.term_y) * Rectangle(p.TERM_W + 4, p.TERM_D + 4)), p.BASE_THICKNESS, term_boss_top, name="terminal platform"),
+        Prism(circles(term_mounts, term_hole_dia), 0, term_boss_top + 1.0, True, "terminal holes"),
+    ]
+    if p.USE_INSERTS_TERMINAL:
+        prisms.append(Prism(circles(term_mounts, p.INSERT_CHAMFER_M3_DIA), term_boss_top - p.INSERT_CHAMFER_DEPTH, term_boss_top, True, "terminal chamfers"))
+    prisms += [
+        Prism(circles(labyrinth, 5.0), p.BASE_THICKNESS, p.BASE_THICKNESS + 12, name="labyrinth"),
+        Prism(circles(feet, p.FOOT_DIA), 0, p.FOOT_DEPTH, True, "feet"),
+        Prism(circles(corners, p.SCREW_M3_CLEARANCE), 0, p.BASE_THICKNESS + 1.0, True, "corner holes"),
+        Prism(circles(corners, p.M3_HEAD_DIA), 0, p.M3_HEAD_H, True, "corner counterbores"),
+    ]
+    return prisms
+
+
+def build_base(p=DEFAULT_PARAMS, compiled=COMPILE_BASE):
+    if compiled:
+        features = profiler.timeline("base")
+        features.mark("Prism list")
+        prisms = base_prisms(p)
+        features.mark("Compile prisms")
+        part = compile_prisms(prisms)
+        features.end(part)
+        return part
+
+    with BuildPart() as base:
+        features = profiler.timeline("base", base)
+        # Main Plate
+        features.mark("Main Plate")
+        with BuildSketch():
+            Rectangle(p.BOX_W, p.BOX_L)
+            fillet(vertices(), radius=p.FILLET_R)
+        extrude(amount=p.BASE_THICKNESS)
+
+        # SSR Mounts
+        features.mark("SSR Mounts")
+        with Locations((p.ssr_x, p.ssr_y, p.BASE_THICKNESS)):
+            with Locations((0, p.SSR_MOUNT_SPACING/2), (0, -p.SSR_MOUNT_SPACING/2)):
+                Box(p.SSR_W, 12.0, p.SSR_PLATFORM_HEIGHT, align=(Align.CENTER, Align.CENTER, Align.MIN))
+
+        # SSR Base Grill
+        features.mark("SSR Base Grill")
+        with BuildSketch(Plane.XY):
+            with Locations((p.ssr_x, p.ssr_y)):
+                with GridLocations(6, 0, 6, 1):
+                    SlotOverall(30, 3, rotation=90)
+        extrude(amount=p.BASE_THICKNESS, mode=Mode.SUBTRACT)
+
+        # SSR Holes
+        features.mark("SSR Holes")
+        ssr_boss_top = p.BASE_THICKNESS + p.SSR_PLATFORM_HEIGHT
+        ssr_hole_dia = p.THREAD_M3_INSERT if p.USE_INSERTS_SSR else p.THREAD_M3_TAP
+        with Locations((p.ssr_x, p.ssr_y, 0)):
+            with Locations((0, p.SSR_MOUNT_SPACING/2), (0, -p.SSR_MOUNT_SPACING/2)):
+                Cylinder(radius=ssr_hole_dia/2, height=ssr_boss_top + 1.0, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=Mode.SUBTRACT)
+
+        # Chamfer for heat set insert entry (from top of boss)
+        if p.USE_INSERTS_SSR:
+            features.mark("SSR Insert Chamfers")
+            with Locations((p.ssr_x, p.ssr_y, ssr_boss_top)):
+                with Locations((0, p.SSR_MOUNT_SPACING/2), (0, -p.SSR_MOUNT_SPACING/2)):
+                    Cylinder(radius=p.INSERT_CHAMFER_M3_DIA/2, height=p.INSERT_CHAMFER_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MAX), mode=Mode.SUBTRACT)
+
+        # Terminal Block Platform
+        features.mark("Terminal Block Platform")
+        with Locations((p.term_x, p.term_y, p.BASE_THICKNESS)):
+            Box(p.TERM_W + 4, p.TERM_D + 4, p.TERM_BOSS_HEIGHT, align=(Align.CENTER, Align.CENTER, Align.MIN))
+
+        # Terminal Block Holes
+        features.mark("Terminal Block Holes")
+        term_boss_top = p.BASE_THICKNESS + p.TERM_BOSS_HEIGHT
+        term_hole_dia = p.THREAD_M3_INSERT if p.USE_INSERTS_TERMINAL else p.THREAD_M3_TAP
+        with Locations((p.term_x, p.term_y, 0)):
+            with GridLocations(p.TERM_MOUNT_X, p.TERM_MOUNT_Y, 2, 2):
+                Cylinder(radius=term_hole_dia/2, height=term_boss_top + 1.0, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=Mode.SUBTRACT)
+
+        # Chamfer for heat set insert entry (from top of boss)
+        if p.USE_INSERTS_TERMINAL:
+            features.mark("Terminal Insert Chamfers")
+            with Locations((p.term_x, p.term_y, term_boss_top)):
+                with GridLocations(p.TERM_MOUNT_X, p.TERM_MOUNT_Y, 2, 2):
+                    Cylinder(radius=p.INSERT_CHAMFER_M3_DIA/2, height=p.INSERT_CHAMFER_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MAX), mode=Mode.SUBTRACT)
+
+        # Labyrinth Strain Relief
+        features.mark("Labyrinth Strain Relief")
+        lab_y = p.INTERNAL_L/2 - 8.0
+        with Locations((p.term_x, lab_y, p.BASE_THICKNESS)):
             Cylinder(radius=2.5, height=12, align=(Align.CENTER, Align.CENTER, Align.MIN))
+            with Locations((-7, -5), (7, -5)):
+                Cylinder(radius=2.5, height=12, align=(Align.CENTER, Align.CENTER, Align.MIN))
 
-    # Feet Indents
-    with BuildSketch(Plane.XY):
+        # Feet Indents
+        features.mark("Feet Indents")
+        with BuildSketch(Plane.XY):
+            with Locations(
+                (p.BOX_W/2 - p.FOOT_OFFSET, p.BOX_L/2 - p.FOOT_OFFSET), (-p.BOX_W/2 + p.FOOT_OFFSET, p.BOX_L/2 - p.FOOT_OFFSET),
+                (p.BOX_W/2 - p.FOOT_OFFSET, -p.BOX_L/2 + p.FOOT_OFFSET), (-p.BOX_W/2 + p.FOOT_OFFSET, -p.BOX_L/2 + p.FOOT_OFFSET)
+            ):
+                 Circle(radius=p.FOOT_DIA/2)
+        extrude(amount=p.FOOT_DEPTH, mode=Mode.SUBTRACT)
+
+        # Corner Screw Holes
+        features.mark("Corner Screw Holes")
         with Locations(
-            (BOX_W/2 - FOOT_OFFSET, BOX_L/2 - FOOT_OFFSET), (-BOX_W/2 + FOOT_OFFSET, BOX_L/2 - FOOT_OFFSET),
-            (BOX_W/2 - FOOT_OFFSET, -BOX_L/2 + FOOT_OFFSET), (-BOX_W/2 + FOOT_OFFSET, -BOX_L/2 + FOOT_OFFSET)
+            (p.corner_off_x, p.corner_off_y), (-p.corner_off_x, p.corner_off_y),
+            (p.corner_off_x, -p.corner_off_y), (-p.corner_off_x, -p.corner_off_y)
         ):
-             Circle(radius=FOOT_DIA/2)
-    extrude(amount=FOOT_DEPTH, mode=Mode.SUBTRACT)
-
-    # Corner Screw Holes
-    corner_off_x = BOX_W/2 - 6.0
-    corner_off_y = BOX_L/2 - 6.0
-    with Locations(
-        (corner_off_x, corner_off_y), (-corner_off_x, corner_off_y),
-        (corner_off_x, -corner_off_y), (-corner_off_x, -corner_off_y)
-    ):
-        Cylinder(radius=SCREW_M3_CLEARANCE/2, height=BASE_THICKNESS + 1.0, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=Mode.SUBTRACT)
-        Cylinder(radius=M3_HEAD_DIA/2, height=M3_HEAD_H, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=Mode.SUBTRACT)
+            Cylinder(radius=p.SCREW_M3_CLEARANCE/2, height=p.BASE_THICKNESS + 1.0, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=Mode.SUBTRACT)
+            Cylinder(radius=p.M3_HEAD_DIA/2, height=p.M3_HEAD_H, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=Mode.SUBTRACT)
+        features.end()
+    return base.part
 
 
 # ==============================================================================
 # 5. BUILD SHELL
 # ==============================================================================
-with BuildPart() as shell:
-    with BuildSketch():
-        Rectangle(BOX_W, BOX_L)
-        fillet(vertices(), radius=FILLET_R)
-    extrude(amount=BOX_H)
-    
-    with BuildSketch(faces().sort_by(Axis.Z)[0]): 
-        Rectangle(BOX_W - 2*WALL_THICKNESS, BOX_L - 2*WALL_THICKNESS)
-        fillet(vertices(), radius=FILLET_R - WALL_THICKNESS)
-    extrude(amount=-(BOX_H - ROOF_THICKNESS), mode=Mode.SUBTRACT)
-
-    # Corner Posts
-    post_h = BOX_H - ROOF_THICKNESS
-    corner_hole_dia = THREAD_M3_INSERT if USE_INSERTS_CORNERS else THREAD_M3_TAP
-    with Locations((0,0, BOX_H - ROOF_THICKNESS)):
-        with Locations(
-            (corner_off_x, corner_off_y), (-corner_off_x, corner_off_y),
-            (corner_off_x, -corner_off_y), (-corner_off_x, -corner_off_y)
-        ):
-            Cylinder(radius=5.0, height=post_h, align=(Align.CENTER, Align.CENTER, Align.MAX))
-            Cylinder(radius=corner_hole_dia/2, height=post_h, align=(Align.CENTER, Align.CENTER, Align.MAX), mode=Mode.SUBTRACT)
-
-    # Chamfer for heat set insert entry (from bottom of posts)
-    if USE_INSERTS_CORNERS:
-        with Locations((0, 0, 0)):
+# Apply the shell's holes, chamfers, cutouts and slots as one multi-tool cut
+# after the additive features, instead of one boolean per feature against an
+# ever more complex solid. See bench_shell_cuts.py for the equivalence check.
+BATCH_SHELL_CUTS = True
+
+
+class CutterBatch:
+    """Collects subtractive tools so they can be applied in a single cut.
+
+    Features are still created in builder order: pass every subtractive
+    feature (created with mode=cutters.mode) to cut() and every later
+    additive feature to keep(). Deferring a cut past an addition is only
+    valid if the cut doesn't remove that new material, so keep() trims the
+    pending tools by the added solid: (S - C) + A == (S + A) - (C - A).
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.mode = Mode.PRIVATE if enabled else Mode.SUBTRACT
+        self.tools = []
+
+    def cut(self, tool):
+        if self.enabled:
+            self.tools.append(tool)
+        return tool
+
+    def keep(self, feature):
+        if self.enabled and self.tools:
+            box = feature.bounding_box()
+            self.tools = [tool.cut(feature) if tool.bounding_box().overlaps(box) else tool for tool in self.tools]
+        return feature
+
+    def apply(self, part):
+        """Return `part` with all pending tools subtracted in one boolean."""
+        if not (self.enabled and self.tools):
+            return part
+        # Tools overlap each other (coaxial holes and chamfers), which the
+        # multi-tool cut doesn't handle reliably, so merge them first - cheap,
+        # as they are all simple primitives.
+        solids = [solid for tool in self.tools for solid in tool.solids()]
+        self.tools = []
+        return Part(part.cut(solids[0].fuse(*solids[1:])).solids())
+
+
+def build_shell(p=DEFAULT_PARAMS, batch_cuts=BATCH_SHELL_CUTS):
+    cutters = CutterBatch(batch_cuts)
+    with BuildPart() as shell:
+        features = profiler.timeline("shell", shell)
+        features.mark("Outer Box")
+        with BuildSketch():
+            Rectangle(p.BOX_W, p.BOX_L)
+            fillet(vertices(), radius=p.FILLET_R)
+        extrude(amount=p.BOX_H)
+
+        features.mark("Inner Cavity")
+        with BuildSketch(faces().sort_by(Axis.Z)[0]):
+            Rectangle(p.BOX_W - 2*p.WALL_THICKNESS, p.BOX_L - 2*p.WALL_THICKNESS)
+            fillet(vertices(), radius=p.FILLET_R - p.WALL_THICKNESS)
+        extrude(amount=-(p.BOX_H - p.ROOF_THICKNESS), mode=Mode.SUBTRACT)
+
+        # Corner Posts
+        features.mark("Corner Posts")
+        post_h = p.BOX_H - p.ROOF_THICKNESS
+        corner_hole_dia = p.THREAD_M3_INSERT if p.USE_INSERTS_CORNERS else p.THREAD_M3_TAP
+        with Locations((0,0, p.BOX_H - p.ROOF_THICKNESS)):
             with Locations(
-                (corner_off_x, corner_off_y), (-corner_off_x, corner_off_y),
-                (corner_off_x, -corner_off_y), (-corner_off_x, -corner_off_y)
+                (p.corner_off_x, p.corner_off_y), (-p.corner_off_x, p.corner_off_y),
+                (p.corner_off_x, -p.corner_off_y), (-p.corner_off_x, -p.corner_off_y)
             ):
-                Cylinder(radius=INSERT_CHAMFER_M3_DIA/2, height=INSERT_CHAMFER_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=Mode.SUBTRACT)
-
-    # PID Cutout
-    with Locations((pid_x, -BOX_L/2, pid_z_center)):
-        Box(PID_BODY_W + FIT_TOLERANCE, WALL_THICKNESS*4, PID_BODY_H + FIT_TOLERANCE, mode=Mode.SUBTRACT)
-
-    # --- FINAL CLAMP LOGIC ---
-    # Width=50, Depth=8
-    clamp_w, clamp_d = 50.0, 8.0
-    # Attached to the inside face of the front wall
-    clamp_y_center = -BOX_L/2 + WALL_THICKNESS + clamp_d/2
-
-    # 1. THE BRACE (Anvil)
-    # Extends from Top of PID (Z=65) to Roof Inner Surface (Z=97)
-    roof_inner_z = BOX_H - ROOF_THICKNESS
-    brace_h = roof_inner_z - pid_z_end
-    brace_z_center = pid_z_end + brace_h/2
-    
-    with Locations((pid_x, clamp_y_center, brace_z_center)):
-        Box(clamp_w, clamp_d, brace_h, align=(Align.CENTER, Align.CENTER, Align.CENTER))
-
-    # 2. THE CLAMP (Hammer)
-    # Extends from Bottom of PID (Z=20) down by 10mm (ends at Z=10)
-    # Does not reach Z=0.
-    clamp_h = 10.0
-    clamp_z_center = pid_z_start - clamp_h/2
-    pid_clamp_hole_dia = THREAD_M3_INSERT if USE_INSERTS_PID_CLAMP else THREAD_M3_TAP
-
-    with Locations((pid_x, clamp_y_center, clamp_z_center)):
-        # Block
-        Box(clamp_w, clamp_d, clamp_h, align=(Align.CENTER, Align.CENTER, Align.CENTER))
-        # Threaded Hole (Vertical through center)
-        Cylinder(radius=pid_clamp_hole_dia/2, height=clamp_h + 20.0, align=(Align.CENTER, Align.CENTER, Align.CENTER), mode=Mode.SUBTRACT)
-
-    # Chamfer for heat set insert entry (from bottom of clamp block - accessible end)
-    if USE_INSERTS_PID_CLAMP:
-        clamp_bottom_z = clamp_z_center - clamp_h/2  # Z=10
-        with Locations((pid_x, clamp_y_center, clamp_bottom_z)):
-            Cylinder(radius=INSERT_CHAMFER_M3_DIA/2, height=INSERT_CHAMFER_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=Mode.SUBTRACT)
-
-
-    # Socket Mounts
-    left_screw_x = socket_x - UK_SOCKET_MOUNT_PITCH/2
-    right_screw_x = socket_x + UK_SOCKET_MOUNT_PITCH/2
-    socket_boss_z = BOX_H - ROOF_THICKNESS
-    socket_hole_dia = THREAD_M35_INSERT if USE_INSERTS_SOCKET else THREAD_M35_TAP
-
-    with Locations((0, socket_y, socket_boss_z)):
-        with Locations((socket_x, 0)):
-            Box(UK_SOCKET_CUTOUT_SIZE, UK_SOCKET_CUTOUT_SIZE, ROOF_THICKNESS*4, align=(Align.CENTER, Align.CENTER, Align.CENTER), mode=Mode.SUBTRACT)
-
-        with Locations((right_screw_x, 0)):
-             Cylinder(radius=SOCKET_BOSS_DIA/2, height=SOCKET_BOSS_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MAX))
-             with Locations((7.5, 0, -SOCKET_BOSS_DEPTH/2)):
-                 Box(15.0, SOCKET_BOSS_DIA, SOCKET_BOSS_DEPTH)
-             Cylinder(radius=socket_hole_dia/2, height=SOCKET_BOSS_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MAX), mode=Mode.SUBTRACT)
-
-        left_wall_x = -BOX_W/2 + WALL_THICKNESS
-        bridge_len = abs(left_screw_x - left_wall_x) + 2.0
-
-        with Locations((left_screw_x, 0)):
-             Cylinder(radius=SOCKET_BOSS_DIA/2, height=SOCKET_BOSS_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MAX))
-             with Locations((-bridge_len/2, 0, -SOCKET_BOSS_DEPTH/2)):
-                 Box(bridge_len, SOCKET_BOSS_DIA, SOCKET_BOSS_DEPTH)
-             Cylinder(radius=socket_hole_dia/2, height=SOCKET_BOSS_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MAX), mode=Mode.SUBTRACT)
-
-    # Chamfer for heat set insert entry (from bottom of socket bosses - accessible from inside)
-    if USE_INSERTS_SOCKET:
-        socket_boss_bottom_z = socket_boss_z - SOCKET_BOSS_DEPTH
-        with Locations((0, socket_y, socket_boss_bottom_z)):
-            with Locations((right_screw_x, 0), (left_screw_x, 0)):
-                # M3.5 inserts need slightly larger chamfer
-                Cylinder(radius=INSERT_CHAMFER_M35_DIA/2, height=INSERT_CHAMFER_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=Mode.SUBTRACT)
-
-    # C14
-    c14_inner_wall_y = BOX_L/2 - WALL_THICKNESS
-    with Locations((c14_x, c14_inner_wall_y, 0)): 
-        pilaster_h = BOX_H - ROOF_THICKNESS
-        screw_x_offset = C14_SCREW_PITCH/2 
-        with Locations((screw_x_offset, 0, 0), (-screw_x_offset, 0, 0)):
-             Box(12.0, C14_BOSS_DEPTH, pilaster_h, align=(Align.CENTER, Align.MAX, Align.MIN))
-
-    c14_hole_dia = THREAD_M3_INSERT if USE_INSERTS_C14 else THREAD_M3_TAP
-    with Locations((c14_x, BOX_L/2, c14_z)):
-        Box(C14_BODY_W, WALL_THICKNESS*4, C14_BODY_H, mode=Mode.SUBTRACT)
-        with Locations((C14_SCREW_PITCH/2, 0), (-C14_SCREW_PITCH/2, 0)):
-             Cylinder(radius=c14_hole_dia/2, height=30.0, rotation=(90,0,0), mode=Mode.SUBTRACT)
-
-    # Chamfer for heat set insert entry (from outside of C14 wall - accessible from exterior)
-    if USE_INSERTS_C14:
-        with Locations((c14_x, BOX_L/2, c14_z)):
-            with Locations((C14_SCREW_PITCH/2, 0), (-C14_SCREW_PITCH/2, 0)):
-                # Chamfer extends from outer wall surface inward
-                Cylinder(radius=INSERT_CHAMFER_M3_DIA/2, height=INSERT_CHAMFER_DEPTH, rotation=(90,0,0), align=(Align.CENTER, Align.CENTER, Align.MIN), mode=Mode.SUBTRACT)
-
-    # Lid Vents
-    with BuildSketch(Plane.XY.offset(BOX_H)):
-        with Locations((ssr_x, ssr_y)):
-            with GridLocations(6, 0, 6, 1):
-                SlotOverall(40, 3, rotation=90)
-    extrude(amount=-ROOF_THICKNESS, mode=Mode.SUBTRACT)
-
-    # Mouse Hole
-    with Locations((term_x, BOX_L/2, 0)):
-        Cylinder(radius=3.5, height=10.0, rotation=(90, 0, 0), align=(Align.CENTER, Align.CENTER, Align.CENTER), mode=Mode.SUBTRACT)
+                cutters.keep(Cylinder(radius=5.0, height=post_h, align=(Align.CENTER, Align.CENTER, Align.MAX)))
+                cutters.cut(Cylinder(radius=corner_hole_dia/2, height=post_h, align=(Align.CENTER, Align.CENTER, Align.MAX), mode=cutters.mode))
+
+        # Chamfer for heat set insert entry (from bottom of posts)
+        if p.USE_INSERTS_CORNERS:
+            features.mark("Corner Insert Chamfers")
+            with Locations((0, 0, 0)):
+                with Locations(
+                    (p.corner_off_x, p.corner_off_y), (-p.corner_off_x, p.corner_off_y),
+                    (p.corner_off_x, -p.corner_off_y), (-p.corner_off_x, -p.corner_off_y)
+                ):
+                    cutters.cut(Cylinder(radius=p.INSERT_CHAMFER_M3_DIA/2, height=p.INSERT_CHAMFER_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=cutters.mode))
+
+        # PID Cutout
+        features.mark("PID Cutout")
+        with Locations((p.pid_x, -p.BOX_L/2, p.pid_z_center)):
+            cutters.cut(Box(p.PID_BODY_W + p.FIT_TOLERANCE, p.WALL_THICKNESS*4, p.PID_BODY_H + p.FIT_TOLERANCE, mode=cutters.mode))
+
+        # --- FINAL CLAMP LOGIC ---
+        # Width=50, Depth=8
+        features.mark("PID Clamp")
+        clamp_w, clamp_d = 50.0, 8.0
+        # Attached to the inside face of the front wall
+        clamp_y_center = -p.BOX_L/2 + p.WALL_THICKNESS + clamp_d/2
+
+        # 1. THE BRACE (Anvil)
+        # Extends from Top of PID (Z=65) to Roof Inner Surface (Z=97)
+        roof_inner_z = p.BOX_H - p.ROOF_THICKNESS
+        brace_h = roof_inner_z - p.pid_z_end
+        brace_z_center = p.pid_z_end + brace_h/2
+
+        with Locations((p.pid_x, clamp_y_center, brace_z_center)):
+            cutters.keep(Box(clamp_w, clamp_d, brace_h, align=(Align.CENTER, Align.CENTER, Align.CENTER)))
+
+        # 2. THE CLAMP (Hammer)
+        # Extends from Bottom of PID (Z=20) down by 10mm (ends at Z=10)
+        # Does not reach Z=0.
+        clamp_h = 10.0
+        clamp_z_center = p.pid_z_start - clamp_h/2
+        pid_clamp_hole_dia = p.THREAD_M3_INSERT if p.USE_INSERTS_PID_CLAMP else p.THREAD_M3_TAP
+
+        with Locations((p.pid_x, clamp_y_center, clamp_z_center)):
+            # Block
+            cutters.keep(Box(clamp_w, clamp_d, clamp_h, align=(Align.CENTER, Align.CENTER, Align.CENTER)))
+            # Threaded Hole (Vertical through center)
+            cutters.cut(Cylinder(radius=pid_clamp_hole_dia/2, height=clamp_h + 20.0, align=(Align.CENTER, Align.CENTER, Align.CENTER), mode=cutters.mode))
+
+        # Chamfer for heat set insert entry (from bottom of clamp block - accessible end)
+        if p.USE_INSERTS_PID_CLAMP:
+            features.mark("PID Clamp Insert Chamfer")
+            clamp_bottom_z = clamp_z_center - clamp_h/2  # Z=10
+            with Locations((p.pid_x, clamp_y_center, clamp_bottom_z)):
+                cutters.cut(Cylinder(radius=p.INSERT_CHAMFER_M3_DIA/2, height=p.INSERT_CHAMFER_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=cutters.mode))
+
+
+        # Socket Mounts
+        features.mark("Socket Mounts")
+        left_screw_x = p.socket_x - p.UK_SOCKET_MOUNT_PITCH/2
+        right_screw_x = p.socket_x + p.UK_SOCKET_MOUNT_PITCH/2
+        socket_boss_z = p.BOX_H - p.ROOF_THICKNESS
+        socket_hole_dia = p.THREAD_M35_INSERT if p.USE_INSERTS_SOCKET else p.THREAD_M35_TAP
+
+        with Locations((0, p.socket_y, socket_boss_z)):
+            with Locations((p.socket_x, 0)):
+                cutters.cut(Box(p.UK_SOCKET_CUTOUT_SIZE, p.UK_SOCKET_CUTOUT_SIZE, p.ROOF_THICKNESS*4, align=(Align.CENTER, Align.CENTER, Align.CENTER), mode=cutters.mode))
+
+            with Locations((right_screw_x, 0)):
+                 cutters.keep(Cylinder(radius=p.SOCKET_BOSS_DIA/2, height=p.SOCKET_BOSS_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MAX)))
+                 with Locations((7.5, 0, -p.SOCKET_BOSS_DEPTH/2)):
+                     cutters.keep(Box(15.0, p.SOCKET_BOSS_DIA, p.SOCKET_BOSS_DEPTH))
+                 cutters.cut(Cylinder(radius=socket_hole_dia/2, height=p.SOCKET_BOSS_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MAX), mode=cutters.mode))
+
+            left_wall_x = -p.BOX_W/2 + p.WALL_THICKNESS
+            bridge_len = abs(left_screw_x - left_wall_x) + 2.0
+
+            with Locations((left_screw_x, 0)):
+                 cutters.keep(Cylinder(radius=p.SOCKET_BOSS_DIA/2, height=p.SOCKET_BOSS_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MAX)))
+                 with Locations((-bridge_len/2, 0, -p.SOCKET_BOSS_DEPTH/2)):
+                     cutters.keep(Box(bridge_len, p.SOCKET_BOSS_DIA, p.SOCKET_BOSS_DEPTH))
+                 cutters.cut(Cylinder(radius=socket_hole_dia/2, height=p.SOCKET_BOSS_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MAX), mode=cutters.mode))
+
+        # Chamfer for heat set insert entry (from bottom of socket bosses - accessible from inside)
+        if p.USE_INSERTS_SOCKET:
+            features.mark("Socket Insert Chamfers")
+            socket_boss_bottom_z = socket_boss_z - p.SOCKET_BOSS_DEPTH
+            with Locations((0, p.socket_y, socket_boss_bottom_z)):
+                with Locations((right_screw_x, 0), (left_screw_x, 0)):
+                    # M3.5 inserts need slightly larger chamfer
+                    cutters.cut(Cylinder(radius=p.INSERT_CHAMFER_M35_DIA/2, height=p.INSERT_CHAMFER_DEPTH, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=cutters.mode))
+
+        # C14
+        features.mark("C14 Pilasters")
+        c14_inner_wall_y = p.BOX_L/2 - p.WALL_THICKNESS
+        with Locations((p.c14_x, c14_inner_wall_y, 0)):
+            pilaster_h = p.BOX_H - p.ROOF_THICKNESS
+            screw_x_offset = p.C14_SCREW_PITCH/2
+            with Locations((screw_x_offset, 0, 0), (-screw_x_offset, 0, 0)):
+                 cutters.keep(Box(12.0, p.C14_BOSS_DEPTH, pilaster_h, align=(Align.CENTER, Align.MAX, Align.MIN)))
+
+        features.mark("C14 Cutout")
+        c14_hole_dia = p.THREAD_M3_INSERT if p.USE_INSERTS_C14 else p.THREAD_M3_TAP
+        with Locations((p.c14_x, p.BOX_L/2, p.c14_z)):
+            cutters.cut(Box(p.C14_BODY_W, p.WALL_THICKNESS*4, p.C14_BODY_H, mode=cutters.mode))
+            with Locations((p.C14_SCREW_PITCH/2, 0), (-p.C14_SCREW_PITCH/2, 0)):
+                 cutters.cut(Cylinder(radius=c14_hole_dia/2, height=30.0, rotation=(90,0,0), mode=cutters.mode))
+
+        # Chamfer for heat set insert entry (from outside of C14 wall - accessible from exterior)
+        if p.USE_INSERTS_C14:
+            features.mark("C14 Insert Chamfers")
+            with Locations((p.c14_x, p.BOX_L/2, p.c14_z)):
+                with Locations((p.C14_SCREW_PITCH/2, 0), (-p.C14_SCREW_PITCH/2, 0)):
+                    # Chamfer extends from outer wall surface inward
+                    cutters.cut(Cylinder(radius=p.INSERT_CHAMFER_M3_DIA/2, height=p.INSERT_CHAMFER_DEPTH, rotation=(90,0,0), align=(Align.CENTER, Align.CENTER, Align.MIN), mode=cutters.mode))
+
+        # Lid Vents
+        features.mark("Lid Vents")
+        with BuildSketch(Plane.XY.offset(p.BOX_H)):
+            with Locations((p.ssr_x, p.ssr_y)):
+                with GridLocations(6, 0, 6, 1):
+                    SlotOverall(40, 3, rotation=90)
+        cutters.cut(extrude(amount=-p.ROOF_THICKNESS, mode=cutters.mode))
+
+        # Mouse Hole
+        features.mark("Mouse Hole")
+        with Locations((p.term_x, p.BOX_L/2, 0)):
+            cutters.cut(Cylinder(radius=3.5, height=10.0, rotation=(90, 0, 0), align=(Align.CENTER, Align.CENTER, Align.CENTER), mode=cutters.mode))
+
+        features.mark("Batched Cut")
+        part = cutters.apply(shell.part)
+        features.end(part)
+    return part
 
 
 # ==============================================================================
 # 6. M3 WASHER
 # ==============================================================================
-# Small ABS washer: 9mm OD, M3 clearance hole, 1.5mm thick
-WASHER_OD = 9.0
-WASHER_ID = 3.4  # M3 clearance hole
-WASHER_THICKNESS = 1.5
-
-with BuildPart() as washer:
-    Cylinder(radius=WASHER_OD/2, height=WASHER_THICKNESS, align=(Align.CENTER, Align.CENTER, Align.MIN))
-    Cylinder(radius=WASHER_ID/2, height=WASHER_THICKNESS + 1.0, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=Mode.SUBTRACT)
+def build_washer(p=DEFAULT_PARAMS):
+    with BuildPart() as washer:
+        features = profiler.timeline("washer", washer)
+        features.mark("Washer")
+        Cylinder(radius=p.WASHER_OD/2, height=p.WASHER_THICKNESS, align=(Align.CENTER, Align.CENTER, Align.MIN))
+        Cylinder(radius=p.WASHER_ID/2, height=p.WASHER_THICKNESS + 1.0, align=(Align.CENTER, Align.CENTER, Align.MIN), mode=Mode.SUBTRACT)
+        features.end()
+    return washer.part
+
+
+BUILDERS = {
+    "base": build_base,
+    "shell": build_shell,
+    "washer": build_washer,
+}
+
+# Code outside each builder that shapes its part. Its source is hashed with
+# the builder's (depgraph.builder_source), so editing a hard-coded value in
+# a helper invalidates the part cache and the up-to-date check too.
+build_base.sources = (base_prisms, prism)
+build_shell.sources = (CutterBatch,)
+
+
+# The CaseParams fields each builder reads (directly or through the derived
+# BOX_*/position properties). These key the part cache, so a part is only
+# rebuilt when one of its own inputs changes - keep them in sync with the
+# builders above.
+_BOX_PARAMS = ("WALL_THICKNESS", "FILLET_R", "SIDE_MARGIN", "PID_BEZEL_W", "SSR_W", "INTERNAL_L")
+_M3_HOLE_PARAMS = ("THREAD_M3_INSERT", "THREAD_M3_TAP", "INSERT_CHAMFER_M3_DIA", "INSERT_CHAMFER_DEPTH")
+
+PART_PARAMS = {
+    "base": (
+        "USE_INSERTS_SSR", "USE_INSERTS_TERMINAL",
+        *_BOX_PARAMS, *_M3_HOLE_PARAMS,
+        "BASE_THICKNESS", "FOOT_DIA", "FOOT_DEPTH", "FOOT_OFFSET",
+        "SCREW_M3_CLEARANCE", "M3_HEAD_DIA", "M3_HEAD_H",
+        "PID_BODY_W", "SSR_L", "SSR_MOUNT_SPACING", "SSR_PLATFORM_HEIGHT",
+        "TERM_W", "TERM_D", "TERM_MOUNT_X", "TERM_MOUNT_Y", "TERM_BOSS_HEIGHT",
+        "ssr_front_gap", "term_rear_gap",
+    ),
+    "shell": (
+        "USE_INSERTS_CORNERS", "USE_INSERTS_SOCKET", "USE_INSERTS_C14", "USE_INSERTS_PID_CLAMP",
+        *_BOX_PARAMS, *_M3_HOLE_PARAMS,
+        "ROOF_THICKNESS", "INTERNAL_H", "FIT_TOLERANCE",
+        "THREAD_M35_INSERT", "THREAD_M35_TAP", "INSERT_CHAMFER_M35_DIA",
+        "PID_BODY_W", "PID_BODY_H", "SSR_L",
+        "UK_SOCKET_CUTOUT_SIZE", "UK_SOCKET_MOUNT_PITCH", "SOCKET_BOSS_DIA", "SOCKET_BOSS_DEPTH",
+        "C14_BODY_W", "C14_BODY_H", "C14_SCREW_PITCH", "C14_BOSS_DEPTH",
+        "pid_z_start", "ssr_front_gap", "socket_y", "c14_z",
+    ),
+    "washer": ("WASHER_OD", "WASHER_ID", "WASHER_THICKNESS"),
+}
+
+
+def build_parts(p=DEFAULT_PARAMS, names=tuple(BUILDERS), cache=None):
+    """Build the requested parts, returning {name: Part}.
+
+    With a part_cache.PartCache, parts whose PART_PARAMS are unchanged are
+    loaded from disk instead of being rebuilt.
+    """
+    if cache is None:
+        return {name: BUILDERS[name](p) for name in names}
+    return {name: cache.get_or_build(name, BUILDERS[name], p, PART_PARAMS[name]) for name in names}
+
+
+@dataclass(frozen=True)
+class Hole:
+    """One threaded (insert or tapped) fastener hole, in its part's own frame."""
+    name: str
+    part: str
+    switch: str       # the USE_INSERTS_* field that sizes it
+    center: tuple     # a point on the axis, inside the threaded length
+    axis: tuple       # unit direction of the hole axis
+    dia: float
+    insert: bool
+    thread: str       # "M3" or "M3.5"
+
+
+def threaded_holes(p=DEFAULT_PARAMS):
+    """The 15 threaded holes of the base and shell (see print_summary)."""
+    def hole(name, part, switch, center, axis, thread, insert_dia, tap_dia):
+        insert = getattr(p, switch)
+        return Hole(name, part, switch, center, axis, insert_dia if insert else tap_dia, insert, thread)
+
+    m3 = ("M3", p.THREAD_M3_INSERT, p.THREAD_M3_TAP)
+    m35 = ("M3.5", p.THREAD_M35_INSERT, p.THREAD_M35_TAP)
+    z_up, y_axis = (0, 0, 1), (0, 1, 0)
+    roof_inner_z = p.BOX_H - p.ROOF_THICKNESS
+    clamp_y = -p.BOX_L/2 + p.WALL_THICKNESS + 4.0   # clamp_y_center in build_shell
+
+    holes = []
+    for i, dy in enumerate((p.SSR_MOUNT_SPACING/2, -p.SSR_MOUNT_SPACING/2)):
+        holes.append(hole(f"ssr_{i + 1}", "base", "USE_INSERTS_SSR",
+                          (p.ssr_x, p.ssr_y + dy, p.BASE_THICKNESS + p.SSR_PLATFORM_HEIGHT/2), z_up, *m3))
+    for i, (dx, dy) in enumerate((dx, dy) for dx in (-1, 1) for dy in (-1, 1)):
+        holes.append(hole(f"terminal_{i + 1}", "base", "USE_INSERTS_TERMINAL",
+                          (p.term_x + dx*p.TERM_MOUNT_X/2, p.term_y + dy*p.TERM_MOUNT_Y/2, p.BASE_THICKNESS + p.TERM_BOSS_HEIGHT/2), z_up, *m3))
+    for i, (sx, sy) in enumerate(((1, 1), (-1, 1), (1, -1), (-1, -1))):
+        holes.append(hole(f"corner_{i + 1}", "shell", "USE_INSERTS_CORNERS",
+                          (sx*p.corner_off_x, sy*p.corner_off_y, roof_inner_z/2), z_up, *m3))
+    for i, dx in enumerate((p.UK_SOCKET_MOUNT_PITCH/2, -p.UK_SOCKET_MOUNT_PITCH/2)):
+        holes.append(hole(f"socket_{i + 1}", "shell", "USE_INSERTS_SOCKET",
+                          (p.socket_x + dx, p.socket_y, roof_inner_z - p.SOCKET_BOSS_DEPTH/2), z_up, *m35))
+    for i, dx in enumerate((p.C14_SCREW_PITCH/2, -p.C14_SCREW_PITCH/2)):
+        holes.append(hole(f"c14_{i + 1}", "shell", "USE_INSERTS_C14",
+                          (p.c14_x + dx, p.BOX_L/2 - p.WALL_THICKNESS - p.C14_BOSS_DEPTH/2, p.c14_z), y_axis, *m3))
+    holes.append(hole("pid_clamp", "shell", "USE_INSERTS_PID_CLAMP",
+                      (p.pid_x, clamp_y, p.pid_z_start - 5.0), z_up, *m3))
+    return holes
 
 
 # ==============================================================================
 # 7. EXPORT
 # ==============================================================================
-print(f"Shell Dimensions: {BOX_W:.1f} x {BOX_L:.1f} x {BOX_H:.1f} mm")
-print(f"Washer: {WASHER_OD}mm OD × {WASHER_ID}mm ID × {WASHER_THICKNESS}mm thick (for M3 bolts)")
-print("Fastener Configuration:")
-print(f"  SSR (2x):        {'INSERTS' if USE_INSERTS_SSR else 'SCREWS'}")
-print(f"  Terminal (4x):   {'INSERTS' if USE_INSERTS_TERMINAL else 'SCREWS'}")
-print(f"  Corners (4x):    {'INSERTS' if USE_INSERTS_CORNERS else 'SCREWS'}")
-print(f"  Socket (2x):     {'INSERTS' if USE_INSERTS_SOCKET else 'SCREWS'}")
-print(f"  C14 (2x):        {'INSERTS' if USE_INSERTS_C14 else 'SCREWS'}")
-print(f"  PID Clamp (1x):  {'INSERTS' if USE_INSERTS_PID_CLAMP else 'SCREWS'}")
-
-# Summary
-insert_count = sum([USE_INSERTS_SSR*2, USE_INSERTS_TERMINAL*4, USE_INSERTS_CORNERS*4, USE_INSERTS_SOCKET*2, USE_INSERTS_C14*2, USE_INSERTS_PID_CLAMP*1])
-total_holes = 15
-if insert_count == 0:
-    print("Mode: ALL DIRECT SCREW TAPPING")
-elif insert_count == total_holes:
-    print("Mode: ALL HEAT SET INSERTS")
-else:
-    print(f"Mode: HYBRID ({insert_count}/{total_holes} locations use inserts)")
-
-# Export STLs (For 3D Printing / Slicers)
-export_stl(base.part, "pid_inv_base.stl")
-export_stl(shell.part, "pid_inv_shell.stl")
-export_stl(washer.part, "pid_m3_washer.stl")
-print("✅ STL files generated (for 3D Printing).")
-
-# Export STEPs (For Fusion 360 / SolidWorks / CAD)
-export_step(base.part, "pid_inv_base.step")
-export_step(shell.part, "pid_inv_shell.step")
-export_step(washer.part, "pid_m3_washer.step")
-print("✅ STEP files generated (for Fusion 360).")
+FILENAMES = {
+    "base": "pid_inv_base",
+    "shell": "pid_inv_shell",
+    "washer": "pid_m3_washer",
+}
+
+
+def output_paths(name, out_dir=".", formats=("stl", "step")):
+    return [os.path.join(out_dir, f"{FILENAMES[name]}.{fmt}") for fmt in formats]
+
+
+def export_stl(part, path):
+    """Write `part` as a binary STL from its export mesh (see meshes.py)."""
+    meshes.write_stl(meshes.export_mesh(part), path)
+
+
+def export_3mf(part, path):
+    """Write `part` as a 3MF from the same mesh as export_stl."""
+    meshes.write_3mf(meshes.export_mesh(part), path, os.path.splitext(os.path.basename(path))[0])
+
+
+# Mesh writers share one tessellation per part, also in the export pipeline's workers
+export_stl.uses_mesh = export_3mf.uses_mesh = True
+
+
+WRITERS = {"stl": export_stl, "step": export_step, "3mf": export_3mf}
+MESH_FORMATS = {"stl", "3mf"}
+
+
+def export(parts, out_dir=".", formats=("stl", "step"), pipeline=None):
+    """Write each part in `parts` ({name: Part}) to out_dir, returning the paths.
+
+    With an ExportPipeline the files are only queued; they exist once
+    pipeline.wait() returns.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for name, part in parts.items():
+        artifacts = [(path, WRITERS[fmt]) for fmt, path in zip(formats, output_paths(name, out_dir, formats))]
+        if pipeline is not None:
+            pipeline.submit(part, artifacts)
+        else:
+            for path, writer in artifacts:
+                writer(part, path)
+        paths += [path for path, _ in artifacts]
+    return paths
+
+
+def export_settings(formats):
+    """Settings besides the part's inputs that change the files written in `formats`."""
+    return {"mesh_quality": meshes.quality()} if set(formats) & MESH_FORMATS else {}
+
+
+def update_outputs(p=DEFAULT_PARAMS, out_dir=".", names=tuple(BUILDERS), formats=("stl", "step"), cache=None, pipeline=None):
+    """Rebuild and re-export only the parts whose inputs changed since the last run.
+
+    The inputs each part consumed (see depgraph.py) are stored in out_dir, so a
+    one-parameter edit rebuilds just the parts that read that parameter. With
+    a pipeline each part's export starts as soon as it is built.
+    Returns {name: Part} for the parts that were rebuilt.
+    """
+    graph = DependencyGraph.load(out_dir)
+    settings = export_settings(formats)
+    rebuilt = {}
+    for name in names:
+        builder = BUILDERS[name]
+        outputs = output_paths(name, out_dir, formats)
+        reason = graph.stale_reason(name, builder, p, outputs, settings)
+        if reason is None:
+            print(f"✔  {name}: up to date")
+            continue
+
+        key = part_key(name, builder, p, PART_PARAMS[name])
+        part = cache.get(key) if cache is not None else None
+        if part is None:
+            part, recorder = trace_build(builder, p)
+            unlisted = recorder.fields() - set(PART_PARAMS[name])
+            if unlisted:
+                print(f"⚠️  {name} reads {', '.join(sorted(unlisted))} - add to PART_PARAMS or the cache goes stale")
+            if cache is not None:
+                cache.put(key, part)
+            inputs, derived = recorder.inputs, recorder.derived
+        else:
+            # Cache hit: no trace available, fall back to the declared inputs
+            inputs, derived = {key: getattr(p, key) for key in PART_PARAMS[name]}, {}
+
+        export({name: part}, out_dir, formats, pipeline)
+        graph.record(name, builder, inputs, derived, outputs, settings)
+        print(f"🔨 {name}: rebuilt ({reason})")
+        rebuilt[name] = part
+    if pipeline is not None:
+        pipeline.wait()  # only record outputs that were actually written
+    graph.save()
+    return rebuilt
+
+
+def print_summary(p=DEFAULT_PARAMS):
+    print(f"Shell Dimensions: {p.BOX_W:.1f} x {p.BOX_L:.1f} x {p.BOX_H:.1f} mm")
+    print(f"Washer: {p.WASHER_OD}mm OD × {p.WASHER_ID}mm ID × {p.WASHER_THICKNESS}mm thick (for M3 bolts)")
+    print("Fastener Configuration:")
+    print(f"  SSR (2x):        {'INSERTS' if p.USE_INSERTS_SSR else 'SCREWS'}")
+    print(f"  Terminal (4x):   {'INSERTS' if p.USE_INSERTS_TERMINAL else 'SCREWS'}")
+    print(f"  Corners (4x):    {'INSERTS' if p.USE_INSERTS_CORNERS else 'SCREWS'}")
+    print(f"  Socket (2x):     {'INSERTS' if p.USE_INSERTS_SOCKET else 'SCREWS'}")
+    print(f"  C14 (2x):        {'INSERTS' if p.USE_INSERTS_C14 else 'SCREWS'}")
+    print(f"  PID Clamp (1x):  {'INSERTS' if p.USE_INSERTS_PID_CLAMP else 'SCREWS'}")
+
+    # Summary
+    insert_count = sum([p.USE_INSERTS_SSR*2, p.USE_INSERTS_TERMINAL*4, p.USE_INSERTS_CORNERS*4, p.USE_INSERTS_SOCKET*2, p.USE_INSERTS_C14*2, p.USE_INSERTS_PID_CLAMP*1])
+    total_holes = 15
+    if insert_count == 0:
+        print("Mode: ALL DIRECT SCREW TAPPING")
+    elif insert_count == total_holes:
+        print("Mode: ALL HEAT SET INSERTS")
+    else:
+        print(f"Mode: HYBRID ({insert_count}/{total_holes} locations use inserts)")
+
 
 # ==============================================================================
-# 7. VISUALIZATION
+# 8. VISUALIZATION
 # ==============================================================================
-# View in OCP CAD Viewer (optional - skips gracefully if viewer not running)
-shell_viz = shell.part.move(Location((0,0, 60)))
-base_viz = base.part
-washer_viz = washer.part.move(Location((BOX_W/2 + 20, 0, 0)))  # Position washer to the side
-
-# Ghosts
-pid_ghost = Location((pid_x, pid_y, pid_z_center)) * Box(PID_BODY_W, PID_BODY_D, PID_BODY_H)
-ssr_ghost = Location((ssr_x, ssr_y, ssr_z + SSR_H/2)) * Box(SSR_W, SSR_L, SSR_H)
-term_ghost = Location((term_x, term_y, BASE_THICKNESS + TERM_BOSS_HEIGHT + TERM_H/2)) * Box(TERM_W, TERM_D, TERM_H)
-c14_ghost_y = (BOX_L/2) - (C14_GHOST_DEPTH / 2)
-c14_ghost = Location((c14_x, c14_ghost_y, c14_z)) * Box(C14_BODY_W, C14_GHOST_DEPTH, C14_BODY_H)
-
-try:
-    show_object(base_viz, name="Base Plate", options={"alpha": 1.0, "color": (0.3, 0.3, 0.3)})
-    show_object(shell_viz, name="Shell (Raised)", options={"alpha": 0.6, "color": (0.9, 0.9, 0.9)})
-    show_object(washer_viz, name="M3 Washer (9mm OD)", options={"alpha": 1.0, "color": (0.8, 0.4, 0.0)})
-    show_object(pid_ghost, name="PID Ghost", options={"alpha": 0.3, "color": (1, 0, 0)})
-    show_object(ssr_ghost, name="SSR Ghost", options={"alpha": 0.3, "color": (0, 1, 0)})
-    show_object(term_ghost, name="Terminal Ghost", options={"alpha": 0.3, "color": (0, 0, 1)})
-    show_object(c14_ghost, name="C14 Ghost (+Cables)", options={"alpha": 0.4, "color": (1.0, 1.0, 0.0)})
-    print("✅ 3D visualization sent to OCP Viewer.")
-except Exception as e:
-    print("ℹ️  3D viewer not available (this is normal when running from command line).")
-    print("   STL/STEP files generated successfully - import them into your CAD software or slicer.")
\ No newline at end of file
+# The viewer is opt-in: pass --view or set CASE3B_VIEW=1. Headless runs (CI,
+# batch.py) never import ocp_vscode or build the ghost solids.
+VIEW_ENV = "CASE3B_VIEW"
+
+
+def view_requested(flag=False):
+    return flag or os.environ.get(VIEW_ENV, "").lower() not in ("", "0", "false", "no")
+
+
+# Which part's frame each ghost is positioned in: the PID and C14 are mounted
+# in the shell, the SSR and terminal block on the base.
+GHOST_FRAMES = {"pid": "shell", "ssr": "base", "terminal": "base", "c14": "shell"}
+
+
+def ghosts(p=DEFAULT_PARAMS):
+    """{name: Part} stand-ins for the components, each in its GHOST_FRAMES frame."""
+    c14_ghost_y = (p.BOX_L/2) - (p.C14_GHOST_DEPTH / 2)
+    return {
+        "pid": Location((p.pid_x, p.pid_y, p.pid_z_center)) * Box(p.PID_BODY_W, p.PID_BODY_D, p.PID_BODY_H),
+        "ssr": Location((p.ssr_x, p.ssr_y, p.ssr_z + p.SSR_H/2)) * Box(p.SSR_W, p.SSR_L, p.SSR_H),
+        "terminal": Location((p.term_x, p.term_y, p.BASE_THICKNESS + p.TERM_BOSS_HEIGHT + p.TERM_H/2)) * Box(p.TERM_W, p.TERM_D, p.TERM_H),
+        "c14": Location((p.c14_x, c14_ghost_y, p.c14_z)) * Box(p.C14_BODY_W, p.C14_GHOST_DEPTH, p.C14_BODY_H),
+    }
+
+
+# How the viewer draws each part and ghost: (label, RGB, alpha). The GLB
+# previews (preview_glb.py) use the same colours.
+VIEW_STYLES = {
+    "base": ("Base Plate", (0.3, 0.3, 0.3), 1.0),
+    "shell": ("Shell (Raised)", (0.9, 0.9, 0.9), 0.6),
+    "washer": ("M3 Washer (9mm OD)", (0.8, 0.4, 0.0), 1.0),
+    "pid": ("PID Ghost", (1.0, 0.0, 0.0), 0.3),
+    "ssr": ("SSR Ghost", (0.0, 1.0, 0.0), 0.3),
+    "terminal": ("Terminal Ghost", (0.0, 0.0, 1.0), 0.3),
+    "c14": ("C14 Ghost (+Cables)", (1.0, 1.0, 0.0), 0.4),
+}
+
+
+def show_parts(parts, p=DEFAULT_PARAMS):
+    """View in OCP CAD Viewer (optional - skips gracefully if viewer not running)."""
+    try:
+        from ocp_vscode import show_object
+    except ImportError:
+        print("ℹ️  ocp_vscode is not installed - skipping the 3D view (pip install ocp_vscode).")
+        return
+
+    # Only the parts that were built (see --parts); the ghosts are always shown
+    shown = {
+        "base": parts.get("base"),
+        "shell": parts["shell"].moved(Location((0,0, 60))) if "shell" in parts else None,
+        "washer": parts["washer"].moved(Location((p.BOX_W/2 + 20, 0, 0))) if "washer" in parts else None,  # Position washer to the side
+        **ghosts(p),
+    }
+    # The viewer meshes what it is sent, keeping a triangulation already on the
+    # shape if it is fine enough (moved copies share it). This is free when the
+    # exports meshed the parts, but it is a cache hit that does not undo a
+    # coarser draft mesh made since (e.g. the GLB preview): the viewer then
+    # meshes again
+    for part in parts.values():
+        meshes.export_mesh(part)
+
+    try:
+        for name, shape in shown.items():
+            if shape is not None:
+                label, color, alpha = VIEW_STYLES[name]
+                show_object(shape, name=label, options={"alpha": alpha, "color": color})
+        print("✅ 3D visualization sent to OCP Viewer.")
+    except Exception as e:
+        print("ℹ️  3D viewer not available (this is normal when running from command line).")
+        print("   STL/STEP files generated successfully - import them into your CAD software or slicer.")
+
+
+def _choices(allowed):
+    """argparse type for a comma-separated subset of `allowed`, e.g. 'shell,base'."""
+    def parse(text):
+        names = list(dict.fromkeys(name.strip().lower() for name in text.split(",") if name.strip()))
+        unknown = [name for name in names if name not in allowed]
+        if unknown or not names:
+            raise argparse.ArgumentTypeError(f"choose from {','.join(allowed)} (got {text!r})")
+        return names
+    return parse
+
+
+def main(argv=None, p=DEFAULT_PARAMS):
+    parser = argparse.ArgumentParser(description="Build and export the PID enclosure parts.")
+    parser.add_argument("--out", default=".", help="output directory (default: current directory)")
+    parser.add_argument("--parts", type=_choices(list(BUILDERS)), default=list(BUILDERS), help="comma-separated parts to build (default: %(default)s); other parts are not built at all")
+    parser.add_argument("--formats", type=_choices(list(WRITERS)), default=["stl", "step"], help="comma-separated output formats: stl, step, 3mf (default: stl,step)")
+    parser.add_argument("--quality", choices=list(meshes.QUALITY), default=meshes.quality(), help=f"STL/3MF mesh quality: chord error {meshes.QUALITY['production']} or {meshes.QUALITY['draft']} mm (default: %(default)s, or set {meshes.QUALITY_ENV})")
+    parser.add_argument("--no-cache", action="store_true", help="rebuild and export every part, ignoring the part cache and the incremental build state")
+    parser.add_argument("--export-jobs", type=int, default=None, help="export worker processes (default: one per core, 0: export in-process)")
+    parser.add_argument("--profile", metavar="TRACE.json", default=os.environ.get(profiler.ENV), help=f"time every feature of the requested parts and write a Chrome trace (or set {profiler.ENV}); implies --no-cache")
+    parser.add_argument("--ignore-layout", action="store_true", help="build even if the parameters break a layout rule (see layout.py)")
+    parser.add_argument("--view", action="store_true", help=f"send the parts and ghosts to OCP CAD Viewer (or set {VIEW_ENV}=1)")
+    args = parser.parse_args(argv)
+    out_dir, names, formats = args.out, args.parts, args.formats
+    view = view_requested(args.view)
+    os.environ[meshes.QUALITY_ENV] = args.quality   # also read by the export workers
+    if args.profile:
+        profiler.enable()
+
+    print_summary(p)
+    # Reject impossible layouts in milliseconds, before the seconds-long build
+    broken = layout.violations(p)
+    for name, margin, desc in broken:
+        print(f"❌ Layout: {desc} ({name}: {margin:+.1f} mm)")
+    if broken and not args.ignore_layout:
+        print("   Fix the parameters or pass --ignore-layout to build anyway.")
+        return 1
+
+    with ExportPipeline(args.export_jobs) as pipeline:
+        if args.no_cache or args.profile:
+            # Escape hatch: rebuild and export everything from scratch. The
+            # files are still recorded, so the next incremental run compares
+            # against what is actually on disk.
+            graph = DependencyGraph.load(out_dir)
+            settings = export_settings(formats)
+            parts = {}
+            for name in names:
+                parts[name], recorder = trace_build(BUILDERS[name], p)
+                paths = export({name: parts[name]}, out_dir, formats, pipeline)
+                graph.record(name, BUILDERS[name], recorder.inputs, recorder.derived, paths, settings)
+            pipeline.wait()
+            graph.save()
+        else:
+            cache = PartCache()
+            parts = update_outputs(p, out_dir, names, formats, cache=cache, pipeline=pipeline)
+            if view:
+                # The viewer needs every requested part, not just the ones that were rebuilt
+                parts.update(build_parts(p, [n for n in names if n not in parts], cache=cache))
+    pipeline.report()
+    if args.profile:
+        trace = profiler.disable()
+        trace.save(args.profile)
+        print(f"⏱  Slowest features (trace: {os.path.abspath(args.profile)}):")
+        for part_name, feature, ms, booleans in trace.summary()[:8]:
+            print(f"  {part_name:<7} {feature:<26} {ms:8.1f} ms  {booleans:3d} boolean(s)")
+
+    # STLs (For 3D Printing / Slicers), STEPs (For Fusion 360 / SolidWorks / CAD), 3MF
+    print(f"✅ {' + '.join(fmt.upper() for fmt in formats)} files for {', '.join(names)} up to date in {os.path.abspath(out_dir)}")
+
+    if view:
+        show_parts(parts, p)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
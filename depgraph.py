@@ -0,0 +1,155 @@
+"""Parameter -> part dependency graph for incremental rebuilds.
+
+Every build runs against a ParamRecorder, which records each CaseParams value
+the builder reads - plain fields and derived values such as corner_off_x,
+ssr_y or pid_z_end - together with the fields each derived value is computed
+from. The recorded inputs are saved next to the exported files; on the next
+run a part whose inputs, builder source and output files are all unchanged is
+skipped entirely (no build, no export).
+
+    python depgraph.py [OUT_DIR]                 # inputs consumed by each part
+    python depgraph.py OUT_DIR corner_off_x ...  # parts that consume a value
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+
+STATE_FILE = ".case3b_deps.json"
+
+
+class ParamRecorder:
+    """Stand-in for a CaseParams object that records every value read."""
+
+    def __init__(self, params):
+        self._params = params
+        self.inputs = {}     # values read directly by the builder
+        self.derived = {}    # derived value -> names it was computed from
+        self._stack = []
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(type(self._params), name, None)
+        if self._stack:
+            self.derived[self._stack[-1]].add(name)
+        if isinstance(attr, property):
+            # Evaluate the property against the recorder so its own inputs
+            # are recorded as edges of the graph too.
+            self.derived.setdefault(name, set())
+            self._stack.append(name)
+            try:
+                value = attr.fget(self)
+            finally:
+                self._stack.pop()
+        else:
+            value = getattr(self._params, name)
+        if not self._stack:
+            self.inputs[name] = value
+        return value
+
+    def fields(self):
+        """All plain CaseParams fields the build depended on, directly or not."""
+        names = set(self.inputs)
+        for sources in self.derived.values():
+            names |= sources
+        return names - set(self.derived)
+
+
+def trace_build(builder, params):
+    """Run `builder` against a recorder; return (part, recorder)."""
+    recorder = ParamRecorder(params)
+    return builder(recorder), recorder
+
+
+def builder_source(builder):
+    """Source of `builder` plus the helpers and modules listed in its `sources` attribute."""
+    return "\n".join(inspect.getsource(obj) for obj in (builder, *getattr(builder, "sources", ())))
+
+
+def _source_hash(builder):
+    return hashlib.sha256(builder_source(builder).encode("utf-8")).hexdigest()[:16]
+
+
+class DependencyGraph:
+    """Per-part record of the inputs consumed by the last build in OUT_DIR."""
+
+    def __init__(self, path, parts=None):
+        self.path = path
+        self.parts = parts or {}
+
+    @classmethod
+    def load(cls, out_dir):
+        path = os.path.join(out_dir, STATE_FILE)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(path, json.load(f).get("parts", {}))
+        except (FileNotFoundError, ValueError):
+            return cls(path)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"parts": self.parts}, f, indent=2, sort_keys=True)
+
+    def record(self, name, builder, inputs, derived, outputs, settings=None):
+        self.parts[name] = {
+            "builder": _source_hash(builder),
+            "inputs": inputs,
+            "derived": {key: sorted(sources) for key, sources in derived.items()},
+            "outputs": sorted(outputs),
+            "settings": settings or {},
+        }
+
+    def stale_reason(self, name, builder, params, outputs, settings=None):
+        """Why `name` must be rebuilt, or None if its last build is still valid."""
+        entry = self.parts.get(name)
+        if entry is None:
+            return "never built"
+        if entry["builder"] != _source_hash(builder):
+            return "builder changed"
+        missing = [path for path in outputs if not os.path.exists(path)]
+        if missing or set(outputs) - set(entry["outputs"]):
+            return "outputs missing"
+        if entry.get("settings", {}) != (settings or {}):
+            return "export settings changed"
+        changed = [key for key, value in entry["inputs"].items() if getattr(params, key) != value]
+        if changed:
+            return "changed: " + ", ".join(sorted(changed))
+        return None
+
+    def dependents(self, key):
+        """Parts that consume `key`, directly or through a derived value."""
+        result = []
+        for name, entry in self.parts.items():
+            uses = set(entry["inputs"])
+            for sources in entry["derived"].values():
+                uses |= set(sources)
+            if key in uses:
+                result.append(name)
+        return sorted(result)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    graph = DependencyGraph.load(argv[0] if argv else ".")
+    if not graph.parts:
+        print(f"No build state in {graph.path} - run case3b.py first.")
+        return 1
+    if len(argv) > 1:
+        for key in argv[1:]:
+            print(f"{key}: {', '.join(graph.dependents(key)) or '(unused)'}")
+        return 0
+    for name, entry in sorted(graph.parts.items()):
+        derived = sorted(key for key in entry["inputs"] if key in entry["derived"])
+        plain = sorted(key for key in entry["inputs"] if key not in entry["derived"])
+        print(f"{name}: {len(entry['inputs'])} inputs")
+        print(f"  derived: {', '.join(derived) or '-'}")
+        print(f"  fields:  {', '.join(plain) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+"""Concurrent export stage: tessellate and write parts on a process pool.
+
+STL tessellation and STEP writing run inside OCC with the GIL held, so threads
+don't help; each artifact is written by a worker process instead. A part is
+handed over as soon as its build finishes, so the exports of one part overlap
+the build of the next. Parts travel to the workers as BRep bytes (a build123d
+Part doesn't pickle). Writers marked uses_mesh (the STL and 3MF writers)
+share one worker per part, so the part is tessellated once for all of them
+(see meshes.py).
+
+    with ExportPipeline() as pipeline:
+        for name, builder in BUILDERS.items():
+            pipeline.submit(builder(p), [("out/part.stl", export_stl)])
+    pipeline.report()
+"""
+
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from build123d import Compound, export_brep
+from OCP.BRep import BRep_Builder
+from OCP.BRepTools import BRepTools
+from OCP.TopoDS import TopoDS_Shape
+
+
+def to_brep(part):
+    buf = io.BytesIO()
+    export_brep(part, buf)
+    return buf.getvalue()
+
+
+def from_brep(data):
+    shape = TopoDS_Shape()
+    BRepTools.Read_s(shape, io.BytesIO(data), BRep_Builder())
+    if shape.IsNull():
+        raise ValueError("Could not decode BRep data")
+    return Compound.cast(shape)
+
+
+def _write(data, artifacts):
+    """Worker: decode one part and write its artifacts; return [(decode, write, finished)]."""
+    start = time.perf_counter()
+    part = from_brep(data)
+    decode = time.perf_counter() - start
+    timings = []
+    for path, writer in artifacts:
+        start = time.perf_counter()
+        writer(part, path)
+        timings.append((decode, time.perf_counter() - start, time.time()))
+        decode = 0.0
+    return timings
+
+
+class ExportPipeline:
+    """Process pool that writes artifacts while the caller keeps building.
+
+    jobs=0 writes each artifact in-process as it is submitted, for callers
+    that are themselves pool workers (batch.py).
+    """
+
+    def __init__(self, jobs=None):
+        self.jobs = (os.cpu_count() or 1) if jobs is None else jobs
+        self.timings = []   # [{"path", "decode", "write", "done"}] in completion order
+        self._pending = []  # [([path, ...], future)]
+        self._pool = None
+        self._start = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, part, artifacts):
+        """Queue `part` for writing; artifacts is [(path, writer), ...]."""
+        if self._start is None:
+            self._start = time.time()
+        if self.jobs == 0:
+            for path, writer in artifacts:
+                start = time.perf_counter()
+                writer(part, path)
+                self._record(path, 0.0, time.perf_counter() - start, time.time())
+            return
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.jobs)
+        data = to_brep(part)
+        shared = [a for a in artifacts if getattr(a[1], "uses_mesh", False)]
+        groups = ([shared] if shared else []) + [[a] for a in artifacts if a not in shared]
+        for group in groups:
+            self._pending.append(([path for path, _ in group], self._pool.submit(_write, data, group)))
+
+    def wait(self):
+        """Block until every queued artifact is written; re-raise the first failure."""
+        pending, self._pending = self._pending, []
+        for paths, future in pending:
+            for path, timing in zip(paths, future.result()):
+                self._record(path, *timing)
+        return self.timings
+
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _record(self, path, decode, write, finished):
+        self.timings.append({
+            "path": path,
+            "decode": decode,
+            "write": write,
+            "done": finished - self._start,   # wall clock, so it is comparable across workers
+        })
+
+    def report(self):
+        if not self.timings:
+            return
+        wall = max(t["done"] for t in self.timings)
+        busy = sum(t["decode"] + t["write"] for t in self.timings)
+        print(f"Export: {len(self.timings)} file(s), {busy:.2f}s of writing in {wall:.2f}s "
+              f"({self.jobs or 'no'} worker{'s' if self.jobs != 1 else ''})")
+        for t in sorted(self.timings, key=lambda t: t["done"]):
+            print(f"  {os.path.basename(t['path']):<22} {t['write']:6.2f}s"
+                  f"  (decode {t['decode']:.2f}s, done at +{t['done']:.2f}s)")
@@ -0,0 +1,177 @@
+"""Interference and clearance check between the component ghosts and the case.
+
+The base and the shell are assembled (shell sitting on the base at
+Z=BASE_THICKNESS). A bounding-volume hierarchy over their export meshes
+(the ones the STLs are written from, see meshes.py) finds the faces near
+each ghost. Only those faces go to OCC for the exact minimum distance, and
+only ghosts that touch or sit inside a part pay for an exact boolean
+intersection. Contact is expected where a component is mounted (SSR on its
+standoffs, PID against its clamp); any intersection volume is a collision.
+
+    python interference.py                      # default parameters
+    python interference.py --preset all-screws hybrid
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+from build123d import Compound, Location
+from OCP.BRepExtrema import BRepExtrema_DistShapeShape
+
+import case3b
+import meshes
+
+SEARCH_RADIUS = 25.0     # mm; gaps larger than this are reported as "> SEARCH_RADIUS"
+COLLISION_VOLUME = 1e-3  # mm³; smaller overlaps are numerical noise
+LEAF_SIZE = 8
+
+
+def mesh_faces(part, offset=(0.0, 0.0, 0.0)):
+    """(triangles (N, 3, 3), face index (N,), faces) of `part` moved by offset.
+
+    The triangles are the export mesh of the unmoved part, shifted, so the
+    check reuses the tessellation the STL export already paid for. It only
+    prunes faces; the distances are exact.
+    """
+    m = meshes.export_mesh(part)
+    return m.triangles + offset, m.faces, part.moved(Location(offset)).faces()
+
+
+class BVH:
+    """Axis-aligned bounding-box tree over triangles, built with median splits."""
+
+    def __init__(self, triangles, leaf_size=LEAF_SIZE):
+        self.lo_tri, self.hi_tri = triangles.min(axis=1), triangles.max(axis=1)
+        centroids = triangles.mean(axis=1)
+        self.order = np.arange(len(triangles))
+        self.nodes = []   # [lo, hi, start, end, left, right]
+        self._build(centroids, 0, len(triangles), leaf_size)
+
+    def _build(self, centroids, start, end, leaf_size):
+        ids = self.order[start:end]
+        node = [self.lo_tri[ids].min(axis=0), self.hi_tri[ids].max(axis=0), start, end, -1, -1]
+        index = len(self.nodes)
+        self.nodes.append(node)
+        if end - start > leaf_size:
+            axis = np.argmax(node[1] - node[0])
+            self.order[start:end] = ids[np.argsort(centroids[ids, axis], kind="stable")]
+            mid = (start + end) // 2
+            node[4] = self._build(centroids, start, mid, leaf_size)
+            node[5] = self._build(centroids, mid, end, leaf_size)
+        return index
+
+    def query(self, lo, hi):
+        """Indices of the triangles whose boxes overlap the box lo..hi."""
+        found, stack = [], [0]
+        while stack:
+            node_lo, node_hi, start, end, left, right = self.nodes[stack.pop()]
+            if np.any(node_lo > hi) or np.any(node_hi < lo):
+                continue
+            if left < 0:
+                ids = self.order[start:end]
+                hit = np.all(self.lo_tri[ids] <= hi, axis=1) & np.all(self.hi_tri[ids] >= lo, axis=1)
+                found.append(ids[hit])
+            else:
+                stack += [left, right]
+        return np.concatenate(found) if found else np.empty(0, dtype=int)
+
+
+class MeshedPart:
+    def __init__(self, name, part, offset=(0.0, 0.0, 0.0)):
+        self.name = name
+        self.part = part.moved(Location(offset))
+        self.triangles, self.owners, self.faces = mesh_faces(part, offset)
+        self.bvh = BVH(self.triangles)
+
+    def faces_near(self, shape, radius):
+        bb = shape.bounding_box()
+        ids = self.bvh.query(np.array([*bb.min]) - radius, np.array([*bb.max]) + radius)
+        return [self.faces[i] for i in np.unique(self.owners[ids])]
+
+
+def _volume(shape):
+    """Volume of an intersect() result: None, a Shape or a ShapeList."""
+    if shape is None:
+        return 0.0
+    if isinstance(shape, list):
+        return sum(item.volume for item in shape)
+    return shape.volume
+
+
+def assembled(p, parts):
+    """{name: Part} for base and shell, and the ghosts, in the assembled frame."""
+    shell_z = Location((0, 0, p.BASE_THICKNESS))
+    case = {"base": parts["base"], "shell": parts["shell"].moved(shell_z)}
+    ghosts = {
+        name: ghost.moved(shell_z) if case3b.GHOST_FRAMES[name] == "shell" else ghost
+        for name, ghost in case3b.ghosts(p).items()
+    }
+    return case, ghosts
+
+
+def check(p=case3b.DEFAULT_PARAMS, parts=None, radius=SEARCH_RADIUS):
+    """{ghost: {part: {"gap": mm or None, "collision": mm³, "faces": n}}}.
+
+    gap is None when nothing lies within `radius`; collision is the exact
+    intersection volume (0 when the ghost only touches or is clear).
+    """
+    parts = parts or case3b.build_parts(p, ("base", "shell"))
+    _, ghosts = assembled(p, parts)
+    meshed = [MeshedPart("base", parts["base"]), MeshedPart("shell", parts["shell"], (0.0, 0.0, p.BASE_THICKNESS))]
+    report = {}
+    for ghost_name, ghost in ghosts.items():
+        report[ghost_name] = {}
+        for mesh in meshed:
+            near = mesh.faces_near(ghost, radius)
+            gap, collision = None, 0.0
+            if near:
+                dist = BRepExtrema_DistShapeShape(ghost.wrapped, Compound(near).wrapped)
+                gap = dist.Value() if dist.IsDone() else None
+            inside = mesh.part.is_inside(ghost.center())
+            if inside or (gap is not None and gap <= 1e-6):
+                collision = _volume(ghost.intersect(mesh.part))
+                if collision < COLLISION_VOLUME:
+                    collision = 0.0
+                elif gap is None:
+                    gap = 0.0
+            report[ghost_name][mesh.name] = {"gap": gap, "collision": collision, "faces": len(near)}
+    return report
+
+
+def collisions(report):
+    """[(ghost, part, volume)] for every intersecting pair in a check() report."""
+    return [(ghost, part, r["collision"]) for ghost, parts in report.items()
+            for part, r in parts.items() if r["collision"] > 0]
+
+
+def print_report(report, radius=SEARCH_RADIUS):
+    for ghost, parts in report.items():
+        cells = []
+        for part, r in parts.items():
+            gap = f"> {radius:g}" if r["gap"] is None else f"{r['gap']:.2f}"
+            mark = f"  ❌ {r['collision']:.1f} mm³" if r["collision"] else ""
+            cells.append(f"{part} gap {gap} mm ({r['faces']} faces){mark}")
+        print(f"  {ghost:<9} " + " | ".join(cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--preset", nargs="+", default=[], choices=list(case3b.PRESETS), help="presets to check (default: the default parameters)")
+    args = parser.parse_args(argv)
+
+    configs = {name: case3b.CaseParams(**case3b.PRESETS[name]) for name in args.preset} or {"default": case3b.DEFAULT_PARAMS}
+    failed = False
+    for name, p in configs.items():
+        parts = case3b.build_parts(p, ("base", "shell"))
+        start = time.perf_counter()
+        report = check(p, parts)
+        print(f"{name}: checked in {time.perf_counter() - start:.2f}s")
+        print_report(report)
+        failed |= bool(collisions(report))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""Analytic layout validator: the prompt-3b.md clearance rules as box math.
+
+Every component is an axis-aligned box built from the section 3 positions
+and the component sizes, in the assembled frame (base plate at Z=0, shell
+sitting on it at Z=BASE_THICKNESS). Each rule yields a margin in mm and a
+layout is valid when every margin is positive. No OCC is involved, so a
+parameter set is checked in well under a millisecond, before any build.
+
+All rules are plain NumPy arithmetic, so they also run on whole candidate
+batches: ParamBatch stands in for a CaseParams whose fields are arrays.
+
+    python layout.py                      # check the defaults
+    python layout.py INTERNAL_L=140 c14_z=40
+"""
+
+import functools
+import sys
+import time
+from dataclasses import fields
+
+import numpy as np
+
+C14_CABLE_DEPTH = 45.0   # free depth behind the C14 inlet for the mains cables
+WIRE_RUNWAY = 20.0       # thermocouple wire run from terminal block to strain relief
+CLAMP_H = 10.0           # PID clamp block height (build_shell)
+CLAMP_D = 8.0            # PID clamp and brace depth behind the front wall (build_shell)
+POST_R = 5.0             # corner post radius (build_shell)
+LABYRINTH_H = 12.0       # strain relief pillar height (build_base)
+
+
+class LayoutError(ValueError):
+    """Raised by validate() when a parameter set breaks a layout rule."""
+
+
+class ParamBatch:
+    """A CaseParams stand-in whose overridden fields are NumPy arrays.
+
+    Derived values (BOX_W, ssr_y, ...) are computed by the CaseParams
+    properties themselves, so they broadcast over the candidates.
+    """
+
+    def __init__(self, base, **arrays):
+        unknown = set(arrays) - {f.name for f in fields(base)}
+        if unknown:
+            raise TypeError(f"unknown CaseParams fields: {', '.join(sorted(unknown))}")
+        self._base = base
+        self._arrays = {name: np.asarray(value, dtype=float) for name, value in arrays.items()}
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in self._arrays:
+            return self._arrays[name]
+        attr = getattr(type(self._base), name, None)
+        if isinstance(attr, property):
+            return attr.fget(self)
+        return getattr(self._base, name)
+
+
+def _batch_shape(p):
+    """Shape of the candidate axis: () for a CaseParams, the arrays' shape for a ParamBatch."""
+    if isinstance(p, ParamBatch):
+        return np.broadcast_shapes(*(value.shape for value in p._arrays.values()))
+    return ()
+
+
+def _box(p, x, y, z, w, d, h):
+    """(lo, hi) corners, each (3, *batch), of a box centred on x, y, z.
+
+    Every box has the full batch shape of p, even one that no batched field
+    moves, so boxes can be compared with each other directly.
+    """
+    values = [np.asarray(v, dtype=float) for v in (x, y, z, w, d, h)]
+    x, y, z, w, d, h, _ = np.broadcast_arrays(*values, np.empty(_batch_shape(p)))
+    half = np.stack([w, d, h]) / 2
+    centre = np.stack([x, y, z])
+    return centre - half, centre + half
+
+
+def components(p):
+    """{name: (lo, hi)} component boxes in the assembled frame."""
+    shell_z = p.BASE_THICKNESS
+    term_z0 = p.BASE_THICKNESS + p.TERM_BOSS_HEIGHT
+    lab_y = p.INTERNAL_L/2 - 8.0
+    return {
+        "pid": _box(p, p.pid_x, p.pid_y, shell_z + p.pid_z_center,
+                    p.PID_BODY_W, p.PID_BODY_D, p.PID_BODY_H + p.FIT_TOLERANCE),
+        "ssr": _box(p, p.ssr_x, p.ssr_y, p.ssr_z + p.SSR_H/2, p.SSR_W, p.SSR_L, p.SSR_H),
+        "terminal": _box(p, p.term_x, p.term_y, term_z0 + p.TERM_H/2, p.TERM_W, p.TERM_D, p.TERM_H),
+        # The three pillars as one box: x spans -7..+7 around term_x, y spans lab_y-5..lab_y
+        "labyrinth": _box(p, p.term_x, lab_y - 2.5, p.BASE_THICKNESS + LABYRINTH_H/2, 14.0 + 5.0, 5.0 + 5.0, LABYRINTH_H),
+    }
+
+
+def fixtures(p):
+    """{name: (lo, hi)} bosses and pilasters the shell adds to the interior."""
+    roof_z = p.BASE_THICKNESS + p.INTERNAL_H
+    boss_x0 = -p.INTERNAL_W/2                                 # left boss bridges to the wall
+    boss_x1 = p.socket_x + p.UK_SOCKET_MOUNT_PITCH/2 + 15.0   # right boss's 15 mm dog-bone
+    pilaster_y = p.INTERNAL_L/2 - p.C14_BOSS_DEPTH/2
+    return {
+        "socket_bosses": _box(p, (boss_x0 + boss_x1)/2, p.socket_y, roof_z - p.SOCKET_BOSS_DEPTH/2,
+                              boss_x1 - boss_x0, p.SOCKET_BOSS_DIA, p.SOCKET_BOSS_DEPTH),
+        **{f"c14_pilaster_{i + 1}": _box(p, p.c14_x + dx, pilaster_y, p.BASE_THICKNESS + p.INTERNAL_H/2,
+                                         12.0, p.C14_BOSS_DEPTH, p.INTERNAL_H)
+           for i, dx in enumerate((p.C14_SCREW_PITCH/2, -p.C14_SCREW_PITCH/2))},
+    }
+
+
+def _interior(p):
+    """(lo, hi) of the free space inside the assembled case."""
+    return _box(p, 0.0, 0.0, p.BASE_THICKNESS + p.INTERNAL_H/2, p.INTERNAL_W, p.INTERNAL_L, p.INTERNAL_H)
+
+
+def _smallest(values):
+    """Elementwise minimum of scalars and arrays of any broadcastable shapes."""
+    return functools.reduce(np.minimum, values)
+
+
+def c14_cable_depth(p):
+    """Free depth behind the C14 inlet, minus the 45 mm the cables need."""
+    inner_rear = p.INTERNAL_L/2
+    x0, x1 = p.c14_x - p.C14_BODY_W/2, p.c14_x + p.C14_BODY_W/2
+    z = p.BASE_THICKNESS + p.c14_z
+    z0, z1 = z - p.C14_BODY_H/2, z + p.C14_BODY_H/2
+    depth = p.INTERNAL_L + 0 * (x0 + z0)   # up to the front wall, broadcast to the batch
+    for lo, hi in components(p).values():
+        # Only components in the inlet's shadow (overlapping it in X and Z) count
+        shadowed = (lo[0] < x1) & (hi[0] > x0) & (lo[2] < z1) & (hi[2] > z0)
+        depth = np.where(shadowed, np.minimum(depth, inner_rear - hi[1]), depth)
+    return depth - C14_CABLE_DEPTH
+
+
+def wire_runway(p):
+    """Terminal block rear face to the strain relief pillar row, minus ~20 mm."""
+    lab_y = p.INTERNAL_L/2 - 8.0
+    return lab_y - (p.term_y + p.TERM_D/2) - WIRE_RUNWAY
+
+
+def ssr_wall_gap(p):
+    """Smallest gap between the SSR and the inner walls/roof."""
+    lo, hi = components(p)["ssr"]
+    wall_lo, wall_hi = _interior(p)
+    return np.minimum((lo - wall_lo)[:2].min(axis=0), (wall_hi - hi).min(axis=0))
+
+
+def clamp_floor_gap(p):
+    """Height of the PID clamp's underside above the shell's open bottom (Z=0)."""
+    return p.pid_z_start - CLAMP_H
+
+
+def components_inside(p):
+    """Smallest gap between any component and the inner walls/roof.
+
+    The PID body starts at the front wall (its bezel sits in the cutout), so
+    its front face is not a gap; the labyrinth is part of the base.
+    """
+    wall_lo, wall_hi = _interior(p)
+    gaps = []
+    for name, (lo, hi) in components(p).items():
+        if name == "labyrinth":
+            continue
+        low = lo - wall_lo
+        if name == "pid":
+            low = low[[0, 2]]
+        gaps.append(np.minimum(low.min(axis=0), (wall_hi - hi).min(axis=0)))
+    return _smallest(gaps)
+
+
+def corner_posts_clear(p):
+    """Smallest gap between a component and a corner post (posts as squares)."""
+    posts = [_box(p, sx * p.corner_off_x, sy * p.corner_off_y, p.BASE_THICKNESS + p.INTERNAL_H/2, 2*POST_R, 2*POST_R, p.INTERNAL_H)
+             for sx in (-1, 1) for sy in (-1, 1)]
+    gaps = []
+    for name, (lo, hi) in components(p).items():
+        if name == "labyrinth":
+            continue
+        for post_lo, post_hi in posts:
+            gaps.append(np.maximum(post_lo - hi, lo - post_hi)[:2].max(axis=0))
+    return _smallest(gaps)
+
+
+def fixtures_clear(p):
+    """Smallest gap between a component and the socket bosses or C14 pilasters."""
+    gaps = []
+    for name, (lo, hi) in components(p).items():
+        for fix_lo, fix_hi in fixtures(p).values():
+            gaps.append(np.maximum(fix_lo - hi, lo - fix_hi).max(axis=0))
+    return _smallest(gaps)
+
+
+def c14_in_wall(p):
+    """Smallest gap between the C14 window or its pilasters and the back wall's edges."""
+    half_w = p.C14_SCREW_PITCH/2 + 6.0   # pilasters are 12 mm wide
+    return _smallest([
+        p.INTERNAL_W/2 - np.abs(p.c14_x) - half_w,
+        p.c14_z - p.C14_BODY_H/2,
+        p.INTERNAL_H - (p.c14_z + p.C14_BODY_H/2),
+    ])
+
+
+def socket_in_roof(p):
+    """Smallest gap between the socket cutout and the walls or the PID clamp brace."""
+    half = p.UK_SOCKET_CUTOUT_SIZE/2
+    return _smallest([
+        p.INTERNAL_W/2 - np.abs(p.socket_x) - half,
+        p.socket_y - half - (-p.INTERNAL_L/2 + CLAMP_D),
+        p.INTERNAL_L/2 - (p.socket_y + half),
+    ])
+
+
+def components_apart(p):
+    """Smallest separation between any two components (negative = overlap)."""
+    boxes = list(components(p).values())
+    gaps = []
+    for i, (lo_a, hi_a) in enumerate(boxes):
+        for lo_b, hi_b in boxes[i + 1:]:
+            # Boxes are apart if separated along at least one axis
+            gaps.append(np.maximum(lo_b - hi_a, lo_a - hi_b).max(axis=0))
+    return _smallest(gaps)
+
+
+CONSTRAINTS = {
+    "c14_cable_depth": (c14_cable_depth, f"at least {C14_CABLE_DEPTH:g} mm free behind the C14 inlet"),
+    "wire_runway": (wire_runway, f"~{WIRE_RUNWAY:g} mm runway from terminal block to strain relief"),
+    "ssr_wall_gap": (ssr_wall_gap, "SSR does not touch the walls or roof"),
+    "clamp_floor_gap": (clamp_floor_gap, "PID clamp does not reach Z=0"),
+    "components_inside": (components_inside, "components fit inside the case"),
+    "components_apart": (components_apart, "components do not overlap each other"),
+    "corner_posts_clear": (corner_posts_clear, "components clear the corner posts"),
+    "fixtures_clear": (fixtures_clear, "components clear the socket bosses and C14 pilasters"),
+    "c14_in_wall": (c14_in_wall, "C14 window and pilasters fit in the back wall"),
+    "socket_in_roof": (socket_in_roof, "socket cutout fits in the roof, clear of the PID brace"),
+}
+
+
+def margins(p):
+    """{rule: margin in mm}; arrays for a ParamBatch, floats for a CaseParams."""
+    result = {name: fn(p) for name, (fn, _) in CONSTRAINTS.items()}
+    if isinstance(p, ParamBatch):
+        return dict(zip(result, np.broadcast_arrays(*result.values())))
+    return {name: float(np.min(value)) for name, value in result.items()}
+
+
+def feasible(p):
+    """Boolean mask of the candidates in a ParamBatch that pass every rule."""
+    return np.logical_and.reduce([m > 0 for m in margins(p).values()])
+
+
+def violations(p):
+    """[(rule, margin, description)] for every rule a CaseParams breaks."""
+    return [(name, margin, CONSTRAINTS[name][1]) for name, margin in margins(p).items() if margin <= 0]
+
+
+def validate(p):
+    """Raise LayoutError if `p` breaks any layout rule."""
+    broken = violations(p)
+    if broken:
+        raise LayoutError("; ".join(f"{desc} ({name}: {margin:+.1f} mm)" for name, margin, desc in broken))
+
+
+def _parse_override(text):
+    from case3b import CaseParams
+
+    name, _, value = text.partition("=")
+    field = {f.name: f for f in fields(CaseParams)}.get(name)
+    if field is None or not value:
+        raise SystemExit(f"expected FIELD=VALUE with a CaseParams field, got {text!r}")
+    return name, (value.lower() in ("1", "true", "yes")) if field.type in (bool, "bool") else float(value)
+
+
+def main(argv=None):
+    from case3b import CaseParams
+
+    argv = sys.argv[1:] if argv is None else argv
+    p = CaseParams(**dict(map(_parse_override, argv)))
+    start = time.perf_counter()
+    result = margins(p)
+    elapsed = time.perf_counter() - start
+    for name, margin in result.items():
+        status = "ok  " if margin > 0 else "FAIL"
+        print(f"  {status} {name:<18} {margin:+8.1f} mm  {CONSTRAINTS[name][1]}")
+    print(f"Checked {len(result)} rules in {elapsed * 1000:.2f} ms")
+    return 0 if all(m > 0 for m in result.values()) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,217 @@
+"""Tessellate once: one mesh per shape and tolerance, shared by every consumer.
+
+Meshing a part is a BRepMesh pass (C++) plus copying the triangulation out
+of OCC (Python). The STL and 3MF writers, the viewer and the mesh analyses
+each used to pay for both. mesh() does it once and keeps the vertex and
+index arrays in an LRU keyed by the shape's hash and the tolerances. The
+hash covers the TShape and location, see build123d's Shape.__hash__. An
+entry holds a reference to its shape, so while the entry is cached no other
+part can reuse the hash.
+
+    m = meshes.export_mesh(part)           # what export_stl writes
+    meshes.write_stl(m, "part.stl")
+    overhangs.analyse(meshes.export_mesh(part).triangles)   # the same Mesh
+
+Export meshes are adaptive. Each part gets an absolute linear deflection
+(the QUALITY chord error) plus the angular deflection that keeps the same
+chord error on its smallest arc. The M3 tap holes set the facet count for
+the whole part, and flat plates stay a few triangles. "production" keeps
+holes within 0.01 mm, a fifth of the profile's xy_hole_compensation.
+"draft" allows 0.05 mm for quick looks. Pick one with CASE3B_MESH_QUALITY or
+case3b.py --quality.
+
+The viewer (ocp_vscode) has no mesh input. It does read the triangulation
+BRepMesh leaves on the shape and keeps one finer than it asks for, so
+meshing through the cache first turns its own meshing into a no-op. mesh()
+itself always remeshes to the requested tolerances, so a draft preview of
+a part that was just exported at production quality is really draft.
+"""
+
+import io
+import math
+import os
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+from build123d import GeomType
+from OCP.BRep import BRep_Tool
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.IMeshTools import IMeshTools_Parameters
+from OCP.Message import Message_ProgressRange
+from OCP.TopAbs import TopAbs_Orientation
+from OCP.TopLoc import TopLoc_Location
+
+from stl_mesh import HEADER_SIZE, STL_DTYPE
+
+DEFAULT_TOLERANCE = 1e-3    # build123d export_stl's defaults: linear deflection, relative to edge size
+DEFAULT_ANGULAR = 0.1       # rad
+QUALITY = {"production": 0.01, "draft": 0.05}   # mm chord error of export meshes
+QUALITY_ENV = "CASE3B_MESH_QUALITY"
+MAX_ANGULAR = 0.5           # rad; for parts without arcs
+MAX_ENTRIES = 32
+ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+
+
+@dataclass(frozen=True)
+class Mesh:
+    """A triangulated part: shared vertices, outward-wound triangles."""
+    vertices: np.ndarray   # (V, 3) float64
+    indices: np.ndarray    # (T, 3) int64 into vertices
+    faces: np.ndarray      # (T,) index of each triangle's face in part.faces()
+
+    @property
+    def triangles(self):
+        """(T, 3, 3) corner coordinates."""
+        return self.vertices[self.indices]
+
+    @property
+    def normals(self):
+        """(T, 3) unit normals."""
+        tris = self.triangles
+        n = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+        length = np.linalg.norm(n, axis=1, keepdims=True)
+        return np.divide(n, length, out=np.zeros_like(n), where=length > 0)
+
+
+_cache = OrderedDict()   # (hash, tolerance, angular, relative) -> (shape, Mesh)
+stats = {"hits": 0, "misses": 0}
+
+
+def _extract(part):
+    """Mesh from the triangulation BRepMesh stored on each face of part."""
+    vertices, indices, owners = [], [], []
+    offset = 0
+    for index, face in enumerate(part.faces()):
+        loc = TopLoc_Location()
+        poly = BRep_Tool.Triangulation_s(face.wrapped, loc)
+        if poly is None:
+            continue
+        nodes = np.array([poly.Node(i).Coord() for i in range(1, poly.NbNodes() + 1)])
+        if not loc.IsIdentity():
+            trsf = loc.Transformation()
+            m = np.array([[trsf.Value(r, c) for c in range(1, 5)] for r in range(1, 4)])
+            nodes = nodes @ m[:, :3].T + m[:, 3]
+        tris = np.array([poly.Triangle(i).Get() for i in range(1, poly.NbTriangles() + 1)], dtype=np.int64) - 1
+        if face.wrapped.Orientation() == TopAbs_Orientation.TopAbs_REVERSED:
+            tris = tris[:, ::-1]
+        vertices.append(nodes)
+        indices.append(tris + offset)
+        owners.append(np.full(len(tris), index))
+        offset += len(nodes)
+    if not indices:
+        return Mesh(np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64), np.zeros(0, dtype=np.int64))
+    return Mesh(np.concatenate(vertices), np.concatenate(indices), np.concatenate(owners))
+
+
+def mesh(part, tolerance=DEFAULT_TOLERANCE, angular=DEFAULT_ANGULAR, relative=True):
+    """The Mesh of part at these tolerances, tessellating only on the first request."""
+    key = (hash(part), tolerance, angular, relative)
+    entry = _cache.get(key)
+    if entry is not None and entry[0].IsSame(part.wrapped):
+        _cache.move_to_end(key)
+        stats["hits"] += 1
+        return entry[1]
+    stats["misses"] += 1
+    params = IMeshTools_Parameters()
+    params.Deflection, params.Angle, params.Relative = tolerance, angular, relative
+    params.InParallel = True
+    params.AllowQualityDecrease = True   # replace a finer triangulation left by another request
+    BRepMesh_IncrementalMesh(part.wrapped, params, Message_ProgressRange())
+    result = _extract(part)
+    _cache[key] = (part.wrapped, result)
+    while len(_cache) > MAX_ENTRIES:
+        _cache.popitem(last=False)
+    return result
+
+
+def quality():
+    """The export mesh quality from CASE3B_MESH_QUALITY (default: production)."""
+    name = os.environ.get(QUALITY_ENV, "production").lower()
+    if name not in QUALITY:
+        raise ValueError(f"{QUALITY_ENV} must be one of {', '.join(QUALITY)}, got {name!r}")
+    return name
+
+
+def smallest_radius(part):
+    """Radius of the tightest circular edge of part (mm), inf without arcs."""
+    return min((edge.radius for edge in part.edges() if edge.geom_type == GeomType.CIRCLE), default=math.inf)
+
+
+def tolerances(part, name=None):
+    """(linear mm, angular rad) deflection for part at quality `name`.
+
+    A chord of angle a on radius r strays r * (1 - cos(a / 2)) from the arc,
+    so the angle that keeps the smallest radius within the chord error keeps
+    every larger arc within it too.
+    """
+    chord = QUALITY[name or quality()]
+    r = smallest_radius(part)
+    angular = 2 * math.acos(1 - chord / r) if chord < r < math.inf else MAX_ANGULAR
+    return chord, min(angular, MAX_ANGULAR)
+
+
+def export_mesh(part, name=None):
+    """The Mesh the writers use: adaptive absolute deflection at quality `name`."""
+    return mesh(part, *tolerances(part, name), relative=False)
+
+
+def clear():
+    _cache.clear()
+    stats.update(hits=0, misses=0)
+
+
+def write_stl(m, path):
+    """Binary STL of a Mesh."""
+    records = np.zeros(len(m.indices), STL_DTYPE)
+    records["normal"] = m.normals
+    records["v"] = m.triangles
+    with open(path, "wb") as f:
+        f.write(b"binary STL from meshes.py".ljust(HEADER_SIZE - 4, b" "))
+        f.write(np.uint32(len(records)).tobytes())
+        records.tofile(f)
+
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+ <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+ <Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>
+ <Default Extension="config" ContentType="text/xml"/>
+</Types>
+"""
+RELS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+ <Relationship Target="/3D/3dmodel.model" Id="rel0" Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>
+</Relationships>
+"""
+MODEL_HEADER = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<model unit="millimeter" xml:lang="en-US" xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n')
+
+
+def object_xml(object_id, name, m):
+    """A 3MF <object> element holding a Mesh."""
+    out = io.StringIO()
+    out.write(f' <object id="{object_id}" name={quoteattr(name)} type="model"><mesh><vertices>\n')
+    np.savetxt(out, m.vertices, fmt='  <vertex x="%.6g" y="%.6g" z="%.6g"/>')
+    out.write(" </vertices><triangles>\n")
+    np.savetxt(out, m.indices, fmt='  <triangle v1="%d" v2="%d" v3="%d"/>')
+    out.write(" </triangles></mesh></object>\n")
+    return out.getvalue()
+
+
+def write_zip(path, files):
+    """Write {name: text} as a ZIP_DEFLATED archive with fixed timestamps (byte-identical reruns)."""
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, text in files.items():
+            info = zipfile.ZipInfo(name, ZIP_DATE)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(info, text.encode("utf-8"))
+
+
+def write_3mf(m, path, name="part"):
+    """Single-object 3MF of a Mesh."""
+    model = (MODEL_HEADER + "<resources>\n" + object_xml(1, name, m)
+             + '</resources>\n<build>\n <item objectid="1"/>\n</build>\n</model>\n')
+    write_zip(path, {"[Content_Types].xml": CONTENT_TYPES, "_rels/.rels": RELS, "3D/3dmodel.model": model})
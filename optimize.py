@@ -0,0 +1,132 @@
+"""Design-space search for the smallest enclosure that passes the layout rules.
+
+The layout variables (SIDE_MARGIN, INTERNAL_L, INTERNAL_H and the section 3
+positions) are sampled in batches of thousands and checked with layout.py's
+rules as NumPy arrays; no OCC is involved until the end. Each round narrows
+the sampling box around the best feasible candidates. Only the top few
+candidates are built with build123d, to get their exact printed volume and
+to run the ghost interference check on the real geometry.
+
+    python optimize.py                              # minimise BOX_W*BOX_L*BOX_H
+    python optimize.py --objective printed --top 5
+    python optimize.py --min-margin 2 --candidates 50000
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import replace
+
+import numpy as np
+
+import case3b
+import interference
+import layout
+
+# Search bounds (mm); candidates are snapped to GRID so the results are printable numbers
+VARIABLES = {
+    "SIDE_MARGIN": (0.0, 30.0),
+    "INTERNAL_L": (100.0, 200.0),
+    "INTERNAL_H": (70.0, 130.0),
+    "pid_z_start": (5.0, 60.0),
+    "ssr_front_gap": (0.0, 60.0),
+    "socket_y": (-60.0, 60.0),
+    "c14_z": (20.0, 100.0),
+    "term_rear_gap": (15.0, 80.0),
+}
+GRID = 0.5
+
+
+def box_volume(p):
+    """Outer envelope of the assembled case, mm³."""
+    return p.BOX_W * p.BOX_L * (p.BOX_H + p.BASE_THICKNESS)
+
+
+def printed_volume(p):
+    """Plastic in the shell and base plate, mm³, ignoring cutouts and bosses."""
+    shell = p.BOX_W * p.BOX_L * p.BOX_H - p.INTERNAL_W * p.INTERNAL_L * p.INTERNAL_H
+    return shell + p.BOX_W * p.BOX_L * p.BASE_THICKNESS
+
+
+OBJECTIVES = {"box": box_volume, "printed": printed_volume}
+
+
+def score(base, candidates, objective="box", min_margin=1.0):
+    """Objective of every candidate in {variable: array}; inf where a rule fails."""
+    batch = layout.ParamBatch(base, **candidates)
+    ok = np.logical_and.reduce([m >= min_margin for m in layout.margins(batch).values()])
+    return np.where(ok, OBJECTIVES[objective](batch), np.inf)
+
+
+def search(base=case3b.DEFAULT_PARAMS, objective="box", candidates=20_000, rounds=5, elite=0.02, min_margin=1.0, seed=0):
+    """[(score, {variable: value})] of the distinct feasible candidates, best first."""
+    rng = np.random.default_rng(seed)
+    names = list(VARIABLES)
+    full_lo, full_hi = np.array([VARIABLES[n] for n in names]).T
+    lo, hi = full_lo, full_hi
+    seen_x, seen_s = [], []
+    for _ in range(rounds):
+        x = np.round(rng.uniform(lo, hi, (candidates, len(names))) / GRID) * GRID
+        s = score(base, dict(zip(names, x.T)), objective, min_margin)
+        seen_x.append(x)
+        seen_s.append(s)
+        all_x, all_s = np.concatenate(seen_x), np.concatenate(seen_s)
+        feasible = np.isfinite(all_s)
+        if not feasible.any():
+            continue
+        best = all_x[feasible][np.argsort(all_s[feasible])[:max(1, int(elite * candidates))]]
+        # Narrow to the elite's spread, padded so the box never collapses
+        pad = np.maximum(0.1 * (full_hi - full_lo), GRID)
+        lo, hi = np.maximum(best.min(axis=0) - pad, full_lo), np.minimum(best.max(axis=0) + pad, full_hi)
+
+    all_x, all_s = np.concatenate(seen_x), np.concatenate(seen_s)
+    feasible = np.isfinite(all_s)
+    all_x, all_s = all_x[feasible], all_s[feasible]
+    unique, index = np.unique(all_x, axis=0, return_index=True)
+    order = np.argsort(all_s[index], kind="stable")
+    return [(float(all_s[index][i]), {n: float(v) for n, v in zip(names, unique[i])}) for i in order]
+
+
+def verify(base, values):
+    """Build base and shell for one candidate: (params, printed mm³, [collisions])."""
+    p = replace(base, **values)
+    layout.validate(p)
+    parts = case3b.build_parts(p, ("base", "shell"))
+    printed = sum(part.volume for part in parts.values())
+    return p, printed, interference.collisions(interference.check(p, parts))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--objective", choices=list(OBJECTIVES), default="box", help="box: outer envelope; printed: plastic volume (default: %(default)s)")
+    parser.add_argument("--candidates", type=int, default=20_000, help="candidates per round (default: %(default)s)")
+    parser.add_argument("--rounds", type=int, default=5, help="sampling rounds (default: %(default)s)")
+    parser.add_argument("--min-margin", type=float, default=1.0, help="smallest margin every layout rule must keep, mm (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=3, help="candidates to build and check (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    base = case3b.DEFAULT_PARAMS
+    objective = OBJECTIVES[args.objective]
+    start = time.perf_counter()
+    ranked = search(base, args.objective, args.candidates, args.rounds, min_margin=args.min_margin, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"Scored {args.candidates * args.rounds} candidates in {elapsed:.2f}s, {len(ranked)} feasible")
+    if not ranked:
+        return 1
+
+    reference = objective(base)
+    print(f"  current   {args.objective} {reference / 1e3:9.1f} cm³  printed {sum(p.volume for p in case3b.build_parts(base, ('base', 'shell')).values()) / 1e3:7.1f} cm³")
+    status = 1
+    for rank, (value, values) in enumerate(ranked[:args.top], 1):
+        p, printed, hits = verify(base, values)
+        status = 0 if not hits else status
+        mark = "  ❌ " + ", ".join(f"{ghost}/{part}" for ghost, part, _ in hits) if hits else ""
+        print(f"  #{rank:<8} {args.objective} {value / 1e3:9.1f} cm³  printed {printed / 1e3:7.1f} cm³  "
+              f"({value / reference - 1:+.1%}, box {p.BOX_W:g} x {p.BOX_L:g} x {p.BOX_H + p.BASE_THICKNESS:g}){mark}")
+        print("            " + " ".join(f"{name}={v:g}" for name, v in values.items()))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""Overhang and bridge analysis of the base and shell in their print orientation.
+
+The shell prints roof-down and the base as modelled. Every triangle of the
+mesh is classified by how far its normal leans down from the horizontal:
+faces past the overhang limit need support unless they are flat bridges,
+and flat down-facing regions (bridges) are grouped into connected regions
+whose span is checked against the profile's max_bridge_length. Regions are
+labelled with the features they touch (C14 window, PID cutout, socket
+cutout, clamp underside). It is all NumPy over the triangle arrays, so a
+variant takes milliseconds once it is meshed.
+
+    python overhangs.py                        # default parameters
+    python overhangs.py --preset hybrid --limit 50
+    python overhangs.py --stl variants/101111  # the STLs a batch run wrote
+"""
+
+import argparse
+import sys
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+import case3b
+import layout
+import meshes
+import stl_mesh
+from print_profile import load_profile
+
+OVERHANG_LIMIT = 45.0   # degrees a down-facing face may lean from vertical before it needs support
+FLAT = 5.0              # degrees from horizontal; flatter down-facing faces are bridges
+BED_TOLERANCE = 1e-3    # mm; faces this close to the lowest point sit on the plate
+WELD = 1e-4             # mm; vertex welding grid for connectivity
+
+
+def part_triangles(part):
+    """(N, 3, 3) triangles of a Part's export mesh (the one its STL is written from)."""
+    return meshes.export_mesh(part).triangles
+
+
+def to_print_frame(name, p, tris):
+    """Triangles (or points) as printed: the shell is turned roof-down about X."""
+    if name != "shell":
+        return tris
+    return tris * np.array([1.0, -1.0, -1.0]) + np.array([0.0, 0.0, p.BOX_H])
+
+
+def features(p):
+    """{part: {label: (lo, hi)}} own-frame boxes around the features that bridge."""
+    def box(x, y, z, w, d, h, pad=1.0):
+        half = np.array([w, d, h]) / 2 + pad
+        return np.array([x, y, z]) - half, np.array([x, y, z]) + half
+
+    feet = [(sx * (p.BOX_W/2 - p.FOOT_OFFSET), sy * (p.BOX_L/2 - p.FOOT_OFFSET)) for sx in (-1, 1) for sy in (-1, 1)]
+    corners = [(sx * p.corner_off_x, sy * p.corner_off_y) for sx in (-1, 1) for sy in (-1, 1)]
+    return {
+        "base": {
+            **{f"foot_{i + 1}": box(x, y, p.FOOT_DEPTH/2, p.FOOT_DIA, p.FOOT_DIA, p.FOOT_DEPTH) for i, (x, y) in enumerate(feet)},
+            **{f"counterbore_{i + 1}": box(x, y, p.M3_HEAD_H/2, p.M3_HEAD_DIA, p.M3_HEAD_DIA, p.M3_HEAD_H) for i, (x, y) in enumerate(corners)},
+        },
+        "shell": {
+            "c14_window": box(p.c14_x, p.BOX_L/2 - p.WALL_THICKNESS/2, p.c14_z, p.C14_BODY_W, p.WALL_THICKNESS, p.C14_BODY_H),
+            "pid_cutout": box(p.pid_x, -p.BOX_L/2 + p.WALL_THICKNESS/2, p.pid_z_center,
+                              p.PID_BODY_W + p.FIT_TOLERANCE, p.WALL_THICKNESS, p.PID_BODY_H + p.FIT_TOLERANCE),
+            "socket_cutout": box(p.socket_x, p.socket_y, p.BOX_H - p.ROOF_THICKNESS/2,
+                                 p.UK_SOCKET_CUTOUT_SIZE, p.UK_SOCKET_CUTOUT_SIZE, p.ROOF_THICKNESS),
+            "clamp_underside": box(p.pid_x, -p.BOX_L/2 + p.WALL_THICKNESS + layout.CLAMP_D/2, p.pid_z_start - layout.CLAMP_H/2,
+                                   50.0, layout.CLAMP_D, layout.CLAMP_H),
+        },
+    }
+
+
+def _weld(tris):
+    """(N, 3) vertex ids, equal for vertices within WELD of each other."""
+    keys = np.round(tris.reshape(-1, 3) / WELD).astype(np.int64)
+    _, ids = np.unique(keys, axis=0, return_inverse=True)
+    return ids.reshape(-1, 3)
+
+
+class _Edges:
+    """Every triangle edge, sorted by its undirected key, with the height of
+    the triangle's opposite vertex (below the edge = the triangle hangs down)."""
+
+    def __init__(self, tris, ids):
+        self.n = int(ids.max()) + 1
+        a, b = ids, np.roll(ids, -1, axis=1)
+        keys = (np.minimum(a, b) * self.n + np.maximum(a, b)).ravel()
+        opposite_z = np.roll(tris[:, :, 2], 1, axis=1).ravel()   # vertex i+2 is opposite edge (i, i+1)
+        order = np.argsort(keys, kind="stable")
+        self.keys, self.tri, self.opposite_z = keys[order], np.repeat(np.arange(len(ids)), 3)[order], opposite_z[order]
+
+    def key(self, a, b):
+        return np.minimum(a, b) * self.n + np.maximum(a, b)
+
+
+def _regions(ids):
+    """Connected-region label per triangle (triangles sharing a vertex connect)."""
+    rows = np.concatenate([ids[:, 0], ids[:, 1]])
+    cols = np.concatenate([ids[:, 1], ids[:, 2]])
+    n = int(ids.max()) + 1
+    _, labels = connected_components(coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n)), directed=False)
+    return labels[ids[:, 0]]
+
+
+def _supports(tris, ids, members, edges):
+    """(S, 2, 2) XY segments of a flat region's boundary held up by a face below it."""
+    mine = np.zeros(len(ids), dtype=bool)
+    mine[members] = True
+    a, b = ids[members], np.roll(ids[members], -1, axis=1)
+    keys = edges.key(a, b).ravel()
+    unique, counts = np.unique(keys, return_counts=True)
+    boundary = np.isin(keys, unique[counts == 1])
+    lo = np.searchsorted(edges.keys, keys[boundary], "left")
+    hi = np.searchsorted(edges.keys, keys[boundary], "right")
+    manifold = hi - lo == 2
+    # The neighbour is whichever of the edge's two triangles is not in the region
+    first = np.where(manifold, lo, 0)
+    neighbour = np.where(mine[edges.tri[first]], first + 1, first)
+    points = tris[members]
+    segments = np.stack([points, np.roll(points, -1, axis=1)], axis=2).reshape(-1, 2, 3)[boundary]
+    held = manifold & (edges.opposite_z[neighbour] < segments[:, :, 2].mean(axis=1) - BED_TOLERANCE)
+    return segments[held][:, :, :2]
+
+
+def _span(tris, supports, spacing=0.5, max_points=20_000):
+    """Twice the farthest distance from any point of a flat region to a support.
+
+    That is the bridge length for a strip held at both ends, and a cautious
+    figure for a ledge held on one side only; inf if nothing holds it up.
+    """
+    if not len(supports):
+        return float("inf")
+    xy = tris[:, :, :2]
+    lo, hi = xy.reshape(-1, 2).min(axis=0), xy.reshape(-1, 2).max(axis=0)
+    spacing = max(spacing, np.sqrt(np.prod(hi - lo + spacing) / max_points))
+    gx, gy = np.meshgrid(np.arange(lo[0], hi[0] + spacing, spacing), np.arange(lo[1], hi[1] + spacing, spacing))
+    grid = np.stack([gx.ravel(), gy.ravel()], axis=1)
+    # Keep the grid points inside any of the region's triangles (barycentric test)
+    v0, v1, v2 = xy[:, 0], xy[:, 1], xy[:, 2]
+    d = (v1[:, 1] - v2[:, 1]) * (v0[:, 0] - v2[:, 0]) + (v2[:, 0] - v1[:, 0]) * (v0[:, 1] - v2[:, 1])
+    rel = grid[:, None, :] - v2[None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        l1 = ((v1[:, 1] - v2[:, 1]) * rel[..., 0] + (v2[:, 0] - v1[:, 0]) * rel[..., 1]) / d
+        l2 = ((v2[:, 1] - v0[:, 1]) * rel[..., 0] + (v0[:, 0] - v2[:, 0]) * rel[..., 1]) / d
+    inside = ((l1 >= -1e-9) & (l2 >= -1e-9) & (l1 + l2 <= 1 + 1e-9)).any(axis=1)
+    points = np.concatenate([grid[inside], xy.reshape(-1, 2)])
+    # Distance from every point to every supporting segment
+    s0, s1 = supports[:, 0], supports[:, 1]
+    seg = s1 - s0
+    length2 = np.maximum((seg ** 2).sum(axis=1), 1e-12)
+    t = np.clip(((points[:, None, :] - s0) * seg).sum(axis=2) / length2, 0.0, 1.0)
+    nearest = s0 + t[..., None] * seg
+    dist = np.linalg.norm(points[:, None, :] - nearest, axis=2).min(axis=1)
+    return float(2 * dist.max())
+
+
+def analyse(tris, labels=None, limit=OVERHANG_LIMIT, max_bridge=10.0):
+    """Classify print-frame triangles.
+
+    Returns {"overhang_area", "support_area" (mm²), "bridges": [{"features",
+    "span", "area", "z", "needs_support"}]}, where a bridge needs support when
+    its span exceeds max_bridge. `labels` maps feature names to print-frame
+    (lo, hi) boxes.
+    """
+    cross = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    double_area = np.linalg.norm(cross, axis=1)
+    valid = double_area > 0
+    nz = np.zeros(len(tris))
+    nz[valid] = cross[valid, 2] / double_area[valid]
+    area = double_area / 2
+    # Lean of a down-facing face from vertical: 0 = wall, 90 = ceiling
+    lean = np.degrees(np.arcsin(np.clip(-nz, -1.0, 1.0)))
+    on_bed = tris[:, :, 2].max(axis=1) < tris[:, :, 2].min() + BED_TOLERANCE
+    overhang = valid & ~on_bed & (lean > limit)
+    flat = overhang & (lean > 90.0 - FLAT)
+
+    bridges = []
+    support = area[overhang & ~flat].sum()
+    flat_ids = np.flatnonzero(flat)
+    if flat_ids.size:
+        ids = _weld(tris)
+        edges = _Edges(tris, ids)
+        region = _regions(ids[flat_ids])
+        for r in np.unique(region):
+            members = flat_ids[region == r]
+            span = _span(tris[members], _supports(tris, ids, members, edges))
+            centres = tris[members].mean(axis=1)
+            touched = [name for name, (f_lo, f_hi) in (labels or {}).items()
+                       if np.any(np.all((centres >= f_lo) & (centres <= f_hi), axis=1))]
+            bridge_area = float(area[members].sum())
+            needs_support = span > max_bridge
+            if needs_support:
+                support += bridge_area
+            bridges.append({"features": touched, "span": span, "area": bridge_area,
+                            "z": float(tris[members, :, 2].min()), "needs_support": needs_support})
+    bridges.sort(key=lambda b: -b["span"])
+    return {"overhang_area": float(area[overhang].sum()), "support_area": float(support), "bridges": bridges}
+
+
+def analyse_part(name, p, tris, limit=OVERHANG_LIMIT, profile=None):
+    """analyse() for a part's own-frame triangles, in its print orientation."""
+    profile = profile or load_profile()
+    labels = {}
+    for label, (lo, hi) in features(p).get(name, {}).items():
+        corners = to_print_frame(name, p, np.array([lo, hi]))
+        labels[label] = (corners.min(axis=0), corners.max(axis=0))
+    return analyse(to_print_frame(name, p, tris), labels, limit, profile["max_bridge_length"])
+
+
+def analyse_stls(p, out_dir, limit=OVERHANG_LIMIT):
+    """{part: analyse_part()} for the base and shell STLs written to out_dir."""
+    profile = load_profile()
+    result = {}
+    for name in ("base", "shell"):
+        path = case3b.output_paths(name, out_dir, ("stl",))[0]
+        result[name] = analyse_part(name, p, stl_mesh.triangles(stl_mesh.read_stl(path)), limit, profile)
+    return result
+
+
+def unsupported(report):
+    """[(part, bridge)] for every bridge that needs support."""
+    return [(name, b) for name, r in report.items() for b in r["bridges"] if b["needs_support"]]
+
+
+def print_report(report, min_span=2.0):
+    for name, r in report.items():
+        print(f"  {name:<6} overhangs {r['overhang_area'] / 100:7.1f} cm², needs support {r['support_area'] / 100:7.1f} cm²")
+        for b in r["bridges"]:
+            if b["span"] < min_span:
+                continue
+            mark = "❌ needs support" if b["needs_support"] else "ok"
+            where = ", ".join(b["features"]) or "-"
+            print(f"         bridge {b['span']:6.1f} mm span, {b['area']:7.1f} mm² at Z={b['z']:6.1f}  {where:<28} {mark}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--preset", default=None, choices=list(case3b.PRESETS), help="parameters to analyse (default: the defaults)")
+    parser.add_argument("--limit", type=float, default=OVERHANG_LIMIT, help="overhang limit in degrees from vertical (default: %(default)s)")
+    parser.add_argument("--stl", default=None, metavar="DIR", help="analyse the STLs in DIR instead of building")
+    args = parser.parse_args(argv)
+
+    p = case3b.CaseParams(**case3b.PRESETS[args.preset]) if args.preset else case3b.DEFAULT_PARAMS
+    if args.stl:
+        report = analyse_stls(p, args.stl, args.limit)
+    else:
+        parts = case3b.build_parts(p, ("base", "shell"))
+        report = {name: analyse_part(name, p, part_triangles(part), args.limit) for name, part in parts.items()}
+    print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
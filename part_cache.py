@@ -0,0 +1,131 @@
+"""Content-addressed on-disk cache of built parts.
+
+Each part is stored as a native BRep file named after a hash of exactly the
+parameters it depends on (case3b.PART_PARAMS) plus the source of its build
+function and the helpers it lists (depgraph.builder_source). Changing the
+washer or a base-only switch therefore leaves the cached shell valid, and an
+unchanged part loads in milliseconds instead of being rebuilt.
+
+The cache directory is capped in size; the least recently used entries are
+evicted first. Parts loaded or stored in this process are also kept in
+memory, so every get() of a key returns the same Part and the mesh cached
+for it (see meshes.py) is reused.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+from build123d import Part, export_brep, import_brep
+
+from depgraph import builder_source
+
+DEFAULT_DIR = os.environ.get(
+    "CASE3B_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".part_cache")
+)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Bump to invalidate every entry, e.g. after a build123d/OCC upgrade.
+CACHE_VERSION = 1
+
+
+def part_key(name, builder, params, deps):
+    """Hash of a part's name, builder source and the values of its parameters."""
+    payload = {
+        "version": CACHE_VERSION,
+        "part": name,
+        "builder": builder_source(builder),
+        "params": {dep: getattr(params, dep) for dep in sorted(deps)},
+    }
+    blob = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+class PartCache:
+    def __init__(self, root=DEFAULT_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._loaded = {}   # key -> Part
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.brep")
+
+    def get(self, key):
+        """Return the cached Part for `key`, or None."""
+        path = self._path(key)
+        if not os.path.exists(path):
+            self._loaded.pop(key, None)   # evicted or cleared on disk
+            return None
+        if key not in self._loaded:
+            try:
+                shape = import_brep(path)
+            except ValueError:  # corrupt or written by another OCC version
+                return None
+            self._loaded[key] = Part(shape.wrapped)
+        try:
+            os.utime(path)  # mark as recently used for LRU eviction
+        except OSError:  # evicted by another process since the check
+            self._loaded.pop(key, None)
+            return None
+        return self._loaded[key]
+
+    def put(self, key, part):
+        os.makedirs(self.root, exist_ok=True)
+        # Write then rename so concurrent batch workers never see partial files
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.root)
+        os.close(fd)
+        try:
+            export_brep(part, tmp)
+            os.replace(tmp, self._path(key))
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self._loaded[key] = part
+        self.evict()
+
+    def get_or_build(self, name, builder, params, deps):
+        key = part_key(name, builder, params, deps)
+        part = self.get(key)
+        if part is not None:
+            self.hits += 1
+            return part
+        self.misses += 1
+        part = builder(params)
+        self.put(key, part)
+        return part
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes."""
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return
+        entries = []
+        for entry in names:
+            if not entry.endswith(".brep"):
+                continue
+            path = os.path.join(self.root, entry)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue  # evicted by another process
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        self._loaded.clear()
+        if os.path.isdir(self.root):
+            for entry in os.listdir(self.root):
+                if entry.endswith(".brep"):
+                    os.remove(os.path.join(self.root, entry))
@@ -0,0 +1,143 @@
+"""One 3MF print project: base, shell and washers with the Orca profile embedded.
+
+The parts don't share a bed (each is 164 x 161 mm on a 256 mm plate), so the
+project has two OrcaSlicer plates: the base with the washers beside it, and
+the shell turned roof-down. Every part is stored as one mesh object; the
+washers are N build items of the same object, so the file carries a single
+washer mesh. The meshes are the parts' export meshes from meshes.py, in their
+own frames; placement and the shell's turn are item transforms. The process
+profile goes in as Metadata/project_settings.config and the plates as
+Metadata/model_settings.config, the files OrcaSlicer reads back from its own
+projects. The archive is ZIP_DEFLATED with fixed timestamps, so an unchanged
+variant writes a byte-identical file.
+
+    python plate_3mf.py                                  # pid_case_plate.3mf, 4 washers
+    python plate_3mf.py --preset hybrid --washers 8 --out build
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+
+import case3b
+import meshes
+from print_profile import load_profile, read_profile
+
+FILENAME = "pid_case_plate.3mf"
+BED = (256.0, 256.0)       # mm; Bambu P1S (the printer isn't part of the process profile)
+PLATE_STRIDE = 1.2         # OrcaSlicer lays plates out one bed plus a fifth apart in X
+GAP = 2.0                  # mm between brims
+APPLICATION = "OrcaSlicer-02.00.00.00"   # Orca only reads its Metadata/ files from its own projects
+
+
+def transform(rotation=np.eye(3), offset=(0.0, 0.0, 0.0)):
+    """3MF transform attribute: the 3x3 rotation (applied to column vectors) then the offset."""
+    return " ".join(f"{v:.6g}" for v in [*np.asarray(rotation).T.ravel(), *offset])
+
+
+# The shell prints roof-down: a half turn about X (see overhangs.to_print_frame)
+ROOF_DOWN = np.diag([1.0, -1.0, -1.0])
+
+
+def washer_slots(p, count, base_half_w, profile):
+    """Washer centres (x, y) beside the base, right-hand column first, on a BED plate."""
+    reach = profile["brim_width"] + p.WASHER_OD / 2 + GAP
+    edge = BED[0] / 2 - reach                      # column centre, from the bed centre
+    if edge - reach < base_half_w + profile["brim_width"]:
+        raise ValueError("no room beside the base for washers")
+    pitch = 2 * reach
+    per_column = int(BED[1] // pitch)
+    if count > 2 * per_column:
+        raise ValueError(f"at most {2 * per_column} washers fit beside the base, asked for {count}")
+    slots = []
+    for side in (1, -1):
+        n = min(count - len(slots), per_column)
+        ys = (np.arange(n) - (n - 1) / 2) * pitch
+        slots += [(side * edge, float(y)) for y in ys]
+    return slots
+
+
+def _model_settings(objects, plates):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', "<config>"]
+    for object_id, name in objects:
+        lines += [f' <object id="{object_id}">',
+                  f'  <metadata key="name" value={quoteattr(name)}/>',
+                  '  <metadata key="extruder" value="1"/>',
+                  f'  <part id="1" subtype="normal_part"><metadata key="name" value={quoteattr(name)}/></part>',
+                  " </object>"]
+    for plate_id, instances in enumerate(plates, 1):
+        lines += [" <plate>", f'  <metadata key="plater_id" value="{plate_id}"/>', '  <metadata key="locked" value="false"/>']
+        for object_id, instance_id in instances:
+            lines += ["  <model_instance>",
+                      f'   <metadata key="object_id" value="{object_id}"/>',
+                      f'   <metadata key="instance_id" value="{instance_id}"/>',
+                      "  </model_instance>"]
+        lines.append(" </plate>")
+    lines.append("</config>")
+    return "\n".join(lines) + "\n"
+
+
+def write_plate(parts, p, path, washers=4):
+    """Write the 3MF project for parts ({"base", "shell", "washer": Part}) to path."""
+    mesh = {name: meshes.export_mesh(parts[name]) for name in ("base", "shell", "washer")}
+    ids = {name: i for i, name in enumerate(mesh, 1)}
+
+    # Plate 1 (the origin plate): base centred, washers beside it; plate 2 to its right: the shell
+    centre = np.array([BED[0] / 2, BED[1] / 2, 0.0])
+    base_half_w = float(np.abs(mesh["base"].vertices[:, 0]).max())
+    items = [(ids["base"], transform(offset=centre))]
+    plates = [[(ids["base"], 0)]]
+    for i, (x, y) in enumerate(washer_slots(p, washers, base_half_w, load_profile())):
+        items.append((ids["washer"], transform(offset=centre + (x, y, 0.0))))
+        plates[0].append((ids["washer"], i))
+    shell_top = float(mesh["shell"].vertices[:, 2].max())
+    items.append((ids["shell"], transform(ROOF_DOWN, centre + (PLATE_STRIDE * BED[0], 0.0, shell_top))))
+    plates.append([(ids["shell"], 0)])
+
+    model = io.StringIO()
+    model.write(meshes.MODEL_HEADER +
+                f' <metadata name="Application">{APPLICATION}</metadata>\n'
+                f' <metadata name="Title">PID case {"".join("1" if getattr(p, s) else "0" for s in case3b.SWITCHES)}</metadata>\n'
+                "<resources>\n")
+    for name, m in mesh.items():
+        model.write(meshes.object_xml(ids[name], case3b.FILENAMES[name], m))
+    model.write("</resources>\n<build>\n")
+    for object_id, matrix in items:
+        model.write(f' <item objectid="{object_id}" transform="{matrix}" printable="1"/>\n')
+    model.write("</build>\n</model>\n")
+
+    files = {
+        "[Content_Types].xml": meshes.CONTENT_TYPES,
+        "_rels/.rels": meshes.RELS,
+        "3D/3dmodel.model": model.getvalue(),
+        "Metadata/project_settings.config": json.dumps(read_profile(), indent=4) + "\n",
+        "Metadata/model_settings.config": _model_settings([(ids[n], case3b.FILENAMES[n]) for n in mesh], plates),
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    meshes.write_zip(path, files)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--preset", default=None, choices=list(case3b.PRESETS), help="parameters to build (default: the defaults)")
+    parser.add_argument("--washers", type=int, default=4, help="washers on the base plate (default: %(default)s)")
+    parser.add_argument("--out", default=".", help="output directory (default: current directory)")
+    args = parser.parse_args(argv)
+
+    p = case3b.CaseParams(**case3b.PRESETS[args.preset]) if args.preset else case3b.DEFAULT_PARAMS
+    path = write_plate(case3b.build_parts(p), p, os.path.join(args.out, FILENAME), args.washers)
+    stls = [path for name in case3b.BUILDERS for path in case3b.output_paths(name, args.out, ("stl",)) if os.path.exists(path)]
+    size = os.path.getsize(path)
+    note = f" (the STLs in {args.out}: {sum(map(os.path.getsize, stls)) / 1e6:.1f} MB)" if stls else ""
+    print(f"✅ {path}: {size / 1e6:.2f} MB, base + {args.washers} washers on plate 1, shell roof-down on plate 2{note}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""Compact GLB preview of a variant for the browser: quantized meshes, viewer colours.
+
+The base and the shell are placed as assembled (shell at Z=BASE_THICKNESS),
+with the washer beside them and, optionally, the component ghosts in place.
+Meshes come from meshes.py at draft quality. They are stored with
+KHR_mesh_quantization:
+  * positions as 16-bit integers on a uniform grid over each mesh's extent,
+    with the node's translation and scale turning them back into mm
+  * normals as normalized 8-bit vectors
+  * indices as 16-bit where the mesh allows
+Colours are case3b.VIEW_STYLES, as show_parts() sends them to OCP CAD
+Viewer; translucent parts are alpha-blended. The scene is turned Z-up to
+glTF's Y-up at the root, and the whole file is a single GLB with no
+external buffers.
+
+    python preview_glb.py                       # pid_case_preview.glb
+    python preview_glb.py --preset hybrid --ghosts --out previews
+"""
+
+import argparse
+import json
+import math
+import os
+import struct
+import sys
+
+import numpy as np
+
+import case3b
+import meshes
+
+FILENAME = "pid_case_preview.glb"
+QUALITY = "draft"
+WASHER_OFFSET = 20.0      # mm beside the case, as in show_parts()
+Z_UP_TO_Y_UP = [-math.sqrt(0.5), 0.0, 0.0, math.sqrt(0.5)]   # quaternion, -90° about X
+
+# glTF constants
+ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER = 34962, 34963
+BYTE, UNSIGNED_SHORT, UNSIGNED_INT = 5120, 5123, 5125
+GLB_MAGIC, JSON_CHUNK, BIN_CHUNK = 0x46546C67, 0x4E4F534A, 0x004E4942
+
+
+def vertex_normals(m):
+    """(V, 3) unit normals, area-weighted over each vertex's triangles (vertices are per face)."""
+    tris = m.triangles
+    face = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    normals = np.zeros_like(m.vertices)
+    for corner in range(3):
+        np.add.at(normals, m.indices[:, corner], face)
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    return np.divide(normals, length, out=np.zeros_like(normals), where=length > 0)
+
+
+def srgb_to_linear(c):
+    """glTF colour factors are linear; the viewer's colours are sRGB."""
+    c = np.asarray(c, dtype=float)
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+
+def quantize(m):
+    """(positions uint16 (V, 4), origin, step, normals int8 (V, 4)) with one uniform step per mesh."""
+    lo, hi = m.vertices.min(axis=0), m.vertices.max(axis=0)
+    step = max(float((hi - lo).max()) / 65535, 1e-9)   # uniform, so normals need no correction
+    positions = np.zeros((len(m.vertices), 4), np.uint16)   # 4th column pads to the 8-byte stride
+    positions[:, :3] = np.round((m.vertices - lo) / step)
+    normals = np.zeros((len(m.vertices), 4), np.int8)
+    normals[:, :3] = np.round(vertex_normals(m) * 127)
+    return positions, lo, step, normals
+
+
+class _Builder:
+    """Accumulates glTF JSON and the binary buffer."""
+
+    def __init__(self):
+        self.gltf = {
+            "asset": {"version": "2.0", "generator": "case3b preview_glb.py"},
+            "extensionsUsed": ["KHR_mesh_quantization"],
+            "extensionsRequired": ["KHR_mesh_quantization"],
+            "scenes": [{"nodes": [0]}],
+            "scene": 0,
+            "nodes": [{"name": "case", "rotation": Z_UP_TO_Y_UP, "children": []}],
+            "meshes": [], "materials": [], "accessors": [], "bufferViews": [],
+        }
+        self.data = bytearray()
+
+    def view(self, array, target, stride=None):
+        self.data += b"\0" * (-len(self.data) % 4)
+        view = {"buffer": 0, "byteOffset": len(self.data), "byteLength": array.nbytes, "target": target}
+        if stride:
+            view["byteStride"] = stride
+        self.data += array.tobytes()
+        self.gltf["bufferViews"].append(view)
+        return len(self.gltf["bufferViews"]) - 1
+
+    def accessor(self, **fields):
+        self.gltf["accessors"].append(fields)
+        return len(self.gltf["accessors"]) - 1
+
+    def material(self, name, color, alpha):
+        material = {"name": name, "doubleSided": alpha < 1,
+                    "pbrMetallicRoughness": {"baseColorFactor": [*srgb_to_linear(color).tolist(), alpha],
+                                             "metallicFactor": 0.0, "roughnessFactor": 0.8}}
+        if alpha < 1:
+            material["alphaMode"] = "BLEND"
+        self.gltf["materials"].append(material)
+        return len(self.gltf["materials"]) - 1
+
+    def mesh(self, name, m, material):
+        """Add a mesh; returns (mesh index, origin, step) for the nodes that use it."""
+        positions, lo, step, normals = quantize(m)
+        index_type = (np.uint16, UNSIGNED_SHORT) if len(m.vertices) <= 65535 else (np.uint32, UNSIGNED_INT)
+        indices = m.indices.astype(index_type[0]).ravel()
+        count = len(m.vertices)
+        attributes = {
+            "POSITION": self.accessor(bufferView=self.view(positions, ARRAY_BUFFER, 8), componentType=UNSIGNED_SHORT,
+                                      count=count, type="VEC3", min=positions[:, :3].min(axis=0).tolist(),
+                                      max=positions[:, :3].max(axis=0).tolist()),
+            "NORMAL": self.accessor(bufferView=self.view(normals, ARRAY_BUFFER, 4), componentType=BYTE,
+                                    normalized=True, count=count, type="VEC3"),
+        }
+        primitive = {"attributes": attributes, "material": material,
+                     "indices": self.accessor(bufferView=self.view(indices, ELEMENT_ARRAY_BUFFER),
+                                              componentType=index_type[1], count=len(indices), type="SCALAR")}
+        self.gltf["meshes"].append({"name": name, "primitives": [primitive]})
+        return len(self.gltf["meshes"]) - 1, lo, step
+
+    def node(self, name, mesh, offset=(0.0, 0.0, 0.0)):
+        index, lo, step = mesh
+        self.gltf["nodes"].append({"name": name, "mesh": index,
+                                   "translation": (lo + offset).tolist(), "scale": [step] * 3})
+        self.gltf["nodes"][0]["children"].append(len(self.gltf["nodes"]) - 1)
+
+    def glb(self):
+        self.data += b"\0" * (-len(self.data) % 4)
+        self.gltf["buffers"] = [{"byteLength": len(self.data)}]
+        text = json.dumps(self.gltf, separators=(",", ":")).encode("utf-8")
+        text += b" " * (-len(text) % 4)
+        total = 12 + 8 + len(text) + 8 + len(self.data)
+        return (struct.pack("<III", GLB_MAGIC, 2, total)
+                + struct.pack("<II", len(text), JSON_CHUNK) + text
+                + struct.pack("<II", len(self.data), BIN_CHUNK) + bytes(self.data))
+
+
+def scene(parts, p, with_ghosts=False):
+    """{name: (Part, offset)} in the assembled frame, as the preview shows them."""
+    shown = {
+        "base": (parts.get("base"), (0.0, 0.0, 0.0)),
+        "shell": (parts.get("shell"), (0.0, 0.0, p.BASE_THICKNESS)),
+        "washer": (parts.get("washer"), (p.BOX_W / 2 + WASHER_OFFSET, 0.0, 0.0)),
+    }
+    if with_ghosts:
+        for name, ghost in case3b.ghosts(p).items():
+            shown[name] = (ghost, (0.0, 0.0, p.BASE_THICKNESS if case3b.GHOST_FRAMES[name] == "shell" else 0.0))
+    return {name: (part, np.array(offset)) for name, (part, offset) in shown.items() if part is not None}
+
+
+def write_preview(parts, p, path, with_ghosts=False, quality=QUALITY):
+    """Write the GLB preview of parts ({name: Part}) to path."""
+    builder = _Builder()
+    for name, (part, offset) in scene(parts, p, with_ghosts).items():
+        label, color, alpha = case3b.VIEW_STYLES[name]
+        mesh = builder.mesh(label, meshes.export_mesh(part, quality), builder.material(label, color, alpha))
+        builder.node(label, mesh, offset)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(builder.glb())
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--preset", default=None, choices=list(case3b.PRESETS), help="parameters to build (default: the defaults)")
+    parser.add_argument("--ghosts", action="store_true", help="include the PID, SSR, terminal block and C14 ghosts")
+    parser.add_argument("--quality", choices=list(meshes.QUALITY), default=QUALITY, help="mesh quality (default: %(default)s)")
+    parser.add_argument("--out", default=".", help="output directory (default: current directory)")
+    args = parser.parse_args(argv)
+
+    p = case3b.CaseParams(**case3b.PRESETS[args.preset]) if args.preset else case3b.DEFAULT_PARAMS
+    path = write_preview(case3b.build_parts(p), p, os.path.join(args.out, FILENAME), args.ghosts, args.quality)
+    stls = [path for name in case3b.BUILDERS for path in case3b.output_paths(name, args.out, ("stl",)) if os.path.exists(path)]
+    note = f" (the STLs in {args.out}: {sum(map(os.path.getsize, stls)) / 1e3:.0f} KB)" if stls else ""
+    print(f"✅ {path}: {os.path.getsize(path) / 1e3:.0f} KB{note}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
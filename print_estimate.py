@@ -0,0 +1,191 @@
+"""Print time and filament estimate from the Orca profile, without a slicer.
+
+Each part is sliced with slicer.py (per-layer area, perimeter and islands)
+and its mesh is split into up-facing, down-facing and bridge area. The
+profile's settings turn those into extrusion path lengths per feature type:
+
+  * walls: wall_loops lines along every layer's perimeter (the outer one at
+    outer_wall_speed), as far as the cross-section has room for them
+  * solid infill: top_shell_layers under every up-facing surface and
+    bottom_shell_layers over every down-facing one (the last top layer at
+    top_surface_speed, bridges at bridge_speed)
+  * sparse infill: the rest of the volume at sparse_infill_density
+  * the first layer at the initial layer speeds, plus the brim and skirt
+
+Every move is timed with a trapezoidal speed profile at the profile's
+accelerations. Travel, layer changes and the filament's minimum layer time
+are the only calibration constants.
+
+    python print_estimate.py                      # default parameters
+    python print_estimate.py --preset hybrid --washers 4
+    python print_estimate.py --stl variants/101111
+"""
+
+import argparse
+import math
+import sys
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import case3b
+import stl_mesh
+from overhangs import analyse as analyse_overhangs, part_triangles, to_print_frame
+from print_profile import load_profile
+from slicer import slice_mesh
+
+FILAMENT_DIAMETER = 1.75   # mm
+FILAMENT_DENSITY = 1.04    # g/cm³ (ABS)
+MIN_LAYER_TIME = 4.0       # s; filament profile slowdown for layer cooling
+TRAVEL_RATIO = 0.1         # mm of travel per mm extruded (calibrated guess)
+LAYER_CHANGE = 0.3         # s per layer (Z move, retract, seam)
+PARTS = ("base", "shell", "washer")
+
+
+@dataclass
+class Estimate:
+    """Print time and filament for one part."""
+    seconds: float
+    grams: float
+    filament_m: float
+    breakdown: dict = field(default_factory=dict)   # {move type: seconds}
+
+    def __str__(self):
+        h, m = divmod(round(self.seconds / 60), 60)
+        return f"{h}h{m:02d}m, {self.grams:.1f} g ({self.filament_m:.2f} m)"
+
+    def times(self, count):
+        """The estimate for `count` copies printed one after another."""
+        return Estimate(self.seconds * count, self.grams * count, self.filament_m * count,
+                        {move: seconds * count for move, seconds in self.breakdown.items()})
+
+
+def move_time(length, segment, speed, accel):
+    """Seconds to extrude `length` mm in segments of `segment` mm, each
+    accelerating from rest to `speed` and back (trapezoid or triangle)."""
+    if length <= 0:
+        return 0.0
+    segment = max(min(segment, length), 1e-3)
+    ramp = speed * speed / accel           # distance to reach speed and stop again
+    if segment >= ramp:
+        per_segment = segment / speed + speed / accel
+    else:
+        per_segment = 2 * math.sqrt(segment / accel)
+    return float(length / segment * per_segment)
+
+
+def estimate_mesh(tris, profile=None):
+    """Estimate for print-frame triangles (N, 3, 3)."""
+    profile = profile or load_profile()
+    lw = profile["line_width"]
+    h = profile["layer_height"]
+    loops = profile["wall_loops"]
+    s = slice_mesh(tris, h, profile["initial_layer_height"])
+
+    # Walls: as many loops along each layer's perimeter as its area has room for
+    wall_length = np.minimum(s.perimeter * loops, np.maximum(s.area, 0.0) / lw)
+    outer = np.minimum(s.perimeter, wall_length)
+    inner = wall_length - outer
+    wall_volume = float(np.sum(wall_length * lw * s.thickness))
+
+    # Solid shells over/under horizontal surfaces, capped by the room left inside the walls
+    cross = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    area = np.linalg.norm(cross, axis=1) / 2
+    nz = np.divide(cross[:, 2], 2 * area, out=np.zeros(len(tris)), where=area > 0)
+    on_bed = tris[:, :, 2].max(axis=1) < tris[:, :, 2].min() + 1e-3
+    top_area = float(area[nz > 0.7].sum())
+    bottom_area = float(area[(nz < -0.7) & ~on_bed].sum()) + float(s.area[0])
+    bridge_area = sum(b["area"] for b in analyse_overhangs(tris, max_bridge=profile["max_bridge_length"])["bridges"])
+    infill_volume = max(s.volume - wall_volume, 0.0)
+    solid_volume = min((top_area * profile["top_shell_layers"] + bottom_area * profile["bottom_shell_layers"]) * h, infill_volume)
+    sparse_volume = infill_volume - solid_volume
+
+    density = profile["sparse_infill_density"]
+    first_infill = max(s.area[0] - wall_length[0] * lw, 0.0) / lw
+    top_length = top_area / lw
+    bridge_length = bridge_area / lw
+    solid_length = max(solid_volume / (lw * h) - top_length - bridge_length - first_infill, 0.0)
+    sparse_length = sparse_volume * density / (lw * h)
+
+    # Brim and skirt around the first layer's outline
+    lo, hi = tris.reshape(-1, 3).min(axis=0), tris.reshape(-1, 3).max(axis=0)
+    outline = 2 * float(hi[0] - lo[0] + hi[1] - lo[1])
+    brim_loops = int(profile["brim_width"] / lw)
+    brim_length = brim_loops * outline + math.pi * lw * brim_loops ** 2
+    skirt_length = profile["skirt_loops"] * (outline + 2 * math.pi * (profile["brim_width"] + profile["skirt_distance"]))
+
+    # Typical segment lengths: a wall loop per island, infill lines across the section
+    wall_segment = float(np.mean(s.perimeter / np.maximum(s.islands, 1)))
+    infill_segment = float(np.sqrt(np.mean(s.area)))
+    first_segment = float(s.perimeter[0] / max(s.islands[0], 1))
+    moves = {
+        "first_layer": move_time(wall_length[0] + brim_length + skirt_length, first_segment,
+                                 profile["initial_layer_speed"], profile["initial_layer_acceleration"])
+                       + move_time(first_infill, infill_segment, profile["initial_layer_infill_speed"], profile["initial_layer_acceleration"]),
+        "outer_wall": move_time(outer[1:].sum(), wall_segment, profile["outer_wall_speed"], profile["outer_wall_acceleration"]),
+        "inner_wall": move_time(inner[1:].sum(), wall_segment, profile["inner_wall_speed"], profile["default_acceleration"]),
+        "sparse_infill": move_time(sparse_length, infill_segment, profile["sparse_infill_speed"], profile["default_acceleration"]),
+        "solid_infill": move_time(solid_length, infill_segment, profile["internal_solid_infill_speed"], profile["default_acceleration"]),
+        "top_surface": move_time(top_length, infill_segment, profile["top_surface_speed"], profile["top_surface_acceleration"]),
+        "bridge": move_time(bridge_length, infill_segment, profile["bridge_speed"], profile["default_acceleration"]),
+    }
+    extruded = wall_length.sum() + sparse_length + solid_length + top_length + bridge_length + first_infill
+    moves["travel"] = move_time(TRAVEL_RATIO * extruded, infill_segment, profile["travel_speed"], profile["travel_acceleration"])
+    moves["layer_change"] = LAYER_CHANGE * len(s.z)
+    # Layers quicker than the minimum layer time are slowed down to it
+    busy = sum(moves.values())
+    layer_time = busy * s.area * s.thickness / max(s.volume, 1e-9)
+    moves["cooling"] = float(np.sum(np.maximum(MIN_LAYER_TIME - layer_time, 0.0)))
+
+    volume = (wall_volume + solid_volume + sparse_volume * density
+              + (brim_length + skirt_length) * lw * profile["initial_layer_height"]
+              + bridge_area * h * (profile["bridge_flow"] - 1))
+    filament_area = math.pi * (FILAMENT_DIAMETER / 2) ** 2
+    return Estimate(sum(moves.values()), volume * FILAMENT_DENSITY / 1e3, volume / filament_area / 1e3, moves)
+
+
+def estimate_part(name, p, tris, profile=None):
+    """estimate_mesh() for a part's own-frame triangles, in its print orientation."""
+    return estimate_mesh(to_print_frame(name, p, tris), profile)
+
+
+def estimate_stls(p, out_dir, names=PARTS, profile=None):
+    """{part: Estimate} from the STLs written to out_dir."""
+    profile = profile or load_profile()
+    return {name: estimate_part(name, p, stl_mesh.triangles(stl_mesh.read_stl(case3b.output_paths(name, out_dir, ("stl",))[0])), profile)
+            for name in names}
+
+
+def print_report(estimates, washers=1):
+    total_s = total_g = 0.0
+    for name, e in estimates.items():
+        count = washers if name == "washer" else 1
+        e = e.times(count)
+        total_s += e.seconds
+        total_g += e.grams
+        slowest = sorted(e.breakdown.items(), key=lambda kv: -kv[1])[:3]
+        print(f"  {name:<6}{f' x{count}' if count > 1 else '':<4} {e}   "
+              + ", ".join(f"{move} {seconds / 60:.0f}m" for move, seconds in slowest))
+    h, m = divmod(round(total_s / 60), 60)
+    print(f"  total       {h}h{m:02d}m, {total_g:.1f} g")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--preset", default=None, choices=list(case3b.PRESETS), help="parameters to estimate (default: the defaults)")
+    parser.add_argument("--stl", default=None, metavar="DIR", help="estimate from the STLs in DIR instead of building")
+    parser.add_argument("--washers", type=int, default=4, help="washers per case in the total (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    p = case3b.CaseParams(**case3b.PRESETS[args.preset]) if args.preset else case3b.DEFAULT_PARAMS
+    if args.stl:
+        estimates = estimate_stls(p, args.stl)
+    else:
+        parts = case3b.build_parts(p, PARTS)
+        estimates = {name: estimate_part(name, p, part_triangles(part)) for name, part in parts.items()}
+    print_report(estimates, args.washers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
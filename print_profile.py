@@ -0,0 +1,36 @@
+"""The OrcaSlicer process profile shipped with the case, as numbers.
+
+OrcaSlicer stores every setting as a string ("0.2", "30%", "4"); load_profile()
+converts the numeric ones so the print analyses can use them directly.
+
+    from print_profile import load_profile
+    profile = load_profile()
+    profile["layer_height"], profile["sparse_infill_density"]   # 0.2, 0.3
+"""
+
+import json
+import os
+
+PROFILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "OrcaSlicer_PID_Case_Print_Profile.json")
+
+
+def read_profile(path=PROFILE):
+    """The profile exactly as OrcaSlicer wrote it (all values strings)."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _number(value):
+    if not isinstance(value, str):
+        return value
+    try:
+        if value.endswith("%"):
+            return float(value[:-1]) / 100
+        return int(value) if value.lstrip("-").isdigit() else float(value)
+    except ValueError:
+        return value
+
+
+def load_profile(path=PROFILE):
+    """{setting: value} with numbers parsed ("30%" becomes 0.3); other values unchanged."""
+    return {key: _number(value) for key, value in read_profile(path).items()}
@@ -0,0 +1,109 @@
+"""2.5D profile compiler: build a part from vertical prisms.
+
+A Prism is a set of 2D faces on the XY plane swept between two heights,
+either added or subtracted. compile_prisms() splits the Z axis at every prism
+end and works out the 2D cross-section of each slab with planar booleans,
+applying the prisms in order so later prisms win exactly as they do in a
+BuildPart. Slabs with the same cross-section are merged and each is extruded
+once, so the part needs one 3D fuse instead of one 3D boolean per feature.
+"""
+
+from dataclasses import dataclass
+
+from build123d import Part, Plane, extrude
+
+
+@dataclass(frozen=True)
+class Prism:
+    faces: tuple             # Faces on Plane.XY; need not be fused together
+    z0: float
+    z1: float
+    subtract: bool = False
+    name: str = ""
+
+
+def _bounds(face):
+    box = face.bounding_box()
+    return box.min.X, box.min.Y, box.max.X, box.max.Y
+
+
+def _overlaps(prism, others):
+    """Whether any face of prism has an XY bounding box meeting one of `others`'."""
+    boxes = [_bounds(face) for other in others for face in other.faces]
+    for x0, y0, x1, y1 in map(_bounds, prism.faces):
+        if any(x0 < ox1 and ox0 < x1 and y0 < oy1 and oy0 < y1 for ox0, oy0, ox1, oy1 in boxes):
+            return True
+    return False
+
+
+def _active(prisms, lo, hi):
+    """Indices of the prisms that shape the slab lo..hi.
+
+    Subtracted prisms that miss everything added below them in the list are
+    dropped, so e.g. a hole running past the top of the plate doesn't split
+    the plate into extra slabs.
+    """
+    spanning = [i for i, prism in enumerate(prisms) if prism.z0 <= lo and prism.z1 >= hi]
+    return tuple(
+        i for i in spanning
+        if not prisms[i].subtract
+        or _overlaps(prisms[i], [prisms[j] for j in spanning if j < i and not prisms[j].subtract])
+    )
+
+
+def _section(prisms):
+    """Cross-section of the prisms applied in order, or None if it is empty.
+
+    Consecutive prisms of the same kind are applied in one boolean each.
+    """
+    section = None
+    run, subtract = [], False
+    for prism in [*prisms, None]:
+        if prism is not None and (not run or prism.subtract == subtract):
+            run.extend(prism.faces)
+            subtract = prism.subtract
+            continue
+        if subtract:
+            section = section.cut(*run) if section is not None else None
+        elif section is None:
+            section = run[0].fuse(*run[1:]) if len(run) > 1 else run[0]
+        else:
+            section = section.fuse(*run)
+        if prism is not None:
+            run, subtract = list(prism.faces), prism.subtract
+    if section is None or not section.faces():
+        return None
+    return section.clean()
+
+
+def slabs(prisms):
+    """[(z0, z1, section)] for each run of heights with the same active prisms."""
+    heights = sorted({z for prism in prisms for z in (prism.z0, prism.z1)})
+    runs = []   # [z0, z1, indices of the prisms shaping z0..z1]
+    for lo, hi in zip(heights, heights[1:]):
+        active = _active(prisms, lo, hi)
+        if runs and runs[-1][2] == active:
+            runs[-1][1] = hi   # same cross-section: extend the slab
+        else:
+            runs.append([lo, hi, active])
+
+    compiled = []
+    for lo, hi, active in runs:
+        section = _section([prisms[i] for i in active])
+        if section is not None:
+            compiled.append((lo, hi, section))
+    return compiled
+
+
+def compile_prisms(prisms):
+    """Build a Part from prisms with one extrusion per slab and a single fuse."""
+    solids = [
+        solid
+        for lo, hi, section in slabs(prisms)
+        for solid in extrude(Plane.XY.offset(lo) * section, amount=hi - lo).solids()
+    ]
+    if len(solids) == 1:
+        return Part(solids)
+    # Stacked slabs only touch at shared planar faces, which is what OCC's
+    # glue mode is for; clean() then merges the split side faces again.
+    return Part(solids[0].fuse(*solids[1:], glue=True).clean().solids())
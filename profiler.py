@@ -0,0 +1,158 @@
+"""Per-feature build profiling with Chrome trace output.
+
+The builders mark each named feature block (the comments in sections 4-6):
+
+    features = profiler.timeline("shell", shell)
+    features.mark("Corner Posts")
+    ...
+    features.end()
+
+Each mark closes the previous feature and opens the next, recording its wall
+time, the number of OCC booleans (Shape.fuse/cut/intersect) it ran and the
+face/edge count of the part afterwards. Profiling is off by default: until
+enable() is called timeline() returns a shared no-op object and the boolean
+methods are not patched, so the only cost is a function call per mark.
+
+    python case3b.py --profile trace.json    # or CASE3B_PROFILE=trace.json
+
+The trace opens in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+
+from build123d import Shape
+
+ENV = "CASE3B_PROFILE"
+BOOLEAN_OPS = ("fuse", "cut", "intersect")
+
+_trace = None
+
+
+class Trace:
+    """Collected Chrome trace events ("X" complete events, microseconds)."""
+
+    def __init__(self):
+        self.events = []
+        self.booleans = 0
+        self._origin = time.perf_counter()
+
+    def now(self):
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def add(self, name, category, start, end, args):
+        self.events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round(start, 1),
+            "dur": round(end - start, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        })
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f, indent=1)
+
+    def summary(self):
+        """[(category, name, ms, booleans)] for the feature events, slowest first."""
+        rows = [(e["cat"], e["name"], e["dur"] / 1000, e["args"].get("booleans", 0))
+                for e in self.events if e["cat"] != "part"]
+        return sorted(rows, key=lambda row: -row[2])
+
+
+def _counting(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if _trace is not None:
+            _trace.booleans += 1
+        return method(self, *args, **kwargs)
+    wrapper.__wrapped_boolean__ = method
+    return wrapper
+
+
+def enable():
+    """Start a new trace and count booleans; returns the Trace."""
+    global _trace
+    if _trace is None:
+        for op in BOOLEAN_OPS:
+            setattr(Shape, op, _counting(getattr(Shape, op)))
+    _trace = Trace()
+    return _trace
+
+
+def disable():
+    """Stop profiling and restore the boolean methods; returns the last Trace."""
+    global _trace
+    trace, _trace = _trace, None
+    if trace is not None:
+        for op in BOOLEAN_OPS:
+            setattr(Shape, op, getattr(Shape, op).__wrapped_boolean__)
+    return trace
+
+
+def enabled():
+    return _trace is not None
+
+
+def _counts(builder):
+    part = getattr(builder, "part", builder) if builder is not None else None
+    if part is None:
+        return {}
+    return {"faces": len(part.faces()), "edges": len(part.edges())}
+
+
+class Timeline:
+    """Sequential feature spans inside one part build."""
+
+    def __init__(self, trace, part_name, builder):
+        self.trace = trace
+        self.part_name = part_name
+        self.builder = builder
+        self.start = trace.now()
+        self.booleans = trace.booleans
+        self._feature = None
+
+    def mark(self, name):
+        self._close()
+        self._feature = (name, self.trace.now(), self.trace.booleans)
+
+    def end(self, result=None):
+        """Close the last feature and the part span; `result` is the final part."""
+        self._close(result)
+        end = self.trace.now()  # before counting faces, which isn't part of the build
+        args = {"booleans": self.trace.booleans - self.booleans, **_counts(result if result is not None else self.builder)}
+        self.trace.add(f"build {self.part_name}", "part", self.start, end, args)
+
+    def _close(self, result=None):
+        if self._feature is None:
+            return
+        name, start, booleans = self._feature
+        self._feature = None
+        end = self.trace.now()
+        args = {"booleans": self.trace.booleans - booleans, **_counts(result if result is not None else self.builder)}
+        self.trace.add(name, self.part_name, start, end, args)
+
+
+class _NoTimeline:
+    def mark(self, name):
+        pass
+
+    def end(self, result=None):
+        pass
+
+
+_NO_TIMELINE = _NoTimeline()
+
+
+def timeline(part_name, builder=None):
+    """Feature timeline for one build of `part_name` (a no-op unless enabled)."""
+    if _trace is None:
+        return _NO_TIMELINE
+    return Timeline(_trace, part_name, builder)
@@ -0,0 +1,203 @@
+"""Planar slicer: per-layer cross-sections of the base and shell meshes.
+
+The mesh (in print orientation, see overhangs.py) is cut at the middle of
+every layer of the Orca profile (initial_layer_height, then layer_height).
+All (triangle, layer) crossings are expanded into one array and turned into
+contour segments in a single pass; segments are chained into closed loops
+for the whole part at once. Per layer this gives the cross-section area
+(shoelace), perimeter length and island count, and islands with nothing
+under them in the layer below are reported as floating.
+
+    python slicer.py                             # default parameters
+    python slicer.py --stl variants/101111 --csv layers.csv
+"""
+
+import argparse
+import csv
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+import case3b
+import stl_mesh
+from overhangs import part_triangles, to_print_frame
+from print_profile import load_profile
+
+WELD = 1e-5       # mm; grid for matching contour points
+NUDGE = 1e-7      # mm; keeps slice planes off vertices that sit exactly on them
+INSET = 0.01      # mm; how far inside an island its support probe points are
+
+
+@dataclass
+class Slices:
+    """Per-layer results of slice(); arrays are indexed by layer."""
+    z: np.ndarray            # slice plane heights
+    thickness: np.ndarray    # layer thicknesses
+    area: np.ndarray         # mm²
+    perimeter: np.ndarray    # mm, all contours (outer and holes)
+    islands: np.ndarray      # separate pieces of material
+    floating: list           # [(layer, z, area, (x, y))] islands with nothing below
+
+    @property
+    def volume(self):
+        return float(np.sum(self.area * self.thickness))
+
+
+def layer_planes(top, layer_height, initial_layer_height):
+    """(plane z, thickness) of every layer up to `top`, sampled mid-layer."""
+    rest = max(0, int(np.ceil((top - initial_layer_height) / layer_height - 1e-9)))
+    tops = initial_layer_height + layer_height * np.arange(rest + 1)
+    thickness = np.diff(tops, prepend=0.0)
+    return tops - thickness / 2 + NUDGE, thickness
+
+
+def _segments(tris, planes):
+    """(layer (M,), segments (M, 2, 2)) of the cross-section contours.
+
+    Segments are oriented so the material is on their left: outer contours
+    run counter-clockwise and holes clockwise.
+    """
+    normal = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])[:, :2]
+    # With each triangle's vertices sorted by height, a plane between the
+    # lowest and highest vertex cuts edge 0-2 and one of edges 0-1 and 1-2
+    order = np.argsort(tris[:, :, 2], axis=1)
+    tris = np.take_along_axis(tris, order[:, :, None], axis=1)
+    z = tris[:, :, 2]
+    first = np.searchsorted(planes, z[:, 0], "right")
+    count = np.maximum(np.searchsorted(planes, z[:, 2], "left") - first, 0)
+    tri = np.repeat(np.arange(len(tris)), count)
+    layer = np.repeat(first, count) + np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+
+    plane = planes[layer]
+    xy, z = tris[tri, :, :2], z[tri]
+    # Interpolating from each edge's lower end makes the two triangles that
+    # share an edge produce bit-identical points
+    a = xy[:, 0] + ((plane - z[:, 0]) / (z[:, 2] - z[:, 0]))[:, None] * (xy[:, 2] - xy[:, 0])
+    upper = plane > z[:, 1]
+    lo = np.where(upper[:, None], xy[:, 1], xy[:, 0])
+    lo_z = np.where(upper, z[:, 1], z[:, 0])
+    hi = np.where(upper[:, None], xy[:, 2], xy[:, 1])
+    hi_z = np.where(upper, z[:, 2], z[:, 1])
+    b = lo + ((plane - lo_z) / (hi_z - lo_z))[:, None] * (hi - lo)
+    seg = np.stack([a, b], axis=1)
+
+    # Material on the left: the face's outward normal must point to the right
+    n = normal[tri]
+    direction = b - a
+    flip = direction[:, 1] * n[:, 0] - direction[:, 0] * n[:, 1] < 0
+    seg[flip] = seg[flip, ::-1]
+    return layer, seg
+
+
+def _loops(layer, seg):
+    """Loop label per segment, chaining each segment's end to the next one's start."""
+    # One int64 per point: layer, then x and y on a WELD grid (26 bits each)
+    grid = np.round((seg - seg.reshape(-1, 2).min(axis=0)) / WELD).astype(np.int64)
+    if grid.max() >= 1 << 26:
+        raise ValueError("part too large for the contour point grid")
+    keys = (layer[:, None].astype(np.int64) << 52) | (grid[..., 0] << 26) | grid[..., 1]
+    _, ids = np.unique(keys.T.ravel(), return_inverse=True)   # starts, then ends
+    n = len(seg)
+    # Join segment i to the point ids of its start and end: a loop is a connected component
+    rows = np.concatenate([np.arange(n), np.arange(n)])
+    graph = coo_matrix((np.ones(2 * n), (rows, ids + n)), shape=(n + ids.max() + 1,) * 2)
+    _, labels = connected_components(graph, directed=False)
+    _, loop = np.unique(labels[:n], return_inverse=True)
+    return loop
+
+
+def _inside(points, seg):
+    """Even-odd test of points (P, 2) against closed contours given as segments (S, 2, 2)."""
+    if not len(seg) or not len(points):
+        return np.zeros(len(points), dtype=bool)
+    a, b = seg[:, 0], seg[:, 1]
+    px, py = points[:, None, 0], points[:, None, 1]
+    straddles = (a[:, 1] > py) != (b[:, 1] > py)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = a[:, 0] + (py - a[:, 1]) * (b[:, 0] - a[:, 0]) / (b[:, 1] - a[:, 1])
+    return (np.sum(straddles & (px < x_cross), axis=1) % 2) == 1
+
+
+def slice_mesh(tris, layer_height=0.2, initial_layer_height=0.2):
+    """Slice print-frame triangles (N, 3, 3) into Slices."""
+    tris = tris - np.array([0.0, 0.0, tris[:, :, 2].min()])
+    planes, thickness = layer_planes(tris[:, :, 2].max(), layer_height, initial_layer_height)
+    layer, seg = _segments(tris, planes)
+    cross = seg[:, 0, 0] * seg[:, 1, 1] - seg[:, 1, 0] * seg[:, 0, 1]
+    length = np.linalg.norm(seg[:, 1] - seg[:, 0], axis=1)
+    n_layers = len(planes)
+    area = np.bincount(layer, cross, n_layers) / 2
+    perimeter = np.bincount(layer, length, n_layers)
+
+    loop = _loops(layer, seg)
+    loop_area = np.bincount(loop, cross) / 2
+    loop_layer = np.zeros(len(loop_area), dtype=int)
+    loop_layer[loop] = layer
+    outer = loop_area > 0
+    islands = np.bincount(loop_layer[outer], minlength=n_layers)
+
+    # An island floats if none of its points (just inside its outline) has
+    # material below it. Probes are segment midpoints nudged inwards; one per
+    # island settles almost every island, the rest are tested in full.
+    direction = seg[:, 1] - seg[:, 0]
+    inward = np.column_stack([-direction[:, 1], direction[:, 0]]) / np.maximum(length, 1e-12)[:, None]
+    probes = seg.mean(axis=1) + INSET * inward
+    by_layer = np.split(np.argsort(layer, kind="stable"), np.cumsum(np.bincount(layer, minlength=n_layers))[:-1])
+    by_loop = np.split(np.argsort(loop, kind="stable"), np.cumsum(np.bincount(loop))[:-1])
+    floating = []
+    for index in np.flatnonzero(outer & (loop_layer > 0)):
+        k = loop_layer[index]
+        below = seg[by_layer[k - 1]]
+        mine = by_loop[index]
+        if _inside(probes[mine[:1]], below).any() or _inside(probes[mine], below).any():
+            continue
+        centre = (seg[mine].sum(axis=1) * cross[mine, None]).sum(axis=0) / (6 * loop_area[index])
+        floating.append((int(k), float(planes[k]), float(loop_area[index]), (float(centre[0]), float(centre[1]))))
+    return Slices(planes, thickness, area, perimeter, islands, floating)
+
+
+def slice_part(name, p, tris, profile=None):
+    """slice_mesh() for a part's own-frame triangles, in its print orientation."""
+    profile = profile or load_profile()
+    return slice_mesh(to_print_frame(name, p, tris), profile["layer_height"], profile["initial_layer_height"])
+
+
+def write_csv(path, results):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["part", "layer", "z", "area_mm2", "perimeter_mm", "islands"])
+        for name, s in results.items():
+            for k in range(len(s.z)):
+                writer.writerow([name, k, f"{s.z[k]:.3f}", f"{s.area[k]:.3f}", f"{s.perimeter[k]:.3f}", int(s.islands[k])])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--preset", default=None, choices=list(case3b.PRESETS), help="parameters to slice (default: the defaults)")
+    parser.add_argument("--stl", default=None, metavar="DIR", help="slice the STLs in DIR instead of building")
+    parser.add_argument("--csv", default=None, help="write the per-layer table to this CSV file")
+    args = parser.parse_args(argv)
+
+    p = case3b.CaseParams(**case3b.PRESETS[args.preset]) if args.preset else case3b.DEFAULT_PARAMS
+    profile = load_profile()
+    results = {}
+    for name in ("base", "shell"):
+        if args.stl:
+            tris = stl_mesh.triangles(stl_mesh.read_stl(case3b.output_paths(name, args.stl, ("stl",))[0]))
+        else:
+            tris = part_triangles(case3b.build_parts(p, (name,))[name])
+        results[name] = s = slice_part(name, p, tris, profile)
+        print(f"  {name:<6} {len(s.z)} layers, {s.volume / 1e3:.1f} cm³ by slices (mesh {stl_mesh.volume(tris) / 1e3:.1f} cm³), "
+              f"up to {s.islands.max()} islands, longest perimeter {s.perimeter.max():.0f} mm")
+        for k, z, area, (x, y) in s.floating:
+            print(f"         ⚠️ floating island at layer {k} (Z={z:.2f}): {area:.1f} mm² around ({x:.1f}, {y:.1f})")
+    if args.csv:
+        write_csv(args.csv, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
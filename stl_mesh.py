@@ -0,0 +1,139 @@
+"""Binary STL analytics without OCC: memory-mapped NumPy and vectorized checks.
+
+A binary STL is an 80-byte header, a uint32 triangle count and then packed
+50-byte records (normal, three vertices, attribute word). read_stl() maps
+the records straight into a structured array, so a mesh is never turned into
+per-triangle Python objects; volume, area, bounding box, centroid and the
+watertightness check are whole-array operations.
+
+    python stl_mesh.py                         # the STLs in the current directory
+    python stl_mesh.py variants/*/*.stl --json stl_report.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+HEADER_SIZE = 84
+STL_DTYPE = np.dtype([("normal", "<f4", (3,)), ("v", "<f4", (3, 3)), ("attr", "<u2")])
+
+
+def read_stl(path, mmap=True):
+    """The triangle records of a binary STL as a structured array (STL_DTYPE).
+
+    With mmap the array is a read-only view of the file; raises ValueError for
+    ASCII STLs or a file whose size doesn't match its triangle count.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{path}: too short for a binary STL")
+    count = int(np.frombuffer(header, "<u4", 1, 80)[0])
+    if size != HEADER_SIZE + count * STL_DTYPE.itemsize:
+        kind = "an ASCII STL" if header.lstrip().startswith(b"solid") else "a truncated or padded binary STL"
+        raise ValueError(f"{path}: {size} bytes for {count} triangles, looks like {kind}")
+    if count == 0:
+        return np.zeros(0, STL_DTYPE)
+    if mmap:
+        return np.memmap(path, STL_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+    return np.fromfile(path, STL_DTYPE, count, offset=HEADER_SIZE)
+
+
+def triangles(records):
+    """(N, 3, 3) float64 vertices of STL records."""
+    return np.asarray(records["v"], dtype=np.float64)
+
+
+def volume(tris):
+    """Enclosed volume (signed tetrahedra to the origin), mm³."""
+    return float(np.einsum("ij,ij->", tris[:, 0], np.cross(tris[:, 1], tris[:, 2])) / 6)
+
+
+def area(tris):
+    """Surface area, mm²."""
+    return float(np.linalg.norm(np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0]), axis=1).sum() / 2)
+
+
+def bounding_box(tris):
+    """(min xyz, max xyz)."""
+    points = tris.reshape(-1, 3)
+    return points.min(axis=0), points.max(axis=0)
+
+
+def centroid(tris):
+    """Centre of mass of the enclosed solid (uniform density)."""
+    tet = np.einsum("ij,ij->i", tris[:, 0], np.cross(tris[:, 1], tris[:, 2]))
+    return (tet[:, None] * tris.sum(axis=1)).sum(axis=0) / (4 * tet.sum())
+
+
+def edge_counts(records):
+    """(boundary, non-manifold, misoriented) edge counts.
+
+    Vertices are welded on their exact float32 bit patterns, as mesh writers
+    repeat shared vertices bit for bit. A closed, consistently oriented mesh
+    uses every edge exactly twice, once in each direction.
+    """
+    points = np.ascontiguousarray(records["v"]).reshape(-1, 3)
+    keys = points.view(np.dtype((np.void, points.dtype.itemsize * 3))).ravel()
+    _, ids = np.unique(keys, return_inverse=True)
+    ids = ids.reshape(-1, 3)
+    directed = np.stack([ids, np.roll(ids, -1, axis=1)], axis=2).reshape(-1, 2)
+    directed = directed[directed[:, 0] != directed[:, 1]]   # collapsed (degenerate) edges
+    _, uses = np.unique(np.sort(directed, axis=1), axis=0, return_counts=True)
+    _, repeats = np.unique(directed, axis=0, return_counts=True)
+    return int(np.sum(uses == 1)), int(np.sum(uses > 2)), int(np.sum(repeats > 1))
+
+
+def analyse(path):
+    """{triangles, volume, area, bbox, centroid, watertight, ...} for one STL."""
+    records = read_stl(path)
+    tris = triangles(records)
+    boundary, non_manifold, misoriented = edge_counts(records)
+    lo, hi = bounding_box(tris)
+    return {
+        "triangles": len(records),
+        "volume": volume(tris),
+        "area": area(tris),
+        "bbox": [*lo.tolist(), *hi.tolist()],
+        "centroid": centroid(tris).tolist(),
+        "boundary_edges": boundary,
+        "non_manifold_edges": non_manifold,
+        "misoriented_edges": misoriented,
+        "watertight": boundary == non_manifold == misoriented == 0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("paths", nargs="*", help="STL files or glob patterns (default: *.stl)")
+    parser.add_argument("--json", default=None, help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    paths = sorted({path for pattern in args.paths or ["*.stl"] for path in glob.glob(pattern, recursive=True)})
+    if not paths:
+        print("No STL files found")
+        return 1
+    start = time.perf_counter()
+    results = {path: analyse(path) for path in paths}
+    elapsed = time.perf_counter() - start
+
+    for path, r in results.items():
+        mark = "✅" if r["watertight"] else f"❌ {r['boundary_edges']} open / {r['non_manifold_edges']} non-manifold / {r['misoriented_edges']} flipped edges"
+        size = np.subtract(r["bbox"][3:], r["bbox"][:3])
+        print(f"  {path:<40} {r['triangles']:>7} tris  {r['volume'] / 1e3:8.1f} cm³  {r['area'] / 1e2:8.1f} cm²  "
+              f"{size[0]:.1f} x {size[1]:.1f} x {size[2]:.1f} mm  {mark}")
+    print(f"Analysed {len(results)} meshes in {elapsed:.2f}s")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0 if all(r["watertight"] for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
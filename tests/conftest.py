@@ -0,0 +1,3 @@
+def pytest_configure(config):
+    # Registered by pytest-xdist; declared here too so runs without it don't warn
+    config.addinivalue_line("markers", "xdist_group(name): run the marked tests on the same xdist worker")
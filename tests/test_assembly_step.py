@@ -0,0 +1,89 @@
+"""Assembly STEP (assembly_step.py): mounted shell, shared washer definition, ghost layer."""
+
+import os
+import sys
+
+import pytest
+from build123d import Align, Box, Cylinder
+from OCP.STEPCAFControl import STEPCAFControl_Reader
+from OCP.TCollection import TCollection_ExtendedString
+from OCP.TDataStd import TDataStd_Name
+from OCP.TDF import TDF_Label
+from OCP.TDocStd import TDocStd_Document
+from OCP.XCAFApp import XCAFApp_Application
+from OCP.XCAFDoc import XCAFDoc_DocumentTool, XCAFDoc_ShapeTool
+from OCP.collections import Sequence_TDF_Label
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import assembly_step  # noqa: E402
+import case3b  # noqa: E402
+
+BOTTOM = (Align.CENTER, Align.CENTER, Align.MIN)
+
+
+@pytest.fixture(scope="module")
+def parts():
+    p = case3b.DEFAULT_PARAMS
+    return {
+        "base": Box(p.BOX_W, p.BOX_L, p.BASE_THICKNESS, align=BOTTOM),
+        "shell": Box(p.BOX_W, p.BOX_L, p.BOX_H, align=BOTTOM) - Box(p.INTERNAL_W, p.INTERNAL_L, p.BOX_H - 3, align=BOTTOM),
+        "washer": Cylinder(p.WASHER_OD / 2, p.WASHER_THICKNESS, align=BOTTOM) - Cylinder(p.WASHER_ID / 2, p.WASHER_THICKNESS, align=BOTTOM),
+    }
+
+
+def name(label):
+    attr = TDataStd_Name()
+    return attr.Get().ToExtString() if label.FindAttribute(TDataStd_Name.GetID_s(), attr) else None
+
+
+def read(path):
+    """[(component name, definition name, (x, y, z), layers)] of the file's one assembly."""
+    doc = TDocStd_Document(TCollection_ExtendedString("XmlOcaf"))
+    XCAFApp_Application.GetApplication_s().InitDocument(doc)
+    reader = STEPCAFControl_Reader()
+    reader.SetNameMode(True)
+    reader.SetLayerMode(True)
+    reader.ReadFile(os.fspath(path))
+    assert reader.Transfer(doc)
+    shapes = XCAFDoc_DocumentTool.ShapeTool_s(doc.Main())
+    layers = XCAFDoc_DocumentTool.LayerTool_s(doc.Main())
+    roots = Sequence_TDF_Label()
+    shapes.GetFreeShapes(roots)
+    assert roots.Length() == 1 and name(roots.Value(1)) == assembly_step.ASSEMBLY
+    components = Sequence_TDF_Label()
+    XCAFDoc_ShapeTool.GetComponents_s(roots.Value(1), components)
+    found = []
+    for i in range(1, components.Length() + 1):
+        component, definition = components.Value(i), TDF_Label()
+        XCAFDoc_ShapeTool.GetReferredShape_s(component, definition)
+        offset = XCAFDoc_ShapeTool.GetLocation_s(component).Transformation().TranslationPart()
+        on = layers.GetLayers(definition)
+        found.append((name(component), name(definition), (offset.X(), offset.Y(), offset.Z()),
+                      {on.Value(j).ToExtString() for j in range(1, on.Length() + 1)}))
+    return found
+
+
+def test_assembly(parts, tmp_path):
+    p = case3b.DEFAULT_PARAMS
+    path = assembly_step.write_assembly(parts, p, tmp_path / "assembly.step")
+    found = read(path)
+    assert [c[0] for c in found] == ["base", "shell", "washer 1", "washer 2", "washer 3", "washer 4"]
+    assert found[1][2] == pytest.approx((0, 0, p.BASE_THICKNESS))
+    washers = [c for c in found if c[1] == case3b.FILENAMES["washer"]]
+    assert [c[2] for c in washers] == [pytest.approx(xyz) for xyz in assembly_step.washer_locations(p)]
+
+    # One washer definition, six placements
+    text = open(path).read()
+    assert text.count(f"PRODUCT('{case3b.FILENAMES['washer']}'") == 1
+    assert text.count("NEXT_ASSEMBLY_USAGE_OCCURRENCE") == 6
+
+
+def test_ghost_layer(parts, tmp_path):
+    p = case3b.DEFAULT_PARAMS
+    found = read(assembly_step.write_assembly(parts, p, tmp_path / "assembly.step", with_ghosts=True))
+    ghosts = {c[0]: c for c in found if assembly_step.GHOST_LAYER in c[3]}
+    assert set(ghosts) == set(case3b.GHOST_FRAMES)
+    for ghost, box in case3b.ghosts(p).items():   # the ghost's own placement, in the assembled frame
+        dz = p.BASE_THICKNESS if case3b.GHOST_FRAMES[ghost] == "shell" else 0.0
+        assert ghosts[ghost][2] == pytest.approx(tuple(box.location.position + (0, 0, dz)))
+    assert not any(c[3] for c in found if c[0] not in ghosts)
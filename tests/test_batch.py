@@ -0,0 +1,20 @@
+"""Batch worker (batch.py): every option shares one build of each part."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import batch  # noqa: E402
+import case3b  # noqa: E402
+
+
+def test_no_cache_builds_each_part_once(monkeypatch, tmp_path):
+    calls = []
+    for name, builder in case3b.BUILDERS.items():
+        monkeypatch.setitem(case3b.BUILDERS, name, lambda p, name=name, builder=builder: calls.append(name) or builder(p))
+    options = {"cache": False, "interference": True, "plate": True, "preview": True, "assembly": True}
+    result = batch.build_variant(batch.PRESETS["hybrid"], str(tmp_path), options)
+    assert result["error"] is None and result["collisions"] == []
+    assert sorted(calls) == sorted(case3b.BUILDERS)
+    for filename in ("pid_case_plate.3mf", "pid_case_preview.glb", "pid_case_assembly.step"):
+        assert (tmp_path / filename).exists()
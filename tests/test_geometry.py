@@ -0,0 +1,133 @@
+"""Geometric regression tests: build every part in memory and compare it with
+the golden values in golden/geometry.json (no STL/STEP is written).
+
+Tests are parametrized by preset and grouped per preset, so
+`pytest -n 3 --dist loadgroup` (pytest-xdist) builds each preset once, on
+its own worker. After an intended geometry change, refresh the golden
+data with:
+
+    python tests/test_geometry.py --update
+"""
+
+import functools
+import json
+import math
+import os
+import sys
+
+import pytest
+from build123d import GeomType, Vector
+from OCP.BRepAdaptor import BRepAdaptor_Surface
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import case3b  # noqa: E402
+
+GOLDEN = os.path.join(os.path.dirname(__file__), "golden", "geometry.json")
+VOLUME_REL_TOL = 1e-6
+LENGTH_TOL = 1e-3
+
+
+def load_golden():
+    with open(GOLDEN, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=None)
+def built(preset):
+    """(params, {name: Part}) for a preset, built once per test process."""
+    p = case3b.CaseParams(**case3b.PRESETS[preset])
+    return p, case3b.build_parts(p)
+
+
+def part_stats(part):
+    bb = part.bounding_box()
+    return {
+        "volume": part.volume,
+        "bbox": [*bb.min, *bb.max],
+        "faces": len(part.faces()),
+        "solids": len(part.solids()),
+    }
+
+
+def coaxial_cylinders(part, hole):
+    """Cylindrical faces of `part` whose axis is the hole's axis."""
+    center, axis = Vector(hole.center), Vector(hole.axis)
+    for face in part.faces():
+        if face.geom_type != GeomType.CYLINDER:
+            continue
+        face_axis = face.axis_of_rotation
+        if abs(abs(face_axis.direction.dot(axis)) - 1) < 1e-6 and (center - face_axis.position).cross(axis).length < LENGTH_TOL:
+            yield face
+
+
+def measure_hole(part, hole):
+    """Diameter of the bore at hole.center, or None if there is no bore there."""
+    center = Vector(hole.center)
+    if part.is_inside(center):
+        return None
+    bores = [(face.distance_to(center), BRepAdaptor_Surface(face.wrapped).Cylinder().Radius())
+             for face in coaxial_cylinders(part, hole)]
+    if not bores:
+        return None
+    # The face level with the probe point is the nearest one (chamfers and
+    # bosses on the same axis are further away).
+    return 2 * min(bores)[1]
+
+
+# built() is cached per process: keep each preset's tests on one xdist worker
+PRESETS = [pytest.param(preset, marks=pytest.mark.xdist_group(preset)) for preset in case3b.PRESETS]
+
+
+@pytest.fixture(scope="module")
+def golden():
+    return load_golden()
+
+
+@pytest.mark.parametrize("preset", PRESETS)
+@pytest.mark.parametrize("name", list(case3b.BUILDERS))
+def test_part_matches_golden(golden, preset, name):
+    _, parts = built(preset)
+    stats, expected = part_stats(parts[name]), golden[preset][name]
+    assert stats["solids"] == expected["solids"] == 1
+    assert stats["faces"] == expected["faces"]
+    assert math.isclose(stats["volume"], expected["volume"], rel_tol=VOLUME_REL_TOL)
+    assert stats["bbox"] == pytest.approx(expected["bbox"], abs=LENGTH_TOL)
+
+
+@pytest.mark.parametrize("preset", PRESETS)
+def test_box_envelope(preset):
+    p, parts = built(preset)
+    for name in ("base", "shell"):
+        size = parts[name].bounding_box().size
+        assert (size.X, size.Y) == pytest.approx((p.BOX_W, p.BOX_L), abs=LENGTH_TOL)
+    assert parts["shell"].bounding_box().size.Z == pytest.approx(p.BOX_H, abs=LENGTH_TOL)
+
+
+@pytest.mark.parametrize("preset", PRESETS)
+def test_threaded_holes(golden, preset):
+    p, parts = built(preset)
+    holes = case3b.threaded_holes(p)
+    assert len(holes) == 15
+    measured = {hole.name: measure_hole(parts[hole.part], hole) for hole in holes}
+    assert set(measured) == set(golden[preset]["holes"])
+    for hole in holes:
+        assert measured[hole.name] is not None, f"{hole.name}: no bore at {hole.center}"
+        assert measured[hole.name] == pytest.approx(golden[preset]["holes"][hole.name], abs=LENGTH_TOL), hole.name
+        assert measured[hole.name] == pytest.approx(hole.dia, abs=LENGTH_TOL), hole.name
+
+
+def update_golden():
+    golden = {}
+    for preset in case3b.PRESETS:
+        p, parts = built(preset)
+        golden[preset] = {name: part_stats(part) for name, part in parts.items()}
+        golden[preset]["holes"] = {hole.name: measure_hole(parts[hole.part], hole) for hole in case3b.threaded_holes(p)}
+    with open(GOLDEN, "w", encoding="utf-8") as f:
+        json.dump(golden, f, indent=2, sort_keys=True)
+    print(f"Wrote {GOLDEN}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["--update"]:
+        sys.exit("usage: python tests/test_geometry.py --update")
+    update_golden()
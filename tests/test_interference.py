@@ -0,0 +1,65 @@
+"""Interference check (interference.py): collisions, clearance gaps, BVH pruning."""
+
+import os
+import sys
+
+import pytest
+from build123d import Align, Box
+from OCP.BRepExtrema import BRepExtrema_DistShapeShape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import case3b  # noqa: E402
+import interference  # noqa: E402
+
+BOTTOM = (Align.CENTER, Align.CENTER, Align.MIN)
+
+
+def case_parts(p, internal_h):
+    """A plain base and an open-bottomed shell with the PID and C14 panel cutouts."""
+    shell = (Box(p.BOX_W, p.BOX_L, internal_h + 3, align=BOTTOM)
+             - Box(p.INTERNAL_W, p.INTERNAL_L, internal_h, align=BOTTOM))
+    ghosts = case3b.ghosts(p)
+    return {"base": Box(p.BOX_W, p.BOX_L, p.BASE_THICKNESS, align=BOTTOM),
+            "shell": shell - ghosts["pid"] - ghosts["c14"]}
+
+
+@pytest.fixture(scope="module")
+def report():
+    p = case3b.DEFAULT_PARAMS
+    return interference.check(p, case_parts(p, p.INTERNAL_H))
+
+
+def test_clear_case(report):
+    assert interference.collisions(report) == []
+
+
+def test_collision():
+    p = case3b.DEFAULT_PARAMS
+    roof_z = p.ssr_z + p.SSR_H - 2.0 - p.BASE_THICKNESS   # the roof comes 2 mm down into the SSR
+    found = interference.collisions(interference.check(p, case_parts(p, roof_z)))
+    assert found == [("ssr", "shell", pytest.approx(p.SSR_W * p.SSR_L * 2.0, rel=1e-6))]
+
+
+def test_clearance_gap(report):
+    p = case3b.DEFAULT_PARAMS
+    assert report["ssr"]["base"]["gap"] == pytest.approx(p.ssr_z - p.BASE_THICKNESS, abs=1e-6)
+    ssr = case3b.ghosts(p)["ssr"].bounding_box()
+    walls = (ssr.min.X + p.INTERNAL_W/2, p.INTERNAL_W/2 - ssr.max.X,
+             ssr.min.Y + p.INTERNAL_L/2, p.INTERNAL_L/2 - ssr.max.Y,
+             p.BASE_THICKNESS + p.INTERNAL_H - ssr.max.Z)
+    assert report["ssr"]["shell"]["gap"] == pytest.approx(min(walls), abs=1e-6)
+
+
+def test_bvh_matches_brute_force(report):
+    p = case3b.DEFAULT_PARAMS
+    parts = case_parts(p, p.INTERNAL_H)
+    case, ghosts = interference.assembled(p, parts)
+    for ghost_name, ghost in ghosts.items():
+        for part_name, part in case.items():
+            exact = BRepExtrema_DistShapeShape(ghost.wrapped, part.wrapped).Value()
+            r = report[ghost_name][part_name]
+            if r["gap"] is None:
+                assert exact > interference.SEARCH_RADIUS
+            else:
+                assert r["gap"] == pytest.approx(exact, abs=1e-6), (ghost_name, part_name)
+                assert r["faces"] < len(part.faces())
@@ -0,0 +1,60 @@
+"""Analytic layout rules (layout.py): no CAD build involved."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import case3b  # noqa: E402
+import layout  # noqa: E402
+
+
+@pytest.mark.parametrize("preset", list(case3b.PRESETS))
+def test_presets_pass(preset):
+    layout.validate(case3b.CaseParams(**case3b.PRESETS[preset]))
+
+
+@pytest.mark.parametrize("override, rule", [
+    ({"pid_z_start": 8.0}, "clamp_floor_gap"),
+    ({"term_rear_gap": 30.0}, "wire_runway"),
+    ({"SIDE_MARGIN": 0.0}, "ssr_wall_gap"),
+    ({"INTERNAL_L": 120.0}, "c14_cable_depth"),
+    ({"SIDE_MARGIN": 2.0, "ssr_front_gap": 2.0}, "corner_posts_clear"),
+    ({"c14_z": 20.0}, "c14_in_wall"),
+    ({"socket_y": -40.0}, "socket_in_roof"),
+])
+def test_rule_catches_bad_layout(override, rule):
+    p = case3b.CaseParams(**override)
+    assert rule in [name for name, _, _ in layout.violations(p)]
+    with pytest.raises(layout.LayoutError):
+        layout.validate(p)
+
+
+def test_batch_matches_scalar():
+    rng = np.random.default_rng(1)
+    values = {
+        "INTERNAL_L": rng.uniform(110, 180, 50),
+        "INTERNAL_H": rng.uniform(70, 120, 50),
+        "c14_z": rng.uniform(20, 70, 50),
+        "term_rear_gap": rng.uniform(25, 60, 50),
+    }
+    batch = layout.margins(layout.ParamBatch(case3b.DEFAULT_PARAMS, **values))
+    for i in range(50):
+        p = case3b.CaseParams(**{name: float(v[i]) for name, v in values.items()})
+        for name, margin in layout.margins(p).items():
+            assert batch[name][i] == pytest.approx(margin), name
+
+
+@pytest.mark.parametrize("name, low, high", [
+    ("pid_z_start", 12.0, 40.0),      # moves the PID box only
+    ("term_rear_gap", 20.0, 60.0),    # moves the terminal block only
+    ("ssr_front_gap", 2.0, 40.0),     # moves the SSR only
+])
+def test_batch_of_one_component_field(name, low, high):
+    values = np.linspace(low, high, 7)
+    batch = layout.margins(layout.ParamBatch(case3b.DEFAULT_PARAMS, **{name: values}))
+    for i, value in enumerate(values):
+        for rule, margin in layout.margins(case3b.CaseParams(**{name: float(value)})).items():
+            assert batch[rule][i] == pytest.approx(margin), rule
@@ -0,0 +1,118 @@
+"""Shared mesh cache (meshes.py), the writers that consume it and the part cache keys."""
+
+import os
+import sys
+import zipfile
+
+import numpy as np
+import pytest
+from build123d import Box, Cylinder, Location
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import case3b  # noqa: E402
+import interference  # noqa: E402
+import meshes  # noqa: E402
+import overhangs  # noqa: E402
+import stl_mesh  # noqa: E402
+from depgraph import DependencyGraph  # noqa: E402
+from part_cache import PartCache, part_key  # noqa: E402
+
+
+def test_mesh_is_cached_per_shape_and_tolerance():
+    meshes.clear()
+    part = Box(20, 10, 5) - Cylinder(3, 5)
+    m = meshes.mesh(part)
+    assert meshes.mesh(part) is m
+    assert meshes.mesh(part, 0.1, 0.5) is not m                          # another tolerance
+    assert meshes.mesh(part.moved(Location((5, 0, 0)))) is not m         # another location
+    assert meshes.stats == {"hits": 1, "misses": 3}
+    assert m.faces.max() == len(part.faces()) - 1
+    assert stl_mesh.volume(m.triangles) == pytest.approx(part.volume, rel=1e-3)
+
+
+def test_writers_share_the_mesh(tmp_path):
+    meshes.clear()
+    part = Box(20, 10, 5) - Cylinder(3, 5)
+    m = meshes.mesh(part)
+    meshes.write_stl(m, tmp_path / "part.stl")
+    meshes.write_3mf(m, tmp_path / "part.3mf", "part")
+    records = stl_mesh.read_stl(tmp_path / "part.stl")
+    assert len(records) == len(m.indices)
+    assert stl_mesh.edge_counts(records) == (0, 0, 0)
+    with zipfile.ZipFile(tmp_path / "part.3mf") as zf:
+        assert zf.read("3D/3dmodel.model").count(b"<triangle ") == len(m.indices)
+    assert meshes.stats["misses"] == 1
+
+
+def test_part_cache_returns_the_same_part(tmp_path):
+    cache = PartCache(tmp_path)
+    part = Box(1, 2, 3)
+    cache.put("k", part)
+    assert cache.get("k") is part
+    assert PartCache(tmp_path).get("k").volume == pytest.approx(6)   # a fresh process reads the BRep
+
+
+def test_part_cache_miss_on_concurrent_eviction(monkeypatch, tmp_path):
+    cache = PartCache(tmp_path)
+    cache.put("k", Box(1, 2, 3))
+
+    def evicted(path):   # another worker removes the entry between the checks
+        os.remove(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "utime", evicted)
+    assert cache.get("k") is None
+    assert PartCache(tmp_path).get("k") is None
+
+
+def test_helper_sources_key_the_cache(monkeypatch, tmp_path):
+    p = case3b.DEFAULT_PARAMS
+    key = part_key("base", case3b.build_base, p, case3b.PART_PARAMS["base"])
+    graph = DependencyGraph(str(tmp_path / "deps.json"))
+    graph.record("base", case3b.build_base, {}, {}, [])
+    monkeypatch.setattr(case3b.build_base, "sources", (case3b.base_prisms,))   # as if prism.py had changed
+    assert part_key("base", case3b.build_base, p, case3b.PART_PARAMS["base"]) != key
+    assert graph.stale_reason("base", case3b.build_base, p, []) == "builder changed"
+
+
+@pytest.mark.parametrize("quality", list(meshes.QUALITY))
+def test_export_mesh_keeps_holes_within_the_chord_error(quality):
+    meshes.clear()
+    plate = Box(60, 40, 5) - Location((-15, 0, 0)) * Cylinder(2.1, 5) - Location((15, 0, 0)) * Cylinder(1.25, 5)
+    assert meshes.smallest_radius(plate) == pytest.approx(1.25)
+    m = meshes.export_mesh(plate, quality)
+    chord = meshes.QUALITY[quality]
+    for cx, r in ((-15, 2.1), (15, 1.25)):
+        d = np.hypot(m.vertices[:, 0] - cx, m.vertices[:, 1])
+        on_wall = np.abs(d - r) < 1e-6
+        edges = m.indices[:, [[0, 1], [1, 2], [2, 0]]].reshape(-1, 2)
+        edges = edges[on_wall[edges].all(axis=1)]
+        mid = m.vertices[edges].mean(axis=1)
+        gap = r - np.hypot(mid[:, 0] - cx, mid[:, 1])
+        assert len(edges) and gap.max() <= chord * 1.001
+
+
+def test_draft_is_coarser_than_production():
+    meshes.clear()
+    part = Box(60, 40, 5) - Cylinder(1.5, 5)
+    assert len(meshes.export_mesh(part, "draft").indices) < len(meshes.export_mesh(part, "production").indices)
+
+
+def test_no_cache_run_records_its_outputs(monkeypatch, tmp_path):
+    monkeypatch.setenv(meshes.QUALITY_ENV, "production")   # main() sets it for the export workers
+    run = ["--parts", "washer", "--formats", "stl", "--export-jobs", "0", "--out", str(tmp_path)]
+    assert case3b.main(run + ["--quality", "production"]) == 0
+    assert case3b.main(run + ["--no-cache", "--quality", "draft"]) == 0
+    draft = os.path.getsize(tmp_path / "pid_m3_washer.stl")
+    assert case3b.main(run + ["--quality", "production"]) == 0   # the draft STL must not pass as up to date
+    assert os.path.getsize(tmp_path / "pid_m3_washer.stl") > draft
+
+
+def test_analyses_share_the_export_mesh():
+    meshes.clear()
+    part = Box(20, 10, 5) - Cylinder(3, 5)
+    m = meshes.export_mesh(part)
+    assert overhangs.part_triangles(part) == pytest.approx(m.triangles)
+    triangles, owners, faces = interference.mesh_faces(part, (0.0, 0.0, 5.0))
+    assert triangles == pytest.approx(m.triangles + (0, 0, 5)) and len(faces) == len(part.faces())
+    assert meshes.stats == {"hits": 2, "misses": 1}
@@ -0,0 +1,21 @@
+"""Design-space search (optimize.py): analytic scoring only, no build."""
+
+import os
+import sys
+from dataclasses import replace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import case3b  # noqa: E402
+import layout  # noqa: E402
+import optimize  # noqa: E402
+
+
+def test_search_ranks_feasible_candidates():
+    ranked = optimize.search(candidates=2000, rounds=3, min_margin=1.0)
+    scores = [score for score, _ in ranked]
+    assert scores == sorted(scores)
+    assert scores[0] < optimize.box_volume(case3b.DEFAULT_PARAMS)
+    for score, values in ranked[:20]:
+        p = replace(case3b.DEFAULT_PARAMS, **values)
+        assert min(layout.margins(p).values()) >= 1.0
+        assert score == optimize.box_volume(p)
@@ -0,0 +1,35 @@
+"""Overhang and bridge analysis (overhangs.py) on small synthetic parts."""
+
+import os
+import sys
+
+import pytest
+from build123d import Align, Box
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import overhangs  # noqa: E402
+
+BOTTOM = (Align.CENTER, Align.CENTER, Align.MIN)
+
+
+def arch(gap):
+    """A 10 mm thick slab on two legs `gap` apart: one bridge across the gap."""
+    return Box(gap + 12, 10, 20, align=BOTTOM) - Box(gap, 12, 10, align=BOTTOM)
+
+
+@pytest.mark.parametrize("gap, needs_support", [(28.0, True), (6.0, False)])
+def test_bridge_span(gap, needs_support):
+    report = overhangs.analyse(overhangs.part_triangles(arch(gap)), max_bridge=10.0)
+    (bridge,) = report["bridges"]
+    assert bridge["span"] == pytest.approx(gap, abs=0.5)
+    assert bridge["z"] == pytest.approx(10.0)
+    assert bridge["needs_support"] is needs_support
+    assert report["overhang_area"] == pytest.approx(gap * 10, rel=1e-6)
+    assert report["support_area"] == pytest.approx(gap * 10 if needs_support else 0.0, rel=1e-6)
+
+
+def test_floating_ledge():
+    ledge = Box(10, 10, 10, align=BOTTOM) + Box(20, 10, 2, align=(Align.MIN, Align.CENTER, Align.MIN)).translate((5, 0, 8))
+    (bridge,) = overhangs.analyse(overhangs.part_triangles(ledge))["bridges"]
+    assert bridge["span"] == pytest.approx(2 * 20, abs=1.0)   # held on one side only
+    assert bridge["needs_support"]
@@ -0,0 +1,71 @@
+"""3MF print project (plate_3mf.py): shared washer mesh, plates and embedded profile."""
+
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+import zipfile
+
+import numpy as np
+import pytest
+from build123d import Align, Box, Cylinder
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import case3b  # noqa: E402
+import plate_3mf  # noqa: E402
+from print_profile import read_profile  # noqa: E402
+
+BOTTOM = (Align.CENTER, Align.CENTER, Align.MIN)
+NS = {"m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"}
+
+
+@pytest.fixture(scope="module")
+def parts():
+    p = case3b.DEFAULT_PARAMS
+    return {
+        "base": Box(p.BOX_W, p.BOX_L, 17, align=BOTTOM),
+        "shell": Box(p.BOX_W, p.BOX_L, p.BOX_H, align=BOTTOM) - Box(p.INTERNAL_W, p.INTERNAL_L, p.BOX_H - 3, align=BOTTOM),
+        "washer": Cylinder(p.WASHER_OD / 2, p.WASHER_THICKNESS, align=BOTTOM) - Cylinder(p.WASHER_ID / 2, p.WASHER_THICKNESS, align=BOTTOM),
+    }
+
+
+def placed(root, item):
+    """Vertices of a build item's object, moved by the item's transform."""
+    obj = root.find(f".//m:object[@id='{item.get('objectid')}']", NS)
+    v = np.array([[float(e.get(k)) for k in "xyz"] for e in obj.iterfind(".//m:vertex", NS)])
+    m = np.array(item.get("transform").split(), dtype=float).reshape(4, 3)
+    return v @ m[:3] + m[3]
+
+
+def test_plate(parts, tmp_path):
+    path = plate_3mf.write_plate(parts, case3b.DEFAULT_PARAMS, tmp_path / "plate.3mf", washers=6)
+    with zipfile.ZipFile(path) as zf:
+        assert all(info.compress_type == zipfile.ZIP_DEFLATED for info in zf.infolist())
+        root = ET.fromstring(zf.read("3D/3dmodel.model"))
+        assert json.loads(zf.read("Metadata/project_settings.config")) == read_profile()
+        config = ET.fromstring(zf.read("Metadata/model_settings.config"))
+
+    assert len(root.findall(".//m:object", NS)) == 3
+    items = root.findall(".//m:item", NS)
+    assert [item.get("objectid") for item in items].count("3") == 6
+    assert [len(plate.findall("model_instance")) for plate in config.iter("plate")] == [7, 1]
+
+    # Everything sits on the bed, inside its plate, and the shell is roof-down
+    for item in items[:-1]:
+        lo, hi = placed(root, item).min(axis=0), placed(root, item).max(axis=0)
+        assert lo[2] == pytest.approx(0) and np.all(lo[:2] >= 0) and np.all(hi[:2] <= plate_3mf.BED)
+    shell = placed(root, items[-1])
+    assert shell[:, 2].min() == pytest.approx(0)
+    p = case3b.DEFAULT_PARAMS
+    rim = shell[shell[:, 2] > p.BOX_H - 1e-6]   # the open side, with the inner corners, is up
+    assert np.ptp(rim[:, 0]) == pytest.approx(p.BOX_W)
+    assert np.any(np.isclose(np.abs(rim[:, 0] - rim[:, 0].mean()), p.INTERNAL_W / 2))
+
+    # Unchanged input, byte-identical file
+    again = plate_3mf.write_plate(parts, case3b.DEFAULT_PARAMS, tmp_path / "again.3mf", washers=6)
+    assert open(path, "rb").read() == open(again, "rb").read()
+
+
+def test_too_many_washers(parts, tmp_path):
+    with pytest.raises(ValueError, match="washers fit"):
+        plate_3mf.write_plate(parts, case3b.DEFAULT_PARAMS, tmp_path / "plate.3mf", washers=40)
@@ -0,0 +1,85 @@
+"""GLB preview (preview_glb.py): quantized meshes, viewer colours, ghosts."""
+
+import json
+import os
+import struct
+import sys
+
+import numpy as np
+import pytest
+from build123d import Align, Box, Cylinder
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import case3b  # noqa: E402
+import meshes  # noqa: E402
+import preview_glb  # noqa: E402
+
+BOTTOM = (Align.CENTER, Align.CENTER, Align.MIN)
+
+
+@pytest.fixture(scope="module")
+def parts():
+    p = case3b.DEFAULT_PARAMS
+    return {
+        "base": Box(p.BOX_W, p.BOX_L, 17, align=BOTTOM) - Cylinder(1.25, 17, align=BOTTOM),
+        "shell": Box(p.BOX_W, p.BOX_L, p.BOX_H, align=BOTTOM) - Box(p.INTERNAL_W, p.INTERNAL_L, p.BOX_H - 3, align=BOTTOM),
+        "washer": Cylinder(p.WASHER_OD / 2, p.WASHER_THICKNESS, align=BOTTOM) - Cylinder(p.WASHER_ID / 2, p.WASHER_THICKNESS, align=BOTTOM),
+    }
+
+
+def read_glb(path):
+    data = open(path, "rb").read()
+    magic, version, total = struct.unpack_from("<III", data)
+    assert (magic, version, total) == (preview_glb.GLB_MAGIC, 2, len(data))
+    length, kind = struct.unpack_from("<II", data, 12)
+    assert kind == preview_glb.JSON_CHUNK
+    gltf = json.loads(data[20:20 + length])
+    bin_length, kind = struct.unpack_from("<II", data, 20 + length)
+    assert kind == preview_glb.BIN_CHUNK
+    return gltf, data[28 + length:28 + length + bin_length]
+
+
+def positions(gltf, binary, node):
+    """A node's vertices in mm (before the root's Z-up to Y-up turn)."""
+    accessor = gltf["accessors"][gltf["meshes"][node["mesh"]]["primitives"][0]["attributes"]["POSITION"]]
+    view = gltf["bufferViews"][accessor["bufferView"]]
+    raw = np.frombuffer(binary, np.uint16, view["byteLength"] // 2, view["byteOffset"]).reshape(-1, 4)[:, :3]
+    assert accessor["componentType"] == preview_glb.UNSIGNED_SHORT and len(raw) == accessor["count"]
+    return raw * np.array(node["scale"]) + node["translation"]
+
+
+def test_preview(parts, tmp_path):
+    p = case3b.DEFAULT_PARAMS
+    path = preview_glb.write_preview(parts, p, tmp_path / "preview.glb")
+    gltf, binary = read_glb(path)
+    assert "KHR_mesh_quantization" in gltf["extensionsRequired"]
+    nodes = {node["name"]: node for node in gltf["nodes"][1:]}
+    assert list(nodes) == [case3b.VIEW_STYLES[name][0] for name in ("base", "shell", "washer")]
+
+    # Dequantized vertices land within a grid step of the draft mesh, in the assembled frame
+    for name, dz in (("base", 0.0), ("shell", p.BASE_THICKNESS)):
+        node = nodes[case3b.VIEW_STYLES[name][0]]
+        m = meshes.export_mesh(parts[name], "draft")
+        assert np.abs(positions(gltf, binary, node) - m.vertices - (0, 0, dz)).max() <= node["scale"][0]
+
+    # Colours as in the viewer, translucent shell
+    shell = gltf["materials"][gltf["meshes"][nodes["Shell (Raised)"]["mesh"]]["primitives"][0]["material"]]
+    assert shell["alphaMode"] == "BLEND" and shell["pbrMetallicRoughness"]["baseColorFactor"][3] == pytest.approx(0.6)
+    washer = gltf["materials"][gltf["meshes"][nodes["M3 Washer (9mm OD)"]["mesh"]]["primitives"][0]["material"]]
+    assert "alphaMode" not in washer
+    assert washer["pbrMetallicRoughness"]["baseColorFactor"][:3] == pytest.approx(preview_glb.srgb_to_linear((0.8, 0.4, 0.0)))
+
+    # Several times smaller than the STLs of the same parts
+    for name, part in parts.items():
+        meshes.write_stl(meshes.export_mesh(part), tmp_path / f"{name}.stl")
+    stls = sum(os.path.getsize(tmp_path / f"{name}.stl") for name in parts)
+    assert os.path.getsize(path) * 3 < stls
+
+
+def test_ghosts(parts, tmp_path):
+    p = case3b.DEFAULT_PARAMS
+    gltf, binary = read_glb(preview_glb.write_preview(parts, p, tmp_path / "preview.glb", with_ghosts=True))
+    nodes = {node["name"]: node for node in gltf["nodes"][1:]}
+    assert len(nodes) == 3 + len(case3b.GHOST_FRAMES)
+    pid = positions(gltf, binary, nodes[case3b.VIEW_STYLES["pid"][0]])
+    assert pid[:, 2].min() == pytest.approx(case3b.ghosts(p)["pid"].bounding_box().min.Z + p.BASE_THICKNESS, abs=0.01)
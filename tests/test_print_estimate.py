@@ -0,0 +1,51 @@
+"""Print time and filament estimate (print_estimate.py) on simple solids."""
+
+import math
+import os
+import sys
+
+import pytest
+from build123d import Align, Box
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import print_estimate  # noqa: E402
+from overhangs import part_triangles  # noqa: E402
+from print_profile import load_profile  # noqa: E402
+
+BOTTOM = (Align.CENTER, Align.CENTER, Align.MIN)
+
+
+def test_move_time():
+    # Long moves cruise at speed; short ones never reach it
+    assert print_estimate.move_time(1000, 1000, 50, 5000) == pytest.approx(20 + 0.01)
+    assert print_estimate.move_time(10, 0.1, 100, 1000) == pytest.approx(100 * 2 * math.sqrt(0.1 / 1000))
+    assert print_estimate.move_time(0, 10, 50, 5000) == 0
+
+
+def test_thin_plate_is_all_solid():
+    # 10 layers is less than top + bottom shells: every layer prints solid
+    profile = load_profile()
+    e = print_estimate.estimate_mesh(part_triangles(Box(40, 40, 2, align=BOTTOM)), profile)
+    assert e.breakdown["sparse_infill"] == 0
+    brim_and_skirt = e.grams * 1e3 / print_estimate.FILAMENT_DENSITY - 40 * 40 * 2
+    assert 0 < brim_and_skirt < 0.3 * 40 * 40 * 2
+    assert e.filament_m == pytest.approx(e.grams * 1e3 / print_estimate.FILAMENT_DENSITY / (math.pi * 0.875 ** 2) / 1e3)
+
+
+def test_taller_block_uses_sparse_infill():
+    profile = load_profile()
+    short = print_estimate.estimate_mesh(part_triangles(Box(30, 30, 10, align=BOTTOM)), profile)
+    tall = print_estimate.estimate_mesh(part_triangles(Box(30, 30, 30, align=BOTTOM)), profile)
+    assert tall.breakdown["sparse_infill"] > 0
+    assert tall.grams * 1e3 / print_estimate.FILAMENT_DENSITY < 30 * 30 * 30
+    # The extra 20 mm adds walls and sparse infill only
+    assert tall.seconds > short.seconds
+    assert tall.breakdown["top_surface"] == pytest.approx(short.breakdown["top_surface"])
+
+
+def test_report_scales_the_washer_row(capsys):
+    washer = print_estimate.Estimate(120.0, 0.25, 0.1, {"outer_wall": 60.0})
+    print_estimate.print_report({"washer": washer}, washers=4)
+    row, total = capsys.readouterr().out.splitlines()
+    assert "x4" in row and "0h08m, 1.0 g (0.40 m)" in row and "outer_wall 4m" in row
+    assert total.split()[1:] == ["0h08m,", "1.0", "g"]
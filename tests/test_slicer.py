@@ -0,0 +1,41 @@
+"""Planar slicer (slicer.py) on small synthetic parts."""
+
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+from build123d import Align, Box, Cylinder, Pos
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import slicer  # noqa: E402
+from overhangs import part_triangles  # noqa: E402
+
+BOTTOM = (Align.CENTER, Align.CENTER, Align.MIN)
+
+
+def test_plate_with_hole_and_posts():
+    part = Box(40, 30, 4, align=BOTTOM) - Cylinder(5, 4, align=BOTTOM)
+    part += Pos(-15, 0, 4) * Box(4, 4, 6, align=BOTTOM) + Pos(15, 0, 4) * Box(4, 4, 6, align=BOTTOM)
+    s = slicer.slice_mesh(part_triangles(part), 0.2, 0.2)
+    assert len(s.z) == 50
+    plate, posts = slice(0, 20), slice(20, 50)
+    hole_area = 40 * 30 - s.area[0]
+    assert hole_area == pytest.approx(math.pi * 25, rel=1e-2)
+    assert s.perimeter[0] == pytest.approx(140 + 2 * math.pi * 5, rel=1e-2)
+    assert np.all(s.islands[plate] == 1) and np.all(s.islands[posts] == 2)
+    assert np.allclose(s.area[posts], 32)
+    assert s.volume == pytest.approx(part.volume, rel=1e-2)
+    assert s.floating == []
+
+
+def test_floating_island():
+    pillar = Box(10, 10, 22, align=BOTTOM)
+    ledge = Pos(15, 0, 20) * Box(40, 10, 2, align=BOTTOM)
+    pendant = Pos(30, 0, 10) * Box(6, 6, 10, align=BOTTOM)   # hangs from the ledge
+    s = slicer.slice_mesh(part_triangles(pillar + ledge + pendant), 0.2, 0.2)
+    ((layer, z, area, (x, y)),) = s.floating
+    assert z == pytest.approx(10.1, abs=1e-3)
+    assert area == pytest.approx(36)
+    assert (x, y) == pytest.approx((30, 0), abs=0.5)
@@ -0,0 +1,45 @@
+"""Memory-mapped STL analytics (stl_mesh.py) against OCC's own measurements."""
+
+import os
+import sys
+
+import pytest
+from build123d import Box, Cylinder, Pos, export_stl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import stl_mesh  # noqa: E402
+
+
+@pytest.fixture
+def tube_stl(tmp_path):
+    part = Pos(10, 20, 30) * (Box(40, 30, 20) - Cylinder(5, 20))
+    path = str(tmp_path / "tube.stl")
+    export_stl(part, path)
+    return part, path
+
+
+def test_matches_occ(tube_stl):
+    part, path = tube_stl
+    r = stl_mesh.analyse(path)
+    assert r["watertight"]
+    assert r["volume"] == pytest.approx(part.volume, rel=1e-3)
+    assert r["area"] == pytest.approx(part.area, rel=1e-3)
+    assert r["bbox"] == pytest.approx([-10, 5, 20, 30, 35, 40], abs=1e-4)
+    assert r["centroid"] == pytest.approx([10, 20, 30], abs=1e-3)
+
+
+def test_open_and_flipped_meshes(tube_stl, tmp_path):
+    _, path = tube_stl
+    records = stl_mesh.read_stl(path, mmap=False)
+    assert stl_mesh.edge_counts(records[1:])[0] == 3
+
+    flipped = records.copy()
+    flipped["v"][0] = flipped["v"][0][::-1]
+    assert stl_mesh.edge_counts(flipped) == (0, 0, 3)
+
+
+def test_rejects_ascii(tmp_path):
+    path = tmp_path / "ascii.stl"
+    path.write_text("solid x\nendsolid x\n" + " " * 80)
+    with pytest.raises(ValueError, match="ASCII"):
+        stl_mesh.read_stl(str(path))
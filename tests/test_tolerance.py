@@ -0,0 +1,40 @@
+"""Monte Carlo fit analysis (tolerance.py): no CAD build involved."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import case3b  # noqa: E402
+import tolerance  # noqa: E402
+
+PERFECT = tolerance.PrinterModel(flow_bias=0, flow_sigma=0, edge_sigma=0, bore_shrink=0, elephant_foot=0,
+                                 elephant_foot_sigma=0, bridge_sag=0, bridge_sag_sigma=0, body_sigma=0)
+NO_COMPENSATION = {"layer_height": 0.0, "xy_contour_compensation": 0.0, "xy_hole_compensation": 0.0,
+                   "elefant_foot_compensation": 0.0, "elefant_foot_compensation_layers": 0}
+
+
+def test_features_cover_cutouts_and_holes():
+    names = [feat.name for feat in tolerance.features()]
+    assert names[:3] == ["pid_cutout", "c14_window", "socket_cutout"]
+    assert names[3:] == [hole.name for hole in case3b.threaded_holes()]
+
+
+def test_seeded_runs_repeat():
+    assert tolerance.simulate(prints=2000, seed=3) == tolerance.simulate(prints=2000, seed=3)
+
+
+def test_perfect_printer_fits_exactly():
+    results = tolerance.simulate(prints=100, model=PERFECT, profile=NO_COMPENSATION)
+    p = case3b.DEFAULT_PARAMS
+    assert results["pid_cutout"]["p50"] == pytest.approx(p.FIT_TOLERANCE + PERFECT.body_undersize)
+    assert results["ssr_1"]["p50"] == pytest.approx(p.THREAD_M3_INSERT)
+    assert all(r["fit"] == 1.0 for r in results.values())
+
+
+def test_contour_compensation_narrows_gaps():
+    plain = tolerance.simulate(prints=100, model=PERFECT, profile=NO_COMPENSATION)
+    grown = tolerance.simulate(prints=100, model=PERFECT, profile={**NO_COMPENSATION, "xy_contour_compensation": 0.1})
+    assert grown["pid_cutout"]["p50"] == pytest.approx(plain["pid_cutout"]["p50"] - 0.2)   # both walls grow into the gap
+    assert grown["ssr_1"]["p50"] == pytest.approx(plain["ssr_1"]["p50"])                   # holes use hole compensation
@@ -0,0 +1,191 @@
+"""Monte Carlo fit analysis: how often does a printed case fit its parts?
+
+Every virtual print draws its own flow error, elephant foot and per-edge
+noise, and every component draws its own body size. The slicer's
+compensations from the Orca profile (xy_hole_compensation,
+xy_contour_compensation, elefant_foot_compensation) are applied the way
+OrcaSlicer applies them. All prints are evaluated at once as (prints,
+dimensions) NumPy arrays, so 200k prints take well under a second.
+
+Dimensions are in print orientation: the base prints as modelled and the
+shell roof-down, so the PID cutout and the C14 window are gaps in a vertical
+wall (width across the layers' contours, height across layers with a bridged
+edge), the socket cutout is a hole in the first layers on the bed, and the
+threaded holes are round bores (the C14 ones horizontal).
+
+    python tolerance.py                     # default parameters, 200k prints
+    python tolerance.py --prints 1000000 --preset all-screws
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+import case3b
+from print_profile import load_profile
+
+N_PRINTS = 200_000
+
+# Printed bore (mm) that takes each fastener: (thread, insert) -> (min, max).
+# Inserts are tapered from their nominal OD (4.0 / 4.6 mm) up to ~0.3 mm
+# more at the knurls, which must bite without the melt splitting the boss;
+# self-tapping screws need a pilot of roughly 0.8-0.9x the thread diameter.
+BORE_FITS = {
+    ("M3", True): (3.8, 4.2),
+    ("M3.5", True): (4.4, 4.8),
+    ("M3", False): (2.4, 2.8),
+    ("M3.5", False): (2.8, 3.15),
+}
+
+
+@dataclass(frozen=True)
+class PrinterModel:
+    """Error model of one printer and material (mm; XY values are per side)."""
+    flow_bias: float = 0.05        # mean over-extrusion: walls grow, gaps shrink
+    flow_sigma: float = 0.03       # print-to-print spread of the flow error
+    edge_sigma: float = 0.04       # noise of each printed edge within a print
+    bore_shrink: float = 0.08      # extra shrink of small round holes (contraction, polygon facets)
+    elephant_foot: float = 0.2     # first layer flare before compensation
+    elephant_foot_sigma: float = 0.05
+    bridge_sag: float = 0.15       # mean droop of a bridged edge
+    bridge_sag_sigma: float = 0.08
+    body_undersize: float = 0.2    # components are made under the cutout they specify
+    body_sigma: float = 0.1
+
+
+DEFAULT_MODEL = PrinterModel()
+
+
+@dataclass(frozen=True)
+class Dim:
+    """One printed dimension of a feature.
+
+    kind is "gap" (between two contours of a layer), "hole" (a closed hole in
+    a layer, grown by xy_hole_compensation), "bore" (a small round hole: a
+    hole that also shrinks) or "z" (across layers).
+    """
+    nominal: float
+    kind: str
+    bed: bool = False       # printed on the first layers (elephant foot)
+    bridged: bool = False   # one edge is a bridge and sags into the opening
+
+
+@dataclass(frozen=True)
+class Feature:
+    """A cutout (fits when every dimension clears the component body) or a
+    threaded hole (fits when its bore lies within `window`)."""
+    name: str
+    part: str
+    dims: tuple
+    body: tuple = None
+    window: tuple = None
+
+
+def features(p=case3b.DEFAULT_PARAMS):
+    """The fit-critical features of the base and shell."""
+    result = [
+        Feature("pid_cutout", "shell",
+                (Dim(p.PID_BODY_W + p.FIT_TOLERANCE, "gap"), Dim(p.PID_BODY_H + p.FIT_TOLERANCE, "z", bridged=True)),
+                body=(p.PID_BODY_W, p.PID_BODY_H)),
+        Feature("c14_window", "shell",
+                (Dim(p.C14_BODY_W, "gap"), Dim(p.C14_BODY_H, "z", bridged=True)),
+                body=(p.C14_BODY_W, p.C14_BODY_H)),
+        Feature("socket_cutout", "shell",
+                (Dim(p.UK_SOCKET_CUTOUT_SIZE, "hole", bed=True),) * 2,
+                body=(p.UK_SOCKET_CUTOUT_SIZE,) * 2),
+    ]
+    for hole in case3b.threaded_holes(p):
+        if hole.axis == (0, 0, 1):
+            dims = (Dim(hole.dia, "bore"),)
+        else:
+            dims = (Dim(hole.dia, "gap"), Dim(hole.dia, "z", bridged=True))
+        result.append(Feature(hole.name, hole.part, dims, window=BORE_FITS[hole.thread, hole.insert]))
+    return result
+
+
+def simulate(p=case3b.DEFAULT_PARAMS, prints=N_PRINTS, seed=0, model=DEFAULT_MODEL, profile=None):
+    """{feature: {"fit", "tight", "loose": probability, "p05", "p50", "p95": mm}}.
+
+    The percentiles are of the smallest clearance to the component body for
+    cutouts and of the printed bore diameter for threaded holes.
+    """
+    profile = profile or load_profile()
+    layer = profile["layer_height"]
+    feats = features(p)
+    dims = [dim for feat in feats for dim in feat.dims]
+    nominal = np.array([dim.nominal for dim in dims])
+    kind = np.array([dim.kind for dim in dims])
+    bed = np.array([dim.bed for dim in dims])
+    bridged = np.array([dim.bridged for dim in dims])
+    rng = np.random.default_rng(seed)
+    shape = (prints, len(dims))
+
+    # XY: one flow error per print, independent noise on both edges
+    flow = rng.normal(model.flow_bias, model.flow_sigma, (prints, 1))
+    # Contour compensation grows the material's outer contours, which narrows a
+    # gap between them; hole compensation grows the hole itself
+    compensation = np.select([kind == "gap", kind != "z"],
+                             [-profile["xy_contour_compensation"], profile["xy_hole_compensation"]], 0.0)
+    xy = (nominal + 2 * (compensation - flow - model.bore_shrink * (kind == "bore"))
+          + rng.normal(0.0, model.edge_sigma * np.sqrt(2), shape))
+    foot = rng.normal(model.elephant_foot, model.elephant_foot_sigma, (prints, 1))
+    if profile["elefant_foot_compensation_layers"] > 0:
+        foot = foot - profile["elefant_foot_compensation"]
+    xy -= 2 * np.maximum(foot, 0.0) * bed
+
+    # Z: both edges snap to the layer grid, a bridged edge sags
+    snap = rng.uniform(-layer/2, layer/2, (2, *shape))
+    sag = np.abs(rng.normal(model.bridge_sag, model.bridge_sag_sigma, shape))
+    z = nominal + snap[0] - snap[1] - sag * bridged
+    printed = np.where(kind == "z", z, xy)
+
+    results, start = {}, 0
+    for feat in feats:
+        size = printed[:, start:start + len(feat.dims)]
+        start += len(feat.dims)
+        if feat.body is not None:
+            body = np.array(feat.body) - model.body_undersize + rng.normal(0.0, model.body_sigma, size.shape)
+            value = (size - body).min(axis=1)
+            tight, loose = value < 0, np.zeros(prints, dtype=bool)
+        else:
+            value = size.min(axis=1)
+            tight, loose = value < feat.window[0], value > feat.window[1]
+        p05, p50, p95 = np.percentile(value, (5, 50, 95))
+        results[feat.name] = {
+            "fit": float(np.mean(~tight & ~loose)), "tight": float(np.mean(tight)), "loose": float(np.mean(loose)),
+            "p05": float(p05), "p50": float(p50), "p95": float(p95),
+        }
+    return results
+
+
+def print_report(p, results):
+    print(f"  {'feature':<14} {'fit':>7} {'tight':>7} {'loose':>7}   value p5 / p50 / p95 (mm)")
+    for feat in features(p):
+        r = results[feat.name]
+        what = "clearance" if feat.body is not None else f"bore (fits {feat.window[0]:g}-{feat.window[1]:g})"
+        mark = "  ⚠️" if r["fit"] < 0.95 else ""
+        print(f"  {feat.name:<14} {r['fit']:7.1%} {r['tight']:7.1%} {r['loose']:7.1%}   "
+              f"{r['p05']:6.2f} / {r['p50']:6.2f} / {r['p95']:6.2f}  {what}{mark}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--preset", nargs="+", default=[], choices=list(case3b.PRESETS), help="presets to analyse (default: the default parameters)")
+    parser.add_argument("--prints", type=int, default=N_PRINTS, help="virtual prints per configuration (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    configs = {name: case3b.CaseParams(**case3b.PRESETS[name]) for name in args.preset} or {"default": case3b.DEFAULT_PARAMS}
+    for name, p in configs.items():
+        start = time.perf_counter()
+        results = simulate(p, args.prints, args.seed)
+        print(f"{name}: {args.prints} prints in {time.perf_counter() - start:.2f}s")
+        print_report(p, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())